@@ -1,5 +1,6 @@
 # Expose key classes and functions for easier imports
 from .scanner import Scanner
+from .regex_scanner import RegexScanner, BufferScanner
 from .parser import Parser
 from .ast_printer import AstPrinter
 from .expr import Binary, Grouping, Literal, Unary, Variable, Assign
@@ -7,6 +8,13 @@ from .stmt import Print, Var, Block, Expression
 from .interpreter import Interpreter
 from .token import Token
 from .token_type import TokenType
-from .error_handler import error_state, error, report_error, report_runtime_error
-from .environment import Environment
+from .error_handler import (
+    error_state,
+    error,
+    report_error,
+    report_runtime_error,
+    Diagnostic,
+    ErrorReporter,
+)
+from .environment import Environment, GlobalEnvironment
 from .resolver import Resolver
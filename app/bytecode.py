@@ -0,0 +1,169 @@
+from enum import IntEnum
+
+
+class OpCode(IntEnum):
+    # Constants and literals.
+    CONSTANT = 1
+    NIL = 2
+    TRUE = 3
+    FALSE = 4
+    POP = 5
+    POPN = 6
+
+    # Variables.
+    GET_LOCAL = 7
+    SET_LOCAL = 8
+    GET_GLOBAL = 9
+    DEFINE_GLOBAL = 10
+    SET_GLOBAL = 11
+    GET_UPVALUE = 12
+    SET_UPVALUE = 13
+    GET_PROPERTY = 14
+    SET_PROPERTY = 15
+    GET_SUPER = 16
+
+    # Operators.
+    EQUAL = 17
+    NOT_EQUAL = 18
+    GREATER = 19
+    GREATER_EQUAL = 20
+    LESS = 21
+    LESS_EQUAL = 22
+    ADD = 23
+    SUBTRACT = 24
+    MULTIPLY = 25
+    DIVIDE = 26
+    NOT = 27
+    NEGATE = 28
+
+    # Statements and control flow.
+    PRINT = 29
+    PRINT_EXPR = 30
+    JUMP = 31
+    JUMP_IF_FALSE = 32
+    JUMP_IF_TRUE = 33
+    POP_JUMP_IF_FALSE = 34
+
+    # Functions and classes.
+    CALL = 35
+    INVOKE = 36
+    SUPER_INVOKE = 37
+    CLOSURE = 38
+    CLOSE_UPVALUE = 39
+    RETURN = 40
+    CLASS = 41
+    INHERIT = 42
+    METHOD = 43
+
+
+# Number of operands that follow each opcode in the code list. CLOSURE is
+# additionally followed by two operands per captured upvalue.
+OPERAND_COUNTS = {
+    OpCode.CONSTANT: 1,
+    OpCode.POPN: 1,
+    OpCode.GET_LOCAL: 1,
+    OpCode.SET_LOCAL: 1,
+    OpCode.GET_GLOBAL: 1,
+    OpCode.DEFINE_GLOBAL: 1,
+    OpCode.SET_GLOBAL: 1,
+    OpCode.GET_UPVALUE: 1,
+    OpCode.SET_UPVALUE: 1,
+    OpCode.GET_PROPERTY: 1,
+    OpCode.SET_PROPERTY: 1,
+    OpCode.GET_SUPER: 1,
+    OpCode.JUMP: 1,
+    OpCode.JUMP_IF_FALSE: 1,
+    OpCode.JUMP_IF_TRUE: 1,
+    OpCode.POP_JUMP_IF_FALSE: 1,
+    OpCode.CALL: 1,
+    OpCode.INVOKE: 2,
+    OpCode.SUPER_INVOKE: 2,
+    OpCode.CLOSURE: 1,
+    OpCode.CLASS: 1,
+    OpCode.METHOD: 1,
+}
+
+# Opcodes whose first operand is an index into the constant pool.
+CONSTANT_OPERAND_OPS = {
+    OpCode.CONSTANT,
+    OpCode.GET_GLOBAL,
+    OpCode.DEFINE_GLOBAL,
+    OpCode.SET_GLOBAL,
+    OpCode.GET_PROPERTY,
+    OpCode.SET_PROPERTY,
+    OpCode.GET_SUPER,
+    OpCode.INVOKE,
+    OpCode.SUPER_INVOKE,
+    OpCode.CLOSURE,
+    OpCode.CLASS,
+    OpCode.METHOD,
+}
+
+
+class Chunk:
+    """A sequence of bytecode instructions with its constant pool.
+
+    Attributes:
+        code (list[int]): Opcodes, each followed inline by its operands.
+        constants (list): Constant pool referenced by index from the code.
+        tokens (list): Source token for every entry in `code`, used to report
+            runtime errors at the same token the tree-walker would.
+    """
+
+    def __init__(self):
+        self.code = []
+        self.constants = []
+        self.tokens = []
+        self._constant_indexes = {}
+
+    def write(self, value, token=None):
+        """Appends an opcode or operand and returns its offset."""
+        self.code.append(int(value))
+        self.tokens.append(token)
+        return len(self.code) - 1
+
+    def add_constant(self, value):
+        """Adds a value to the constant pool, reusing an equal entry."""
+        key = (type(value), value)
+        index = self._constant_indexes.get(key)
+        if index is None:
+            index = len(self.constants)
+            self.constants.append(value)
+            self._constant_indexes[key] = index
+        return index
+
+    def disassemble(self, name):
+        """Returns a human-readable listing of the chunk."""
+        lines = [f"== {name} =="]
+        offset = 0
+        while offset < len(self.code):
+            op = OpCode(self.code[offset])
+            count = OPERAND_COUNTS.get(op, 0)
+            operands = self.code[offset + 1 : offset + 1 + count]
+            text = f"{offset:04d} {op.name:<18}"
+            if op in CONSTANT_OPERAND_OPS:
+                text += f" {operands[0]} '{self.constants[operands[0]]}'"
+                operands = operands[1:]
+            if operands:
+                text += " " + " ".join(str(operand) for operand in operands)
+            lines.append(text.rstrip())
+            offset += 1 + count
+            if op == OpCode.CLOSURE:
+                function = self.constants[self.code[offset - 1]]
+                offset += 2 * function.upvalue_count
+        return "\n".join(lines)
+
+
+class BytecodeFunction:
+    """A compiled Lox function: its chunk plus the metadata needed to call it."""
+
+    def __init__(self, name, arity=0):
+        self.name = name
+        self.arity = arity
+        self.upvalue_count = 0
+        self.chunk = Chunk()
+
+    def __str__(self):
+        if self.name is None:
+            return "<script>"
+        return f"<fn {self.name}>"
@@ -0,0 +1,555 @@
+from operator import sub, mul, truediv, gt, ge, lt, le
+from .stmt import Visitor as StmtVisitor
+from .expr import Get, Visitor as ExprVisitor
+from .token_type import TokenType
+from .error_handler import RuntimeError, Return, TailCall
+from .environment import Environment
+from .interpreter import Interpreter
+from .lox_instance import LoxInstance
+from .lox_function import LoxFunction
+from .lox_class import LoxClass
+from .inline_cache import get_property, set_property
+
+
+class CompiledFunction(LoxFunction):
+    """A `LoxFunction` whose body has been pre-compiled into a Python closure."""
+
+    __slots__ = ("body",)
+
+    def __init__(self, declaration, closure, is_initializer, body, instance=None):
+        super().__init__(declaration, closure, is_initializer, instance)
+        self.body = body
+
+    def run(self, interpreter, environment):
+        return self.body(environment)
+
+    def bind(self, instance):
+        return CompiledFunction(
+            self.declaration, self.closure, self.is_initializer, self.body, instance
+        )
+
+
+class ClosureCompiler(ExprVisitor, StmtVisitor):
+    """Turns resolved statements into nested Python closures.
+
+    Every node is visited exactly once. Operator choice, resolved scope
+    depths and child evaluators are captured by the returned closures, so
+    executing the program never goes through `accept` again. Statement
+    closures take the current `Environment` and return a `Return` completion
+    or None; expression closures take it and return the value.
+    """
+
+    def __init__(self, interpreter, repl_mode=False):
+        self.interpreter = interpreter
+        self.repl_mode = repl_mode
+        # Number of scopes around the code being compiled; 0 is the top level.
+        self.scope_depth = 0
+
+    def compile(self, statements):
+        return [self.compile_stmt(statement) for statement in statements]
+
+    def compile_stmt(self, stmt):
+        return stmt.accept(self)
+
+    def compile_expr(self, expr):
+        return expr.accept(self)
+
+    def compile_sequence(self, statements):
+        """Compiles statements that run one after another in the same environment."""
+        compiled = tuple(self.compile_stmt(statement) for statement in statements)
+        if len(compiled) == 1:
+            return compiled[0]
+
+        def run(env):
+            for statement in compiled:
+                completion = statement(env)
+                if completion is not None:
+                    return completion
+
+        return run
+
+    def compile_scope(self, statements):
+        """Compiles statements that run in a new local scope."""
+        self.scope_depth += 1
+        compiled = self.compile_sequence(statements)
+        self.scope_depth -= 1
+        return compiled
+
+    def compile_declare(self, name):
+        """Compiles a `(env, value)` setter defining `name` in the current scope."""
+        if self.scope_depth == 0:
+            key = name.lexeme
+
+            def define_global(env, value):
+                env.values[key] = value
+
+            return define_global
+
+        def define_local(env, value):
+            env.slots.append(value)
+
+        return define_local
+
+    def compile_lookup(self, expr, name):
+        """Compiles a variable read using the depth and slot recorded by the resolver."""
+        distance = expr.depth
+        slot = expr.slot
+        if distance is None:
+            globals = self.interpreter.globals
+            return lambda env: globals.get(name)
+        if distance == 0:
+            return lambda env: env.slots[slot]
+        if distance == 1:
+            return lambda env: env.enclosing.slots[slot]
+        return lambda env: env.get_at(distance, slot)
+
+    # Statements.
+
+    def visit_block_stmt(self, stmt):
+        body = self.compile_scope(stmt.statements)
+
+        def block(env):
+            return body(Environment(env))
+
+        return block
+
+    def visit_class_stmt(self, stmt):
+        name = stmt.name.lexeme
+        declare = self.compile_declare(stmt.name)
+        superclass_expr = stmt.superclass
+        superclass_eval = None
+        if superclass_expr is not None:
+            superclass_eval = self.compile_expr(superclass_expr)
+        methods = [
+            (method, self.compile_scope(method.body)) for method in stmt.methods
+        ]
+        is_global = self.scope_depth == 0
+        stats = self.interpreter.cache_stats
+
+        def class_stmt(env):
+            superclass = None
+            if superclass_eval is not None:
+                superclass = superclass_eval(env)
+                if not isinstance(superclass, LoxClass):
+                    raise RuntimeError(superclass_expr.name, "Superclass must be a class.")
+
+            method_env = env
+            if superclass is not None:
+                method_env = Environment(env, [superclass])
+
+            functions = {}
+            for method, body in methods:
+                functions[method.name.lexeme] = CompiledFunction(
+                    method, method_env, method.name.lexeme == "init", body
+                )
+            if is_global and isinstance(env.values.get(name), LoxClass):
+                stats.invalidate()
+            declare(env, LoxClass(name, superclass, functions))
+
+        return class_stmt
+
+    def visit_expression_stmt(self, stmt):
+        expression = self.compile_expr(stmt.expression)
+        if not self.repl_mode:
+
+            def discard(env):
+                expression(env)
+
+            return discard
+
+        stringify = self.interpreter.stringify
+
+        def expression_stmt(env):
+            print(stringify(expression(env)))
+
+        return expression_stmt
+
+    def visit_function_stmt(self, stmt):
+        declare = self.compile_declare(stmt.name)
+        body = self.compile_scope(stmt.body)
+
+        def function_stmt(env):
+            declare(env, CompiledFunction(stmt, env, False, body))
+
+        return function_stmt
+
+    def visit_if_stmt(self, stmt):
+        condition = self.compile_expr(stmt.condition)
+        then_branch = self.compile_stmt(stmt.then_branch)
+        if stmt.else_branch is None:
+
+            def if_stmt(env):
+                value = condition(env)
+                if value is not None and value is not False:
+                    return then_branch(env)
+
+            return if_stmt
+
+        else_branch = self.compile_stmt(stmt.else_branch)
+
+        def if_else_stmt(env):
+            value = condition(env)
+            if value is not None and value is not False:
+                return then_branch(env)
+            return else_branch(env)
+
+        return if_else_stmt
+
+    def visit_print_stmt(self, stmt):
+        expression = self.compile_expr(stmt.expression)
+        stringify = self.interpreter.stringify
+
+        def print_stmt(env):
+            print(stringify(expression(env)))
+
+        return print_stmt
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is None:
+
+            def return_nil(env):
+                return Return(None)
+
+            return return_nil
+
+        if stmt.tail_call:
+            return self.compile_tail_call(stmt.value)
+
+        value = self.compile_expr(stmt.value)
+
+        def return_stmt(env):
+            return Return(value(env))
+
+        return return_stmt
+
+    def compile_tail_call(self, expr):
+        """Compiles `return f(...)` to hand compiled functions back as a `TailCall`."""
+        if expr.callee.__class__ is Get:
+            return self.compile_method_call(expr, tail=True)
+
+        callee_eval = self.compile_expr(expr.callee)
+        argument_evals = tuple(self.compile_expr(argument) for argument in expr.arguments)
+        paren = expr.paren
+        tail_call_to = self.interpreter.tail_call_to
+
+        def tail_call(env):
+            callee = callee_eval(env)
+            arguments = [argument(env) for argument in argument_evals]
+            return tail_call_to(callee, arguments, paren)
+
+        return tail_call
+
+    def visit_var_stmt(self, stmt):
+        name = stmt.name.lexeme
+        if stmt.initializer is None:
+            initializer = lambda env: None
+        else:
+            initializer = self.compile_expr(stmt.initializer)
+
+        if self.scope_depth == 0:
+
+            def global_var_stmt(env):
+                env.values[name] = initializer(env)
+
+            return global_var_stmt
+
+        def var_stmt(env):
+            env.slots.append(initializer(env))
+
+        return var_stmt
+
+    def visit_while_stmt(self, stmt):
+        condition = self.compile_expr(stmt.condition)
+        body = self.compile_stmt(stmt.body)
+
+        def while_stmt(env):
+            while True:
+                value = condition(env)
+                if value is None or value is False:
+                    return None
+                completion = body(env)
+                if completion is not None:
+                    return completion
+
+        return while_stmt
+
+    # Expressions.
+
+    def visit_assign_expr(self, expr):
+        value_eval = self.compile_expr(expr.value)
+        distance = expr.depth
+        slot = expr.slot
+        name = expr.name
+
+        if distance is None:
+            globals = self.interpreter.globals
+
+            def assign_global(env):
+                value = value_eval(env)
+                globals.assign(name, value)
+                return value
+
+            return assign_global
+
+        if distance == 0:
+
+            def assign_local(env):
+                value = env.slots[slot] = value_eval(env)
+                return value
+
+            return assign_local
+
+        if distance == 1:
+
+            def assign_enclosing(env):
+                value = env.enclosing.slots[slot] = value_eval(env)
+                return value
+
+            return assign_enclosing
+
+        def assign(env):
+            value = value_eval(env)
+            env.assign_at(distance, slot, value)
+            return value
+
+        return assign
+
+    def visit_binary_expr(self, expr):
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+        operator = expr.operator
+        kind = operator.type
+
+        if kind == TokenType.PLUS:
+
+            def add(env):
+                a = left(env)
+                b = right(env)
+                if type(a) is float and type(b) is float:
+                    return a + b
+                if type(a) is str and type(b) is str:
+                    return a + b
+                raise RuntimeError(
+                    operator, "Operands must be two numbers or two strings."
+                )
+
+            return add
+
+        if kind == TokenType.EQUAL_EQUAL:
+            return lambda env: left(env) == right(env)
+        if kind == TokenType.BANG_EQUAL:
+            return lambda env: left(env) != right(env)
+
+        return NUMERIC_OPERATORS[kind](left, right, operator)
+
+    def visit_call_expr(self, expr):
+        if expr.callee.__class__ is Get:
+            return self.compile_method_call(expr)
+
+        callee_eval = self.compile_expr(expr.callee)
+        argument_evals = tuple(self.compile_expr(argument) for argument in expr.arguments)
+        paren = expr.paren
+        interpreter = self.interpreter
+        check_call = interpreter.check_call
+
+        def call(env):
+            callee = callee_eval(env)
+            arguments = [argument(env) for argument in argument_evals]
+            check_call(callee, arguments, paren)
+            return callee.call(interpreter, arguments)
+
+        return call
+
+    def compile_method_call(self, expr, tail=False):
+        """Compiles `object.name(...)` to call methods without binding them.
+
+        The instance goes in slot 0 of the method's frame, ahead of the
+        arguments. Fields holding a callable are called as usual. In tail
+        position the call is handed back as a `TailCall` or `Return`.
+        """
+        get = expr.callee
+        object_eval = self.compile_expr(get.object)
+        argument_evals = tuple(self.compile_expr(argument) for argument in expr.arguments)
+        paren = expr.paren
+        interpreter = self.interpreter
+        find_method = interpreter.find_method
+        method_frame = interpreter.method_frame
+
+        def call_field(callee, env):
+            arguments = [argument(env) for argument in argument_evals]
+            if tail:
+                return interpreter.tail_call_to(callee, arguments, paren)
+            interpreter.check_call(callee, arguments, paren)
+            return callee.call(interpreter, arguments)
+
+        if tail:
+
+            def tail_method_call(env):
+                object, method = find_method(object_eval(env), get)
+                if method is None:
+                    return call_field(object, env)
+                arguments = [argument(env) for argument in argument_evals]
+                return TailCall(method, method_frame(object, method, arguments, paren))
+
+            return tail_method_call
+
+        def method_call(env):
+            object, method = find_method(object_eval(env), get)
+            if method is None:
+                return call_field(object, env)
+            arguments = [argument(env) for argument in argument_evals]
+            return method.invoke(interpreter, method_frame(object, method, arguments, paren))
+
+        return method_call
+
+    def visit_get_expr(self, expr):
+        object_eval = self.compile_expr(expr.object)
+        name = expr.name
+
+        cache = expr.cache
+        stats = self.interpreter.cache_stats
+
+        def get(env):
+            object = object_eval(env)
+            if isinstance(object, LoxInstance):
+                return get_property(cache, object, name, stats)
+            raise RuntimeError(name, "Only instances have properties.")
+
+        return get
+
+    def visit_grouping_expr(self, expr):
+        return self.compile_expr(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        value = expr.value
+        return lambda env: value
+
+    def visit_logical_expr(self, expr):
+        left = self.compile_expr(expr.left)
+        right = self.compile_expr(expr.right)
+
+        if expr.operator.type == TokenType.OR:
+
+            def logical_or(env):
+                value = left(env)
+                if value is not None and value is not False:
+                    return value
+                return right(env)
+
+            return logical_or
+
+        def logical_and(env):
+            value = left(env)
+            if value is None or value is False:
+                return value
+            return right(env)
+
+        return logical_and
+
+    def visit_set_expr(self, expr):
+        object_eval = self.compile_expr(expr.object)
+        value_eval = self.compile_expr(expr.value)
+        name = expr.name
+        cache = expr.cache
+        stats = self.interpreter.cache_stats
+
+        def set(env):
+            object = object_eval(env)
+            if not isinstance(object, LoxInstance):
+                raise RuntimeError(name, "Only instances have fields.")
+            value = value_eval(env)
+            set_property(cache, object, name, value, stats)
+            return value
+
+        return set
+
+    def visit_super_expr(self, expr):
+        distance = expr.depth
+        slot = expr.slot
+        # "this" is always slot 0 of the scope one below "super"
+        this_distance = distance - 1
+        method_name = expr.method
+
+        def super_expr(env):
+            superclass = env.get_at(distance, slot)
+            object = env.get_at(this_distance, 0)
+            method = superclass.find_method(method_name.lexeme)
+            if method is None:
+                raise RuntimeError(
+                    method_name, f"Undefined property '{method_name.lexeme}'."
+                )
+            return method.bind(object)
+
+        return super_expr
+
+    def visit_this_expr(self, expr):
+        return self.compile_lookup(expr, expr.keyword)
+
+    def visit_unary_expr(self, expr):
+        right = self.compile_expr(expr.right)
+        operator = expr.operator
+
+        if operator.type == TokenType.MINUS:
+
+            def negate(env):
+                value = right(env)
+                if type(value) is float:
+                    return -value
+                raise RuntimeError(operator, "Operand must be a number.")
+
+            return negate
+
+        def not_expr(env):
+            value = right(env)
+            return value is None or value is False
+
+        return not_expr
+
+    def visit_variable_expr(self, expr):
+        return self.compile_lookup(expr, expr.name)
+
+
+def _numeric_operator(apply):
+    """Builds a closure factory for an operator that needs two number operands."""
+
+    def factory(left, right, operator):
+        def numeric(env):
+            a = left(env)
+            b = right(env)
+            if type(a) is float and type(b) is float:
+                return apply(a, b)
+            raise RuntimeError(operator, "Operands must be numbers.")
+
+        return numeric
+
+    return factory
+
+
+NUMERIC_OPERATORS = {
+    TokenType.MINUS: _numeric_operator(sub),
+    TokenType.STAR: _numeric_operator(mul),
+    TokenType.SLASH: _numeric_operator(truediv),
+    TokenType.GREATER: _numeric_operator(gt),
+    TokenType.GREATER_EQUAL: _numeric_operator(ge),
+    TokenType.LESS: _numeric_operator(lt),
+    TokenType.LESS_EQUAL: _numeric_operator(le),
+}
+
+
+class ClosureInterpreter(Interpreter):
+    """Engine that compiles the program to closures before running it.
+
+    Resolution, globals, natives and the runtime objects are shared with the
+    tree-walking `Interpreter`; only statement execution differs.
+    """
+
+    def interpret(self, statements, repl_mode=False):
+        self.repl_mode = repl_mode
+        compiled = ClosureCompiler(self, repl_mode).compile(statements)
+        try:
+            for statement in compiled:
+                statement(self.globals)
+        except RuntimeError as error:
+            self.errors.report_runtime_error(error)
+        except RecursionError:
+            self.errors.report_runtime_error(RuntimeError(None, "Stack overflow."))
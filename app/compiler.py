@@ -0,0 +1,386 @@
+from enum import Enum, auto
+from .expr import Visitor as ExprVisitor, Get, Super
+from .stmt import Visitor as StmtVisitor
+from .token_type import TokenType
+from .bytecode import OpCode, BytecodeFunction
+
+
+class FunctionKind(Enum):
+    SCRIPT = auto()
+    FUNCTION = auto()
+    METHOD = auto()
+    INITIALIZER = auto()
+
+
+BINARY_OPCODES = {
+    TokenType.PLUS: OpCode.ADD,
+    TokenType.MINUS: OpCode.SUBTRACT,
+    TokenType.STAR: OpCode.MULTIPLY,
+    TokenType.SLASH: OpCode.DIVIDE,
+    TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+    TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+    TokenType.GREATER: OpCode.GREATER,
+    TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+    TokenType.LESS: OpCode.LESS,
+    TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+}
+
+
+class Local:
+    def __init__(self, name, depth):
+        self.name = name
+        self.depth = depth
+        self.is_captured = False
+
+
+class FunctionState:
+    """Compilation state for the function currently being emitted.
+
+    Slot 0 of every frame holds the callee itself, or `this` for methods, so
+    the first declared local always lands in slot 1.
+    """
+
+    def __init__(self, enclosing, function, kind):
+        self.enclosing = enclosing
+        self.function = function
+        self.kind = kind
+        self.upvalues = []
+        self.scope_depth = 0
+        if kind in (FunctionKind.METHOD, FunctionKind.INITIALIZER):
+            self.locals = [Local("this", 0)]
+        else:
+            self.locals = [Local("", 0)]
+
+
+class Compiler(ExprVisitor, StmtVisitor):
+    """Lowers resolved statements into bytecode for the VM.
+
+    The compiler does its own lexical addressing: locals live in stack slots,
+    captured locals become upvalues, and top-level variables are globals
+    looked up by name.
+    """
+
+    def __init__(self, repl_mode=False):
+        self.repl_mode = repl_mode
+        self.state = None
+
+    def compile(self, statements):
+        """Compiles a program and returns its top-level script function."""
+        self.state = FunctionState(None, BytecodeFunction(None), FunctionKind.SCRIPT)
+        for statement in statements:
+            self.compile_stmt(statement)
+        self.emit_return()
+        return self.state.function
+
+    def compile_stmt(self, stmt):
+        stmt.accept(self)
+
+    def compile_expr(self, expr):
+        expr.accept(self)
+
+    # Emission helpers.
+
+    @property
+    def chunk(self):
+        return self.state.function.chunk
+
+    def emit(self, op, token=None, *operands):
+        offset = self.chunk.write(op, token)
+        for operand in operands:
+            self.chunk.write(operand, token)
+        return offset
+
+    def emit_constant(self, value):
+        self.emit(OpCode.CONSTANT, None, self.chunk.add_constant(value))
+
+    def emit_jump(self, op, token=None):
+        """Emits a jump with a placeholder target and returns the operand offset."""
+        return self.emit(op, token, -1) + 1
+
+    def patch_jump(self, operand_offset):
+        self.chunk.code[operand_offset] = len(self.chunk.code)
+
+    def emit_return(self):
+        if self.state.kind == FunctionKind.INITIALIZER:
+            self.emit(OpCode.GET_LOCAL, None, 0)
+        else:
+            self.emit(OpCode.NIL)
+        self.emit(OpCode.RETURN)
+
+    def name_constant(self, name):
+        return self.chunk.add_constant(name.lexeme)
+
+    # Scopes and variables.
+
+    def begin_scope(self):
+        self.state.scope_depth += 1
+
+    def end_scope(self):
+        state = self.state
+        state.scope_depth -= 1
+        pending_pops = 0
+        while state.locals and state.locals[-1].depth > state.scope_depth:
+            local = state.locals.pop()
+            if local.is_captured:
+                if pending_pops:
+                    self.emit_pops(pending_pops)
+                    pending_pops = 0
+                self.emit(OpCode.CLOSE_UPVALUE)
+            else:
+                pending_pops += 1
+        if pending_pops:
+            self.emit_pops(pending_pops)
+
+    def emit_pops(self, count):
+        if count == 1:
+            self.emit(OpCode.POP)
+        else:
+            self.emit(OpCode.POPN, None, count)
+
+    def add_local(self, name):
+        self.state.locals.append(Local(name, self.state.scope_depth))
+
+    def define_variable(self, name):
+        """Binds the value on top of the stack to `name` in the current scope."""
+        if self.state.scope_depth > 0:
+            self.add_local(name.lexeme)
+        else:
+            self.emit(OpCode.DEFINE_GLOBAL, name, self.name_constant(name))
+
+    def resolve_local(self, state, name):
+        for slot in range(len(state.locals) - 1, -1, -1):
+            if state.locals[slot].name == name:
+                return slot
+        return -1
+
+    def add_upvalue(self, state, index, is_local):
+        for i, upvalue in enumerate(state.upvalues):
+            if upvalue == (index, is_local):
+                return i
+        state.upvalues.append((index, is_local))
+        state.function.upvalue_count = len(state.upvalues)
+        return len(state.upvalues) - 1
+
+    def resolve_upvalue(self, state, name):
+        if state.enclosing is None:
+            return -1
+
+        local = self.resolve_local(state.enclosing, name)
+        if local != -1:
+            state.enclosing.locals[local].is_captured = True
+            return self.add_upvalue(state, local, True)
+
+        upvalue = self.resolve_upvalue(state.enclosing, name)
+        if upvalue != -1:
+            return self.add_upvalue(state, upvalue, False)
+
+        return -1
+
+    def named_variable(self, name, token, assign=False):
+        slot = self.resolve_local(self.state, name)
+        if slot != -1:
+            op = OpCode.SET_LOCAL if assign else OpCode.GET_LOCAL
+            self.emit(op, token, slot)
+            return
+
+        index = self.resolve_upvalue(self.state, name)
+        if index != -1:
+            op = OpCode.SET_UPVALUE if assign else OpCode.GET_UPVALUE
+            self.emit(op, token, index)
+            return
+
+        op = OpCode.SET_GLOBAL if assign else OpCode.GET_GLOBAL
+        self.emit(op, token, self.chunk.add_constant(name))
+
+    # Functions.
+
+    def function(self, stmt, kind):
+        self.state = FunctionState(
+            self.state, BytecodeFunction(stmt.name.lexeme, len(stmt.params)), kind
+        )
+        self.begin_scope()
+        for param in stmt.params:
+            self.add_local(param.lexeme)
+        for statement in stmt.body:
+            self.compile_stmt(statement)
+        self.emit_return()
+
+        state = self.state
+        self.state = state.enclosing
+
+        operands = [self.chunk.add_constant(state.function)]
+        for index, is_local in state.upvalues:
+            operands.extend((1 if is_local else 0, index))
+        self.emit(OpCode.CLOSURE, stmt.name, *operands)
+
+    # Statements.
+
+    def visit_block_stmt(self, stmt):
+        self.begin_scope()
+        for statement in stmt.statements:
+            self.compile_stmt(statement)
+        self.end_scope()
+
+    def visit_class_stmt(self, stmt):
+        name_constant = self.name_constant(stmt.name)
+        self.emit(OpCode.CLASS, stmt.name, name_constant)
+        self.define_variable(stmt.name)
+
+        if stmt.superclass is not None:
+            self.compile_expr(stmt.superclass)
+            self.begin_scope()
+            self.add_local("super")
+            self.named_variable(stmt.name.lexeme, stmt.name)
+            self.emit(OpCode.INHERIT, stmt.superclass.name)
+
+        self.named_variable(stmt.name.lexeme, stmt.name)
+        for method in stmt.methods:
+            kind = FunctionKind.METHOD
+            if method.name.lexeme == "init":
+                kind = FunctionKind.INITIALIZER
+            self.function(method, kind)
+            self.emit(OpCode.METHOD, method.name, self.name_constant(method.name))
+        self.emit(OpCode.POP)
+
+        if stmt.superclass is not None:
+            self.end_scope()
+
+    def visit_expression_stmt(self, stmt):
+        self.compile_expr(stmt.expression)
+        self.emit(OpCode.PRINT_EXPR if self.repl_mode else OpCode.POP)
+
+    def visit_function_stmt(self, stmt):
+        if self.state.scope_depth > 0:
+            # Declare the local first so the body can refer to itself.
+            self.add_local(stmt.name.lexeme)
+            self.function(stmt, FunctionKind.FUNCTION)
+        else:
+            self.function(stmt, FunctionKind.FUNCTION)
+            self.define_variable(stmt.name)
+
+    def visit_if_stmt(self, stmt):
+        self.compile_expr(stmt.condition)
+        then_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        self.compile_stmt(stmt.then_branch)
+        if stmt.else_branch is None:
+            self.patch_jump(then_jump)
+            return
+        else_jump = self.emit_jump(OpCode.JUMP)
+        self.patch_jump(then_jump)
+        self.compile_stmt(stmt.else_branch)
+        self.patch_jump(else_jump)
+
+    def visit_print_stmt(self, stmt):
+        self.compile_expr(stmt.expression)
+        self.emit(OpCode.PRINT)
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is None:
+            self.emit_return()
+            return
+        self.compile_expr(stmt.value)
+        self.emit(OpCode.RETURN)
+
+    def visit_var_stmt(self, stmt):
+        if stmt.initializer is not None:
+            self.compile_expr(stmt.initializer)
+        else:
+            self.emit(OpCode.NIL)
+        self.define_variable(stmt.name)
+
+    def visit_while_stmt(self, stmt):
+        loop_start = len(self.chunk.code)
+        self.compile_expr(stmt.condition)
+        exit_jump = self.emit_jump(OpCode.POP_JUMP_IF_FALSE)
+        self.compile_stmt(stmt.body)
+        self.emit(OpCode.JUMP, None, loop_start)
+        self.patch_jump(exit_jump)
+
+    # Expressions.
+
+    def visit_assign_expr(self, expr):
+        self.compile_expr(expr.value)
+        self.named_variable(expr.name.lexeme, expr.name, assign=True)
+
+    def visit_binary_expr(self, expr):
+        self.compile_expr(expr.left)
+        self.compile_expr(expr.right)
+        self.emit(BINARY_OPCODES[expr.operator.type], expr.operator)
+
+    def visit_call_expr(self, expr):
+        callee = expr.callee
+        if isinstance(callee, Get):
+            self.compile_expr(callee.object)
+            for argument in expr.arguments:
+                self.compile_expr(argument)
+            offset = self.emit(
+                OpCode.INVOKE, expr.paren, self.name_constant(callee.name), len(expr.arguments)
+            )
+            self.chunk.tokens[offset + 1] = callee.name
+            return
+
+        if isinstance(callee, Super):
+            self.named_variable("this", callee.keyword)
+            for argument in expr.arguments:
+                self.compile_expr(argument)
+            self.named_variable("super", callee.keyword)
+            offset = self.emit(
+                OpCode.SUPER_INVOKE, expr.paren, self.name_constant(callee.method), len(expr.arguments)
+            )
+            self.chunk.tokens[offset + 1] = callee.method
+            return
+
+        self.compile_expr(callee)
+        for argument in expr.arguments:
+            self.compile_expr(argument)
+        self.emit(OpCode.CALL, expr.paren, len(expr.arguments))
+
+    def visit_get_expr(self, expr):
+        self.compile_expr(expr.object)
+        self.emit(OpCode.GET_PROPERTY, expr.name, self.name_constant(expr.name))
+
+    def visit_grouping_expr(self, expr):
+        self.compile_expr(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        if expr.value is None:
+            self.emit(OpCode.NIL)
+        elif expr.value is True:
+            self.emit(OpCode.TRUE)
+        elif expr.value is False:
+            self.emit(OpCode.FALSE)
+        else:
+            self.emit_constant(expr.value)
+
+    def visit_logical_expr(self, expr):
+        self.compile_expr(expr.left)
+        if expr.operator.type == TokenType.OR:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_TRUE)
+        else:
+            end_jump = self.emit_jump(OpCode.JUMP_IF_FALSE)
+        self.emit(OpCode.POP)
+        self.compile_expr(expr.right)
+        self.patch_jump(end_jump)
+
+    def visit_set_expr(self, expr):
+        self.compile_expr(expr.object)
+        self.compile_expr(expr.value)
+        self.emit(OpCode.SET_PROPERTY, expr.name, self.name_constant(expr.name))
+
+    def visit_super_expr(self, expr):
+        self.named_variable("this", expr.keyword)
+        self.named_variable("super", expr.keyword)
+        self.emit(OpCode.GET_SUPER, expr.method, self.name_constant(expr.method))
+
+    def visit_this_expr(self, expr):
+        self.named_variable("this", expr.keyword)
+
+    def visit_unary_expr(self, expr):
+        self.compile_expr(expr.right)
+        if expr.operator.type == TokenType.MINUS:
+            self.emit(OpCode.NEGATE, expr.operator)
+        else:
+            self.emit(OpCode.NOT, expr.operator)
+
+    def visit_variable_expr(self, expr):
+        self.named_variable(expr.name.lexeme, expr.name)
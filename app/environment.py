@@ -2,21 +2,54 @@ from .error_handler import RuntimeError
 
 
 class Environment:
-    def __init__(self, enclosing=None):
-        self.values = {}
+    """A local scope frame.
+
+    Locals live in `slots`, indexed by the slot number the resolver assigned
+    at declaration time. Frames hold no names, so creating one per block or
+    call allocates only the slot list.
+    """
+
+    __slots__ = ("slots", "enclosing")
+
+    def __init__(self, enclosing=None, slots=None):
+        self.slots = [] if slots is None else slots
         self.enclosing = enclosing
 
+    def get_at(self, distance, slot):
+        """Get a local's value from a specific scope depth and slot."""
+        environment = self
+        for _ in range(distance):
+            environment = environment.enclosing
+        return environment.slots[slot]
+
+    def assign_at(self, distance, slot, value):
+        """Assign to a local at a specific scope depth and slot."""
+        environment = self
+        for _ in range(distance):
+            environment = environment.enclosing
+        environment.slots[slot] = value
+
+
+class GlobalEnvironment(Environment):
+    """The outermost frame, enclosing every other.
+
+    Globals are not resolved and live in the name-keyed `values` dict.
+    """
+
+    __slots__ = ("values",)
+
+    def __init__(self):
+        super().__init__()
+        self.values = {}
+
     def define(self, name, value):
-        """Define a new variable in the current scope."""
+        """Define a new global, or redefine an existing one."""
         self.values[name.lexeme if hasattr(name, 'lexeme') else name] = value
 
     def get(self, name):
         if name.lexeme in self.values:
             return self.values[name.lexeme]
 
-        if self.enclosing is not None:
-            return self.enclosing.get(name)
-
         raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
 
     def assign(self, name, value):
@@ -24,23 +57,4 @@ class Environment:
             self.values[name.lexeme] = value
             return
 
-        if self.enclosing is not None:
-            self.enclosing.assign(name, value)
-            return
-
         raise RuntimeError(name, f"Undefined variable '{name.lexeme}'.")
-
-    def ancestor(self, distance):
-        """Get the environment at the specified distance in the chain."""
-        environment = self
-        for _ in range(distance):
-            environment = environment.enclosing
-        return environment
-
-    def get_at(self, distance, name):
-        """Get a variable's value from a specific scope depth."""
-        return self.ancestor(distance).values[name if isinstance(name, str) else name.lexeme]
-
-    def assign_at(self, distance, name, value):
-        """Assign to a variable at a specific scope depth."""
-        self.ancestor(distance).values[name.lexeme] = value
@@ -1,7 +1,7 @@
 from .token_type import TokenType
 import sys
-
-error_state = {"had_error": False, "had_runtime_error": False}
+from contextlib import contextmanager
+from contextvars import ContextVar
 
 
 class RuntimeError(Exception):
@@ -10,30 +10,176 @@ class RuntimeError(Exception):
         self.token = token
 
 
-class Return(Exception):
+class Return:
+    """Completion returned by a statement that executed `return`.
+
+    Statements that complete normally return None; a `Return` is handed back
+    up through the enclosing blocks and loops to the function call.
+    """
+
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
 
+class TailCall:
+    """Completion of a `return f(...)` whose call is left to the caller.
+
+    The function being returned from runs `function` with `frame` in its own
+    call loop instead of nesting another Python call. `frame` holds the
+    arguments, preceded by `this` when `function` is a method.
+    """
+
+    __slots__ = ("function", "frame")
+
+    def __init__(self, function, frame):
+        self.function = function
+        self.frame = frame
+
+
 def error(arg, message):
-    if isinstance(arg, int):
-        report_error(arg, "", message)
-    elif hasattr(arg, "type") and hasattr(arg, "line"):
-        if arg.type == TokenType.EOF:
-            report_error(arg.line, " at end", message)
+    current_reporter().error(arg, message)
+
+
+class Diagnostic:
+    """An error reported while running Lox code.
+
+    Attributes:
+        kind (str): "compile" for scanning, parsing and resolution errors,
+            "runtime" for errors raised while the program runs.
+        line (int | None): The line of the error, if it is known.
+        message (str): What went wrong.
+        where (str): Where on the line a compile error is, such as
+            " at 'x'"; empty for runtime errors.
+    """
+
+    __slots__ = ("kind", "line", "message", "where")
+
+    def __init__(self, kind, line, message, where=""):
+        self.kind = kind
+        self.line = line
+        self.message = message
+        self.where = where
+
+    def __str__(self):
+        """Formats the diagnostic the way the command line prints it."""
+        if self.kind == "runtime":
+            return self.message
+        return f"[line {self.line}] Error{self.where}: {self.message}"
+
+    def __repr__(self):
+        return f"Diagnostic({self.kind!r}, {self.line!r}, {self.message!r}, {self.where!r})"
+
+
+def print_diagnostic(diagnostic):
+    """Sink printing each diagnostic to stderr as soon as it is reported."""
+    print(diagnostic, file=sys.stderr)
+
+
+class ErrorReporter:
+    """The error flags and diagnostics of one interpreter or session.
+
+    Every interpreter owns one, its `errors`, and reports its runtime errors
+    to it; the scanner, parser and resolver of a program it runs are given
+    it too. Independent interpreters can therefore run in threads of the
+    same process without seeing each other's errors. Code given no reporter
+    reports to the one current in the running thread or context (see
+    `active`).
+
+    Attributes:
+        had_error (bool): Whether a compile error was reported.
+        had_runtime_error (bool): Whether a runtime error was reported.
+        diagnostics (list[Diagnostic]): The diagnostics reported, when the
+            default sink collects them.
+        sink: Called with each `Diagnostic` as it is reported.
+    """
+
+    def __init__(self, sink=None):
+        """Initializes a reporter without errors.
+
+        Args:
+            sink: Receives each diagnostic; by default they are collected
+                in `diagnostics` and nothing is printed.
+        """
+        self.had_error = False
+        self.had_runtime_error = False
+        self.diagnostics = []
+        self.sink = self.diagnostics.append if sink is None else sink
+
+    def report(self, diagnostic):
+        if diagnostic.kind == "runtime":
+            self.had_runtime_error = True
+        else:
+            self.had_error = True
+        self.sink(diagnostic)
+
+    def error(self, arg, message):
+        """Reports a compile error at a token or on a line."""
+        if isinstance(arg, int):
+            self.report_error(arg, "", message)
+        elif hasattr(arg, "type") and hasattr(arg, "line"):
+            if arg.type == TokenType.EOF:
+                self.report_error(arg.line, " at end", message)
+            else:
+                self.report_error(arg.line, f" at '{arg.lexeme}'", message)
         else:
-            report_error(arg.line, f" at '{arg.lexeme}'", message)
-    else:
-        raise TypeError("Invalid argument type for error function")
+            raise TypeError("Invalid argument type for error function")
+
+    def report_error(self, line, where, message):
+        self.report(Diagnostic("compile", line, message, where))
+
+    def report_runtime_error(self, error):
+        line = error.token.line if error.token is not None else None
+        self.report(Diagnostic("runtime", line, str(error)))
+
+    @contextmanager
+    def active(self):
+        """Makes this the reporter errors go to, until the block exits."""
+        token = _current_reporter.set(self)
+        try:
+            yield self
+        finally:
+            _current_reporter.reset(token)
+
+
+# The reporter of code given none and not run inside `active`, such as a
+# scanner made on its own. It prints right away and keeps no diagnostics.
+default_reporter = ErrorReporter(print_diagnostic)
+_current_reporter = ContextVar("current_reporter", default=default_reporter)
+
+
+def current_reporter():
+    """Returns the reporter errors are reported to here."""
+    return _current_reporter.get()
+
+
+class ErrorState:
+    """The flags of the current reporter, read and set by name.
+
+    `error_state["had_error"]` is the flag of whichever reporter is current.
+    Interpreters don't use it: their flags are those of their own `errors`.
+    """
+
+    FLAGS = ("had_error", "had_runtime_error")
+
+    def __getitem__(self, flag):
+        if flag not in self.FLAGS:
+            raise KeyError(flag)
+        return getattr(current_reporter(), flag)
+
+    def __setitem__(self, flag, value):
+        if flag not in self.FLAGS:
+            raise KeyError(flag)
+        setattr(current_reporter(), flag, value)
+
+
+error_state = ErrorState()
 
 
 def report_error(line, where, message):
-    global error_state
-    error_state["had_error"] = True
-    print(f"[line {line}] Error{where}: {message}", file=sys.stderr)  # Print to stderr
+    current_reporter().report_error(line, where, message)
 
 
 def report_runtime_error(error):
-    global error_state
-    error_state["had_runtime_error"] = True
-    print(f"{error}", file=sys.stderr)  # Only print the error message
+    current_reporter().report_runtime_error(error)
@@ -1,3 +1,6 @@
+from .inline_cache import InlineCache
+
+
 class Visitor:
     def visit_binary_expr(self, binary):
         pass
@@ -37,21 +40,30 @@ class Visitor:
 
 
 class Expr:
+    __slots__ = ()
+
     def accept(self, visitor):
         pass
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right", "guard", "operation")
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
         self.right = right
+        # Operand type and operator the node is quickened for; see quickening.py.
+        self.guard = None
+        self.operation = None
 
     def accept(self, visitor):
         return visitor.visit_binary_expr(self)
 
 
 class Grouping(Expr):
+    __slots__ = ("expression",)
+
     def __init__(self, expression):
         self.expression = expression
 
@@ -60,6 +72,8 @@ class Grouping(Expr):
 
 
 class Literal(Expr):
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -68,32 +82,49 @@ class Literal(Expr):
 
 
 class Unary(Expr):
+    __slots__ = ("operator", "right", "guard", "operation")
+
     def __init__(self, operator, right):
         self.operator = operator
         self.right = right
+        # Operand type and operator the node is quickened for; see quickening.py.
+        self.guard = None
+        self.operation = None
 
     def accept(self, visitor):
         return visitor.visit_unary_expr(self)
 
 
 class Variable(Expr):
+    __slots__ = ("name", "depth", "slot")
+
     def __init__(self, name):
         self.name = name
+        # Set by the Resolver for locals; None means a global looked up by name.
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_variable_expr(self)
 
 
 class Assign(Expr):
+    __slots__ = ("name", "value", "depth", "slot")
+
     def __init__(self, name, value):
         self.name = name
         self.value = value
+        # Set by the Resolver for locals; None means a global looked up by name.
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_assign_expr(self)
 
 
 class Logical(Expr):
+    __slots__ = ("left", "operator", "right")
+
     def __init__(self, left, operator, right):
         self.left = left
         self.operator = operator
@@ -104,6 +135,8 @@ class Logical(Expr):
 
 
 class Call(Expr):
+    __slots__ = ("callee", "paren", "arguments")
+
     def __init__(self, callee, paren, arguments):
         self.callee = callee
         self.paren = paren
@@ -114,36 +147,52 @@ class Call(Expr):
 
 
 class Get(Expr):
+    __slots__ = ("object", "name", "cache")
+
     def __init__(self, object, name):
         self.object = object
         self.name = name
+        self.cache = InlineCache()
 
     def accept(self, visitor):
         return visitor.visit_get_expr(self)
 
 
 class Set(Expr):
+    __slots__ = ("object", "name", "value", "cache")
+
     def __init__(self, object, name, value):
         self.object = object
         self.name = name
         self.value = value
+        self.cache = InlineCache()
 
     def accept(self, visitor):
         return visitor.visit_set_expr(self)
 
 
 class This(Expr):
+    __slots__ = ("keyword", "depth", "slot")
+
     def __init__(self, keyword):
         self.keyword = keyword
+        # Set by the Resolver to the binding of `this` in the enclosing method.
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_this_expr(self)
 
 
 class Super(Expr):
+    __slots__ = ("keyword", "method", "depth", "slot")
+
     def __init__(self, keyword, method):
         self.keyword = keyword
         self.method = method
+        # Set by the Resolver to the binding of `super` around the class's methods.
+        self.depth = None
+        self.slot = None
 
     def accept(self, visitor):
         return visitor.visit_super_expr(self)
@@ -0,0 +1,133 @@
+"""Inline caches for property reads and writes.
+
+Every `Get` and `Set` node carries an `InlineCache` that remembers, per
+instance `Shape` seen at that site, where the property was found. Shapes
+belong to a single class and fix the field layout, so an entry never goes
+stale: a new field moves the instance to another shape and a redefined class
+starts from a fresh root shape.
+
+The first shape seen is kept in dedicated attributes (the monomorphic case);
+up to `POLYMORPHIC_LIMIT` more go in a dict. Sites that see more shapes than
+that are megamorphic and do a full lookup for the extra shapes.
+
+Redefining a class only flushes the caches of the interpreter that ran the
+redefinition, so interpreters in one process don't slow each other down.
+"""
+from .error_handler import RuntimeError
+
+POLYMORPHIC_LIMIT = 4
+
+
+class CacheStats:
+    """Hit and miss counters for the caches used by one interpreter.
+
+    It also holds the interpreter's cache epoch, bumped by `invalidate`
+    whenever a class is redefined. Caches compare it on a miss and drop
+    their entries, so shapes of replaced classes don't fill up the site.
+    """
+
+    __slots__ = ("hits", "misses", "epoch")
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.epoch = 0
+
+    def invalidate(self):
+        """Makes the interpreter's caches forget their entries on their next
+        miss."""
+        self.epoch += 1
+
+    @property
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __str__(self):
+        return f"{self.hits} hits, {self.misses} misses ({self.hit_rate:.1%} hit rate)"
+
+
+class InlineCache:
+    __slots__ = ("shape", "entry", "entries", "epoch")
+
+    def __init__(self):
+        self.shape = None
+        self.entry = None
+        self.entries = {}
+        self.epoch = 0
+
+    def remember(self, shape, entry, epoch):
+        if self.epoch != epoch:
+            self.shape = None
+            self.entries.clear()
+            self.epoch = epoch
+
+        if self.shape is None:
+            self.shape = shape
+            self.entry = entry
+        elif len(self.entries) < POLYMORPHIC_LIMIT:
+            self.entries[shape] = entry
+
+
+def lookup_property(cache, instance, name, stats):
+    """Finds `name` on `instance` through the site's cache.
+
+    Returns the site's `(field index, method)` entry, with exactly one of them
+    set. Methods come back unbound.
+    """
+    shape = instance.shape
+    if shape is cache.shape:
+        stats.hits += 1
+        return cache.entry
+
+    entry = cache.entries.get(shape)
+    if entry is not None:
+        stats.hits += 1
+        return entry
+
+    stats.misses += 1
+    index = shape.slots.get(name.lexeme)
+    method = None
+    if index is None:
+        method = instance.klass.find_method(name.lexeme)
+        if method is None:
+            raise RuntimeError(name, f"Undefined property '{name.lexeme}'")
+    entry = (index, method)
+    cache.remember(shape, entry, stats.epoch)
+    return entry
+
+
+def get_property(cache, instance, name, stats):
+    """Reads `name` from `instance` through the site's cache."""
+    index, method = lookup_property(cache, instance, name, stats)
+    if index is not None:
+        return instance.values[index]
+    return method.bind(instance)
+
+
+def set_property(cache, instance, name, value, stats):
+    """Writes `name` on `instance` through the site's cache.
+
+    Entries are `(field index, None)` for an existing field, or
+    `(None, next shape)` when the write adds the field.
+    """
+    shape = instance.shape
+    if shape is cache.shape:
+        stats.hits += 1
+        index, next_shape = cache.entry
+    else:
+        entry = cache.entries.get(shape)
+        if entry is not None:
+            stats.hits += 1
+            index, next_shape = entry
+        else:
+            stats.misses += 1
+            index = shape.slots.get(name.lexeme)
+            next_shape = shape.with_field(name.lexeme) if index is None else None
+            cache.remember(shape, (index, next_shape), stats.epoch)
+
+    if index is not None:
+        instance.values[index] = value
+    else:
+        instance.shape = next_shape
+        instance.values.append(value)
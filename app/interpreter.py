@@ -1,21 +1,38 @@
 from .stmt import Visitor as StmtVisitor
-from .expr import Visitor as ExprVisitor
-from .token_type import TokenType
-from .error_handler import report_runtime_error, RuntimeError, Return
-from .environment import Environment
+from .expr import Get, Visitor as ExprVisitor
+from .error_handler import ErrorReporter, print_diagnostic, RuntimeError, Return, TailCall
+from .environment import Environment, GlobalEnvironment
 from .lox_callable import LoxCallable
 from .native_functions import NativeClock
 from app.lox_instance import LoxInstance
 from .lox_function import LoxFunction
 from .lox_class import LoxClass
+from .inline_cache import (
+    CacheStats,
+    get_property,
+    lookup_property,
+    set_property,
+)
+from .quickening import quicken_binary, quicken_unary
+from .operators import (
+    BINARY_OPERATORS,
+    UNARY_OPERATORS,
+    SHORT_CIRCUITS_ON,
+    check_number_operand,
+    check_number_operands,
+    is_equal,
+    is_truthy,
+)
 
 
 class Interpreter(ExprVisitor, StmtVisitor):
-    def __init__(self):
-        self.globals = Environment()
+    def __init__(self, errors=None):
+        self.globals = GlobalEnvironment()
         self.environment = self.globals
-        self.locals = {}  # Map to store resolved variable depths
         self.repl_mode = False
+        self.cache_stats = CacheStats()  # Property inline cache counters
+        # Gets this interpreter's errors; by default they are printed.
+        self.errors = ErrorReporter(print_diagnostic) if errors is None else errors
 
         # Define native functions
         self.globals.define("clock", NativeClock())
@@ -26,21 +43,23 @@ class Interpreter(ExprVisitor, StmtVisitor):
             for statement in statements:
                 self.execute(statement)
         except RuntimeError as error:
-            report_runtime_error(error)
-
-    def resolve(self, expr, depth):
-        """Store a resolved variable's scope depth."""
-        self.locals[expr] = depth
+            self.errors.report_runtime_error(error)
+        except RecursionError:
+            # Lox calls nest Python calls here; use the VM for deep recursion.
+            self.errors.report_runtime_error(RuntimeError(None, "Stack overflow."))
+        finally:
+            # A runtime error skips the environment restores in execute_block.
+            self.environment = self.globals
 
     def evaluate(self, expr):
         return expr.accept(self)
 
     def execute(self, stmt):
-        stmt.accept(self)
+        """Execute a statement; returns a `Return` completion or None."""
+        return stmt.accept(self)
 
     def visit_block_stmt(self, stmt):
-        self.execute_block(stmt.statements, Environment(self.environment))
-        return None
+        return self.execute_block(stmt.statements, Environment(self.environment))
 
     def visit_class_stmt(self, stmt):
         superclass = None
@@ -49,11 +68,8 @@ class Interpreter(ExprVisitor, StmtVisitor):
             if not isinstance(superclass, LoxClass):
                 raise RuntimeError(stmt.superclass.name, "Superclass must be a class.")
 
-        self.environment.define(stmt.name.lexeme, None)
-
         if stmt.superclass is not None:
-            self.environment = Environment(self.environment)
-            self.environment.define("super", superclass)
+            self.environment = Environment(self.environment, [superclass])
 
         methods = {}
         for method in stmt.methods:
@@ -65,18 +81,39 @@ class Interpreter(ExprVisitor, StmtVisitor):
         klass = LoxClass(stmt.name.lexeme, superclass, methods)
         if stmt.superclass is not None:
             self.environment = self.environment.enclosing
-        self.environment.assign(stmt.name, klass)
+        # Methods only look the class name up once they run, so the class can
+        # be declared after they are created.
+        if self.environment is self.globals and isinstance(
+            self.globals.values.get(stmt.name.lexeme), LoxClass
+        ):
+            self.cache_stats.invalidate()
+        self.declare(stmt.name, klass)
         return None
 
+    def declare(self, name, value):
+        """Define a variable in the current scope.
+
+        Top-level declarations are globals, keyed by name; anything else takes
+        the next slot of the current frame.
+        """
+        if self.environment is self.globals:
+            self.globals.define(name.lexeme, value)
+        else:
+            self.environment.slots.append(value)
+
     def execute_block(self, statements, environment):
+        """Execute statements in `environment`, stopping at the first `Return`."""
         previous = self.environment
-        try:
-            self.environment = environment
+        self.environment = environment
 
-            for statement in statements:
-                self.execute(statement)
-        finally:
-            self.environment = previous
+        for statement in statements:
+            completion = statement.accept(self)
+            if completion is not None:
+                self.environment = previous
+                return completion
+
+        self.environment = previous
+        return None
 
     def visit_expression_stmt(self, stmt):
         value = self.evaluate(stmt.expression)
@@ -86,26 +123,59 @@ class Interpreter(ExprVisitor, StmtVisitor):
         return None
 
     def visit_if_stmt(self, stmt):
-        if self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.then_branch)
+        if is_truthy(self.evaluate(stmt.condition)):
+            return self.execute(stmt.then_branch)
         elif stmt.else_branch is not None:
-            self.execute(stmt.else_branch)
+            return self.execute(stmt.else_branch)
         return None
 
     def visit_return_stmt(self, stmt):
+        if stmt.tail_call:
+            return self.tail_call(stmt.value)
+
         value = None
         if stmt.value is not None:
             value = self.evaluate(stmt.value)
-        raise Return(value)
+        return Return(value)
+
+    def tail_call(self, expr):
+        """Evaluate a call in tail position.
+
+        Lox functions are not called here; the `TailCall` completion lets the
+        returning function's call loop run them without growing the Python
+        stack.
+        """
+        if expr.callee.__class__ is Get:
+            callee, method = self.evaluate_method(expr.callee)
+            if method is not None:
+                arguments = map(self.evaluate, expr.arguments)
+                return TailCall(
+                    method, self.method_frame(callee, method, arguments, expr.paren)
+                )
+        else:
+            callee = self.evaluate(expr.callee)
+        arguments = [self.evaluate(argument) for argument in expr.arguments]
+        return self.tail_call_to(callee, arguments, expr.paren)
+
+    def tail_call_to(self, callee, arguments, paren):
+        """Check a call in tail position and turn it into its completion."""
+        self.check_call(callee, arguments, paren)
+        if isinstance(callee, LoxFunction):
+            if callee.instance is not None:
+                arguments.insert(0, callee.instance)
+            return TailCall(callee, arguments)
+        return Return(callee.call(self, arguments))
 
     def visit_while_stmt(self, stmt):
-        while self.is_truthy(self.evaluate(stmt.condition)):
-            self.execute(stmt.body)
+        while is_truthy(self.evaluate(stmt.condition)):
+            completion = self.execute(stmt.body)
+            if completion is not None:
+                return completion
         return None
 
     def visit_function_stmt(self, stmt):
         function = LoxFunction(stmt, self.environment)
-        self.environment.define(stmt.name.lexeme, function)
+        self.declare(stmt.name, function)
         return None
 
     def visit_print_stmt(self, stmt):
@@ -118,15 +188,17 @@ class Interpreter(ExprVisitor, StmtVisitor):
         if stmt.initializer is not None:
             value = self.evaluate(stmt.initializer)
 
-        self.environment.define(stmt.name.lexeme, value)
+        self.declare(stmt.name, value)
         return None
 
     def visit_assign_expr(self, expr):
         value = self.evaluate(expr.value)
 
-        distance = self.locals.get(expr)
-        if distance is not None:
-            self.environment.assign_at(distance, expr.name, value)
+        distance = expr.depth
+        if distance == 0:
+            self.environment.slots[expr.slot] = value
+        elif distance is not None:
+            self.environment.assign_at(distance, expr.slot, value)
         else:
             self.globals.assign(expr.name, value)
 
@@ -140,37 +212,73 @@ class Interpreter(ExprVisitor, StmtVisitor):
 
     def visit_unary_expr(self, expr):
         right = self.evaluate(expr.right)
+        if type(right) is expr.guard:
+            return expr.operation(right)
+        return self.unary_operation(expr, right)
 
-        if expr.operator.type == TokenType.MINUS:
-            self.check_number_operand(expr.operator, right)
-            return -float(right)
-        elif expr.operator.type == TokenType.BANG:
-            return not self.is_truthy(right)
-
-        return None
+    def unary_operation(self, expr, right):
+        """Apply a unary operator to an operand of any type."""
+        if expr.guard is None:
+            quicken_unary(expr, right)
+        return UNARY_OPERATORS[expr.operator.type](expr.operator, right)
 
     def visit_call_expr(self, expr):
-        callee = self.evaluate(expr.callee)
+        if expr.callee.__class__ is Get:
+            callee, method = self.evaluate_method(expr.callee)
+            if method is not None:
+                arguments = map(self.evaluate, expr.arguments)
+                frame = self.method_frame(callee, method, arguments, expr.paren)
+                return method.invoke(self, frame)
+        else:
+            callee = self.evaluate(expr.callee)
 
         arguments = []
         for argument in expr.arguments:
             arguments.append(self.evaluate(argument))
 
+        self.check_call(callee, arguments, expr.paren)
+        return callee.call(self, arguments)
+
+    def evaluate_method(self, expr):
+        """Evaluate a `Get` that is about to be called.
+
+        A method is not bound: the instance and the method come back so the
+        call can put the instance in the method's own frame. A field comes
+        back as its value and None.
+        """
+        return self.find_method(self.evaluate(expr.object), expr)
+
+    def find_method(self, object, expr):
+        """Look up the `Get` expression `expr` on the evaluated `object`."""
+        if not isinstance(object, LoxInstance):
+            raise RuntimeError(expr.name, "Only instances have properties.")
+
+        index, method = lookup_property(expr.cache, object, expr.name, self.cache_stats)
+        if method is None:
+            return object.values[index], None
+        return object, method
+
+    def method_frame(self, instance, method, arguments, paren):
+        """Build the frame of a method call: `this`, then the arguments."""
+        frame = [instance, *arguments]
+        self.check_arity(method, len(frame) - 1, paren)
+        return frame
+
+    def check_call(self, callee, arguments, paren):
         if not isinstance(callee, LoxCallable):
-            raise RuntimeError(expr.paren, "Can only call functions and classes.")
+            raise RuntimeError(paren, "Can only call functions and classes.")
+        self.check_arity(callee, len(arguments), paren)
 
-        if len(arguments) != callee.arity():
+    def check_arity(self, callee, count, paren):
+        if count != callee.arity():
             raise RuntimeError(
-                expr.paren,
-                f"Expected {callee.arity()} arguments but got {len(arguments)}.",
+                paren, f"Expected {callee.arity()} arguments but got {count}."
             )
 
-        return callee.call(self, arguments)
-
     def visit_get_expr(self, expr):
         object = self.evaluate(expr.object)
         if isinstance(object, LoxInstance):
-            return object.get(expr.name)
+            return get_property(expr.cache, object, expr.name, self.cache_stats)
 
         raise RuntimeError(expr.name, "Only instances have properties.")
 
@@ -181,48 +289,23 @@ class Interpreter(ExprVisitor, StmtVisitor):
             raise RuntimeError(expr.name, "Only instances have fields.")
 
         value = self.evaluate(expr.value)
-        object.set(expr.name, value)
+        set_property(expr.cache, object, expr.name, value, self.cache_stats)
         return value
 
     def visit_binary_expr(self, expr):
         left = self.evaluate(expr.left)
         right = self.evaluate(expr.right)
 
-        if expr.operator.type == TokenType.MINUS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) - float(right)
-        elif expr.operator.type == TokenType.SLASH:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) / float(right)
-        elif expr.operator.type == TokenType.STAR:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) * float(right)
-        elif expr.operator.type == TokenType.PLUS:
-            if isinstance(left, float) and isinstance(right, float):
-                return float(left) + float(right)
-            if isinstance(left, str) and isinstance(right, str):
-                return left + right
-            raise RuntimeError(
-                expr.operator, "Operands must be two numbers or two strings."
-            )
-        elif expr.operator.type == TokenType.GREATER:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) > float(right)  # Restored correct comparison
-        elif expr.operator.type == TokenType.GREATER_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) >= float(right)
-        elif expr.operator.type == TokenType.LESS:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) < float(right)
-        elif expr.operator.type == TokenType.LESS_EQUAL:
-            self.check_number_operands(expr.operator, left, right)
-            return float(left) <= float(right)
-        elif expr.operator.type == TokenType.BANG_EQUAL:
-            return not self.is_equal(left, right)
-        elif expr.operator.type == TokenType.EQUAL_EQUAL:
-            return self.is_equal(left, right)
+        guard = expr.guard
+        if type(left) is guard and type(right) is guard:
+            return expr.operation(left, right)
+        return self.binary_operation(expr, left, right)
 
-        return None
+    def binary_operation(self, expr, left, right):
+        """Apply a binary operator to operands of any type."""
+        if expr.guard is None:
+            quicken_binary(expr, left, right)
+        return BINARY_OPERATORS[expr.operator.type](expr.operator, left, right)
 
     def visit_variable_expr(self, expr):
         return self.look_up_variable(expr.name, expr)
@@ -230,26 +313,20 @@ class Interpreter(ExprVisitor, StmtVisitor):
     def visit_logical_expr(self, expr):
         left = self.evaluate(expr.left)
 
-        # For 'or', if the left operand is truthy, we can short-circuit and return it
-        if expr.operator.type == TokenType.OR:
-            if self.is_truthy(left):
-                return left
-        # For 'and', if the left operand is falsey, we can short-circuit and return it
-        else:  # TokenType.AND
-            if not self.is_truthy(left):
-                return left
-
-        # If we couldn't short-circuit, evaluate and return the right operand
+        # 'or' returns a truthy left operand and 'and' a falsey one without
+        # evaluating the right operand.
+        if is_truthy(left) is SHORT_CIRCUITS_ON[expr.operator.type]:
+            return left
         return self.evaluate(expr.right)
 
     def visit_this_expr(self, expr):
         return self.look_up_variable(expr.keyword, expr)
 
     def visit_super_expr(self, expr):
-        distance = self.locals.get(expr)
-        superclass = self.environment.get_at(distance, "super")
-        # "this" is always one scope below "super"
-        object = self.environment.get_at(distance - 1, "this")
+        distance = expr.depth
+        superclass = self.environment.get_at(distance, expr.slot)
+        # "this" is always slot 0 of the scope one below "super"
+        object = self.environment.get_at(distance - 1, 0)
 
         method = superclass.find_method(expr.method.lexeme)
         if method is None:
@@ -258,34 +335,25 @@ class Interpreter(ExprVisitor, StmtVisitor):
         return method.bind(object)
 
     def look_up_variable(self, name, expr):
-        """Look up a variable using its resolved scope depth if available."""
-        distance = self.locals.get(expr)
+        """Look up a variable using its resolved depth and slot if available."""
+        distance = expr.depth
+        if distance == 0:
+            return self.environment.slots[expr.slot]
         if distance is not None:
-            return self.environment.get_at(distance, name.lexeme)
+            return self.environment.get_at(distance, expr.slot)
         return self.globals.get(name)
 
     def check_number_operand(self, operator, operand):
-        if isinstance(operand, float):
-            return
-        raise RuntimeError(operator, "Operand must be a number.")
+        check_number_operand(operator, operand)
 
     def check_number_operands(self, operator, left, right):
-        if not (isinstance(left, float) and isinstance(right, float)):
-            raise RuntimeError(operator, "Operands must be numbers.")
+        check_number_operands(operator, left, right)
 
     def is_equal(self, a, b):
-        if a is None and b is None:
-            return True
-        if a is None:
-            return False
-        return a == b
+        return is_equal(a, b)
 
     def is_truthy(self, value):
-        if value is None:
-            return False
-        if isinstance(value, bool):
-            return value
-        return True
+        return is_truthy(value)
 
     def stringify(self, obj):
         if obj is None:
@@ -1,56 +1,216 @@
+import mmap
+import os
 import sys
-from .scanner import Scanner
-from .parser import Parser
+from contextlib import contextmanager
+from .regex_scanner import scanner_for
+from .parser import Parser, TokenStream
+from . import loxc
+from .repl import Session
 from .interpreter import Interpreter
 from .resolver import Resolver
-from .error_handler import error_state
+from .optimizer import ConstantFolder
+from .vm import VM
+from .closure_compiler import ClosureInterpreter
+from .transpiler import PythonInterpreter
+
+USAGE = (
+    "Usage: ./your_program.sh [--engine=tree|closure|vm|python] "
+    "[--stack-size=N] [--stream] [--no-cache] [script]"
+)
+
+# Execution engines selectable with --engine; "tree" is the tree-walker.
+ENGINES = {
+    "tree": Interpreter,
+    "closure": ClosureInterpreter,
+    "vm": VM,
+    "python": PythonInterpreter,
+}
 
 lox_interpreter = Interpreter()
 
 
 def main():
-    if len(sys.argv) > 2:
-        print("Usage: ./your_program.sh [script]")
+    args = sys.argv[1:]
+    engine = "tree"
+    stack_size = None
+    stream = False
+    cache = True
+    while args and args[0].startswith("--"):
+        option, _, value = args.pop(0).partition("=")
+        if option == "--engine" and value in ENGINES:
+            engine = value
+        elif option == "--stack-size" and value.isdigit() and int(value) > 0:
+            stack_size = int(value)
+        elif option == "--stream" and not value:
+            stream = True
+        elif option == "--no-cache" and not value:
+            cache = False
+        else:
+            print(USAGE)
+            sys.exit(64)
+
+    # Only the VM keeps Lox frames off the Python stack, so only its depth
+    # can be configured.
+    if stack_size is not None and engine != "vm":
+        print(USAGE)
         sys.exit(64)
-    elif len(sys.argv) == 2:
-        run_file(sys.argv[1])
+    set_engine(engine, stack_size)
+
+    if len(args) > 1:
+        print(USAGE)
+        sys.exit(64)
+    elif len(args) == 1:
+        run_file(args[0], stream, cache)
     else:
         run_prompt()
 
 
-def run_file(path):
-    with open(path, "r", encoding="utf-8") as file:
-        run(file.read())
-    if error_state["had_error"]:
+def set_engine(name, stack_size=None):
+    """Replace the shared interpreter with a fresh instance of the named engine."""
+    global lox_interpreter
+    if stack_size is None:
+        lox_interpreter = ENGINES[name]()
+    else:
+        lox_interpreter = ENGINES[name](stack_size=stack_size)
+
+
+def run_file(path, stream=False, cache=True):
+    with mapped_source(path) as source:
+        if stream:
+            run_streaming(source)
+        elif cache:
+            run_cached(path, source)
+        else:
+            run(source)
+    if lox_interpreter.errors.had_error:
         sys.exit(65)
-    if error_state["had_runtime_error"]:
+    if lox_interpreter.errors.had_runtime_error:
         sys.exit(70)
 
 
+@contextmanager
+def mapped_source(path):
+    """Memory-map a script and yield its UTF-8 bytes as a memoryview.
+
+    The scanners work on the buffer directly, so a large script is paged in
+    as it is scanned instead of being read and decoded as a whole.
+    """
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            # An empty file can't be mapped.
+            yield memoryview(b"")
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            with memoryview(mapped) as source:
+                yield source
+
+
 def run_prompt():
+    # One session for the whole prompt, so each line sees the globals the
+    # lines before it declared. The interpreter's errors are printed as they
+    # happen.
+    session = Session(lox_interpreter, lox_interpreter.errors)
     try:
         while True:
             line = input("> ")
             if line is None:
                 break
-            run(line)
-            error_state["had_error"] = False
+            session.run(line)
     except EOFError:
         pass
 
 
-def run(source: str) -> None:
-    scanner = Scanner(source)
+def run(source) -> None:
+    """Run a script given as text or as a UTF-8 buffer (see `mapped_source`)."""
+    statements = front_end(source)
+    if statements is not None:
+        lox_interpreter.interpret(statements)
+
+
+def run_cached(path, source) -> None:
+    """Run a script, loading its resolved program from the `.loxc` cache when
+    that is valid instead of running the front-end, and caching it otherwise.
+
+    Engines with a `loxc_variant` cache the program they compile from the
+    resolved one as well, in a variant of the file.
+    """
+    variant = getattr(lox_interpreter, "loxc_variant", None)
+    if variant is None:
+        statements = cached_statements(path, source)
+        if statements is not None:
+            lox_interpreter.interpret(statements)
+        return
+    program = loxc.load(path, source, variant)
+    if program is None:
+        statements = cached_statements(path, source)
+        if statements is None:
+            return
+        program = lox_interpreter.compile(statements)
+        if program is None:
+            return
+        loxc.store(path, source, program, variant)
+    lox_interpreter.execute(program)
+
+
+def cached_statements(path, source):
+    """Returns the resolved program of a script from its `.loxc` cache, or
+    runs the front-end and caches the result; returns None after an error."""
+    statements = loxc.load(path, source)
+    if statements is None:
+        statements = front_end(source)
+        if statements is not None:
+            loxc.store(path, source, statements)
+    return statements
+
+
+def front_end(source):
+    """Scan, parse, resolve and fold a script; returns None after an error.
+
+    Errors are reported to the interpreter's reporter.
+    """
+    errors = lox_interpreter.errors
+    scanner = scanner_for(source, errors)
     tokens = scanner.scan_tokens()
-    parser = Parser(tokens)
+    parser = Parser(tokens, errors)
     statements = parser.parse()
-    if error_state["had_error"]:
-        return
+    if errors.had_error:
+        return None
     resolver = Resolver(lox_interpreter)
     resolver.resolve(statements)
-    if error_state["had_error"]:
-        return
-    lox_interpreter.interpret(statements)
+    if errors.had_error:
+        return None
+    return ConstantFolder().fold(statements)
+
+
+def run_streaming(source) -> None:
+    """Run a script one top-level declaration at a time.
+
+    Tokens are scanned as the parser asks for them, and each declaration is
+    resolved and executed as soon as it is parsed, so output starts before
+    the rest of the script is read and consumed tokens are dropped. The exit
+    status is the same as with `run`: after a syntax or resolution error
+    nothing more is executed, but the rest of the script is still checked so
+    every error is reported. Output of the declarations before the error has
+    already been printed, though.
+    """
+    errors = lox_interpreter.errors
+    tokens = TokenStream(scanner_for(source, errors).iter_tokens())
+    parser = Parser(tokens, errors)
+    resolver = Resolver(lox_interpreter)
+    folder = ConstantFolder()
+    syntax_error = resolution_error = False
+    for statement in parser.declarations():
+        tokens.discard_before(parser.current - 1)
+        # Like `run`, resolve nothing after a syntax error.
+        syntax_error = syntax_error or errors.had_error
+        if not syntax_error:
+            resolver.resolve([statement])
+            resolution_error = resolution_error or errors.had_error
+            if not resolution_error and not errors.had_runtime_error:
+                lox_interpreter.interpret(folder.fold([statement]))
+        # Errors are tracked per declaration; `had_error` is restored below.
+        errors.had_error = False
+    errors.had_error = syntax_error or resolution_error
 
 
 if __name__ == "__main__":
@@ -3,6 +3,8 @@ from typing import List, Any
 
 
 class LoxCallable(ABC):
+    __slots__ = ()
+
     @abstractmethod
     def arity(self) -> int:
         """Returns the number of arguments this function expects."""
@@ -1,5 +1,6 @@
 from .lox_callable import LoxCallable
 from .lox_instance import LoxInstance
+from .shape import Shape
 
 
 class LoxClass(LoxCallable):
@@ -7,28 +8,28 @@ class LoxClass(LoxCallable):
         self.name = name
         self.superclass = superclass
         self.methods = methods or {}
+        # Own methods merged over every inherited one, so lookups never walk
+        # the superclass chain.
+        self.method_table = {}
+        if superclass is not None:
+            self.method_table.update(superclass.method_table)
+        self.method_table.update(self.methods)
+        self.initializer = self.method_table.get("init")
+        self._arity = 0 if self.initializer is None else self.initializer.arity()
+        # Shape of a fresh instance; the transition tree grows from here.
+        self.root_shape = Shape()
 
     def __str__(self):
         return self.name
 
     def call(self, interpreter, arguments):
         instance = LoxInstance(self)
-        initializer = self.find_method("init")
-        if initializer is not None:
-            initializer.bind(instance).call(interpreter, arguments)
+        if self.initializer is not None:
+            self.initializer.invoke(interpreter, [instance, *arguments])
         return instance
 
     def arity(self):
-        initializer = self.find_method("init")
-        if initializer is None:
-            return 0
-        return initializer.arity()
+        return self._arity
 
     def find_method(self, name):
-        if name in self.methods:
-            return self.methods[name]
-
-        if self.superclass is not None:
-            return self.superclass.find_method(name)
-
-        return None
+        return self.method_table.get(name)
@@ -1,32 +1,57 @@
 from .lox_callable import LoxCallable
 from .environment import Environment
-from .error_handler import Return
+from .error_handler import TailCall
 
 
 class LoxFunction(LoxCallable):
-    def __init__(self, declaration, closure, is_initializer=False):
+    __slots__ = ("declaration", "closure", "is_initializer", "instance")
+
+    def __init__(self, declaration, closure, is_initializer=False, instance=None):
         self.declaration = declaration
         self.closure = closure
         self.is_initializer = is_initializer
+        # The instance a method is bound to; it becomes `this` in every call.
+        self.instance = instance
 
     def call(self, interpreter, arguments):
-        environment = Environment(self.closure)
+        if self.instance is not None:
+            arguments = [self.instance, *arguments]
+        return self.invoke(interpreter, arguments)
+
+    def invoke(self, interpreter, frame):
+        """Runs the function with `frame` as the slots of its call frame.
+
+        Parameters occupy the first slots of the frame, in order, after `this`
+        for methods, so the freshly built argument list becomes the frame
+        itself.
+        """
+        function = self
+        environment = Environment(function.closure, frame)
 
-        for i in range(len(self.declaration.params)):
-            param_name = self.declaration.params[i].lexeme
-            environment.define(param_name, arguments[i])
+        while True:
+            completion = function.run(interpreter, environment)
 
-        try:
-            interpreter.execute_block(self.declaration.body, environment)
-        except Return as return_value:
-            if self.is_initializer:
-                return self.closure.get_at(0, "this")
-            return return_value.value
+            if function.is_initializer:
+                return environment.slots[0]
+            if completion is None:
+                return None
+            if completion.__class__ is not TailCall:
+                return completion.value
 
-        if self.is_initializer:
-            return self.closure.get_at(0, "this")
+            # Run the tail call in this loop. The frame is reused when nothing
+            # created during the previous call can still refer to it.
+            target = completion.function
+            if target.closure is function.closure and (
+                not function.declaration.creates_closures
+            ):
+                environment.slots = completion.frame
+            else:
+                environment = Environment(target.closure, completion.frame)
+            function = target
 
-        return None
+    def run(self, interpreter, environment):
+        """Runs the body once in `environment` and returns its completion."""
+        return interpreter.execute_block(self.declaration.body, environment)
 
     def arity(self):
         return len(self.declaration.params)
@@ -38,6 +63,4 @@ class LoxFunction(LoxCallable):
         return self.call(interpreter, arguments)
 
     def bind(self, instance):
-        environment = Environment(self.closure)
-        environment.define("this", instance)
-        return LoxFunction(self.declaration, environment, self.is_initializer)
+        return LoxFunction(self.declaration, self.closure, self.is_initializer, instance)
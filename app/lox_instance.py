@@ -3,22 +3,42 @@ from .token import Token
 
 
 class LoxInstance:
+    """An instance whose fields are laid out by a `Shape` shared across instances.
+
+    The instance itself only stores field values, in `values`, at the index
+    its shape assigns to each field name.
+    """
+
+    __slots__ = ("klass", "shape", "values")
+
     def __init__(self, klass):
         self.klass = klass
-        self.fields = {}
+        self.shape = klass.root_shape
+        self.values = []
 
     def __str__(self):
         return f"{self.klass.name} instance"
 
+    @property
+    def fields(self):
+        """The instance's fields as a name-keyed dict."""
+        return {name: self.values[index] for name, index in self.shape.slots.items()}
+
     def get(self, name):
-        if name.lexeme in self.fields:
-            return self.fields[name.lexeme]
+        index = self.shape.slots.get(name.lexeme)
+        if index is not None:
+            return self.values[index]
 
         method = self.klass.find_method(name.lexeme)
         if method is not None:
             return method.bind(self)
-            
+
         raise RuntimeError(name, f"Undefined property '{name.lexeme}'")
 
     def set(self, name, value):
-        self.fields[name.lexeme] = value
\ No newline at end of file
+        index = self.shape.slots.get(name.lexeme)
+        if index is not None:
+            self.values[index] = value
+        else:
+            self.shape = self.shape.with_field(name.lexeme)
+            self.values.append(value)
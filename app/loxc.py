@@ -0,0 +1,138 @@
+"""On-disk cache of resolved programs, in `.loxc` files.
+
+Like CPython's `__pycache__`, a script's cache lives in a `__loxcache__`
+directory next to it. A `.loxc` file holds a header followed by the
+pickled statements the front-end produced for the script: parsed,
+resolved and constant-folded, but never run. The header records a digest
+of the interpreter's own sources, the Python implementation the file was
+pickled by and the SHA-256 of the script, and a file whose header does
+not match the script being run is ignored.
+
+An engine that compiles the resolved program further can cache its own
+compiled program in a variant of the file, such as `<script>.python.loxc`.
+"""
+import functools
+import gc
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+
+MAGIC = b"LOXC"
+CACHE_DIRECTORY = "__loxcache__"
+
+# Loads in progress, and whether the collector was enabled before the first
+# of them paused it (see `paused_collection`).
+_pause_lock = threading.Lock()
+_pauses = 0
+_collecting = False
+
+
+def cache_path(script_path, variant=""):
+    """Returns the `.loxc` path for a script, or for a variant of its cache."""
+    directory, name = os.path.split(os.path.abspath(script_path))
+    stem = os.path.splitext(name)[0]
+    return os.path.join(directory, CACHE_DIRECTORY, f"{stem}{variant}.loxc")
+
+
+@functools.lru_cache(maxsize=None)
+def interpreter_digest():
+    """Returns a digest of the interpreter's own modules.
+
+    A change to the AST classes, the resolver, the constant folder or an
+    engine can change what a cached program holds or means, so a cache
+    written by different sources is a miss.
+    """
+    digest = hashlib.sha256()
+    directory = os.path.dirname(os.path.abspath(__file__))
+    for name in sorted(os.listdir(directory)):
+        if name.endswith(".py"):
+            with open(os.path.join(directory, name), "rb") as file:
+                digest.update(name.encode() + b"\0" + file.read())
+    return digest.hexdigest()[:16]
+
+
+def header(source):
+    """Returns the header a valid cache for `source` starts with.
+
+    Args:
+        source: The script, as text or as a UTF-8 buffer.
+    """
+    if isinstance(source, str):
+        source = source.encode("utf-8")
+    tag = f"{interpreter_digest()}:{sys.implementation.cache_tag}".encode()
+    return MAGIC + tag + b"\n" + hashlib.sha256(source).digest()
+
+
+@contextmanager
+def paused_collection():
+    """Pauses the cyclic garbage collector while the block runs.
+
+    Unpickling makes many objects and no garbage, so collections triggered
+    along the way only cost time. The collector is process-wide, so loads
+    in several threads share one pause, and it ends with the last of them
+    in the state the first found it in.
+    """
+    global _pauses, _collecting
+    with _pause_lock:
+        if _pauses == 0:
+            _collecting = gc.isenabled()
+            gc.disable()
+        _pauses += 1
+    try:
+        yield
+    finally:
+        with _pause_lock:
+            _pauses -= 1
+            if _pauses == 0 and _collecting:
+                gc.enable()
+
+
+def load(script_path, source, variant=""):
+    """Returns the cached program for a script, or None on a miss.
+
+    A missing, stale or unreadable cache is a miss.
+    """
+    try:
+        expected = header(source)
+        with open(cache_path(script_path, variant), "rb") as file:
+            if file.read(len(expected)) != expected:
+                return None
+            with paused_collection():
+                return pickle.load(file)
+    except Exception:
+        # Anything wrong with the file only means it can't be used.
+        return None
+
+
+def store(script_path, source, program, variant=""):
+    """Caches the program for a script; returns whether it was written.
+
+    Must be called before the statements run, as running them fills in
+    per-node state (inline caches, quickening) that is not part of the
+    program. The file is written under a temporary name and renamed, so a
+    concurrent run never reads half of it. Failures, such as a read-only
+    directory, are ignored.
+    """
+    path = cache_path(script_path, variant)
+    try:
+        payload = pickle.dumps(program, pickle.HIGHEST_PROTOCOL)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(header(source))
+                file.write(payload)
+            # Readable by whoever can read the script, like a .pyc file.
+            os.chmod(temporary, os.stat(script_path).st_mode & 0o666)
+            os.replace(temporary, path)
+        except BaseException:
+            os.remove(temporary)
+            raise
+    except Exception:
+        # Like a failed load, a program that can't be stored is only a miss.
+        return False
+    return True
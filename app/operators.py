@@ -0,0 +1,85 @@
+"""Runtime semantics of Lox's operators, as tables keyed by token kind.
+
+The tree-walker looks an operator's handler up by its token kind instead of
+comparing the kind against every operator in turn. Handlers take the
+operator token, used to report bad operands, and the operand values.
+"""
+from operator import sub, mul, truediv, gt, ge, lt, le
+
+from .error_handler import RuntimeError
+from .token_type import TokenType
+
+
+def is_truthy(value):
+    if value is None:
+        return False
+    if isinstance(value, bool):
+        return value
+    return True
+
+
+def is_equal(a, b):
+    if a is None and b is None:
+        return True
+    if a is None:
+        return False
+    return a == b
+
+
+def check_number_operand(operator, operand):
+    if not isinstance(operand, float):
+        raise RuntimeError(operator, "Operand must be a number.")
+
+
+def check_number_operands(operator, left, right):
+    if not (isinstance(left, float) and isinstance(right, float)):
+        raise RuntimeError(operator, "Operands must be numbers.")
+
+
+def _numeric(apply):
+    """Builds the handler of an operator that needs two number operands."""
+
+    def handler(operator, left, right):
+        check_number_operands(operator, left, right)
+        return apply(left, right)
+
+    return handler
+
+
+def _add(operator, left, right):
+    if isinstance(left, float) and isinstance(right, float):
+        return left + right
+    if isinstance(left, str) and isinstance(right, str):
+        return left + right
+    raise RuntimeError(operator, "Operands must be two numbers or two strings.")
+
+
+def _negate(operator, operand):
+    check_number_operand(operator, operand)
+    return -operand
+
+
+BINARY_OPERATORS = {
+    TokenType.MINUS: _numeric(sub),
+    TokenType.SLASH: _numeric(truediv),
+    TokenType.STAR: _numeric(mul),
+    TokenType.PLUS: _add,
+    TokenType.GREATER: _numeric(gt),
+    TokenType.GREATER_EQUAL: _numeric(ge),
+    TokenType.LESS: _numeric(lt),
+    TokenType.LESS_EQUAL: _numeric(le),
+    TokenType.BANG_EQUAL: lambda operator, left, right: not is_equal(left, right),
+    TokenType.EQUAL_EQUAL: lambda operator, left, right: is_equal(left, right),
+}
+
+UNARY_OPERATORS = {
+    TokenType.MINUS: _negate,
+    TokenType.BANG: lambda operator, operand: not is_truthy(operand),
+}
+
+# Whether `and`/`or` returns its left operand when that operand is truthy
+# (`or`) or when it is falsey (`and`), without evaluating the right one.
+SHORT_CIRCUITS_ON = {
+    TokenType.OR: True,
+    TokenType.AND: False,
+}
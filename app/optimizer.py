@@ -0,0 +1,177 @@
+from typing import List, Optional
+from app.expr import Expr, Visitor as ExprVisitor, Literal
+from app.stmt import Stmt, Visitor as StmtVisitor, Block
+from app.operators import BINARY_OPERATORS, UNARY_OPERATORS, is_truthy
+from app.token_type import TokenType
+from app.error_handler import RuntimeError
+
+
+class ConstantFolder(ExprVisitor, StmtVisitor):
+    """Folds constant subexpressions and prunes branches that can never run.
+
+    Runs after the Resolver, rewriting the statements in place: `Binary`,
+    `Unary` and `Logical` expressions over literals become the `Literal` they
+    evaluate to, `Grouping` wrappers are dropped, and `If` and `While`
+    statements with a constant condition are replaced by the branch that runs.
+    Anything that would fail at runtime, such as `"a" - 1`, is left alone so
+    the error is still reported by the engine, on the operator's line.
+
+    `folded` counts the nodes removed or replaced.
+    """
+
+    def __init__(self):
+        self.folded = 0
+
+    def fold(self, statements: List[Stmt]) -> List[Stmt]:
+        """Fold a list of statements, dropping the ones that can never run."""
+        folded = []
+        for statement in statements:
+            statement = statement.accept(self)
+            if statement is not None:
+                folded.append(statement)
+        return folded
+
+    def _fold_stmt(self, stmt: Stmt) -> Stmt:
+        """Fold a statement that has to stay, such as a branch or a loop body."""
+        folded = stmt.accept(self)
+        if folded is None:
+            return Block([])
+        return folded
+
+    def _fold_expr(self, expr: Expr) -> Expr:
+        return expr.accept(self)
+
+    def _evaluate(self, expr: Expr, operation, *operands: Literal) -> Expr:
+        """Replace an operator over literals by its value.
+
+        Applies the operator handler the engines share to the literal values,
+        so the folded value is exactly the one the program would compute, and
+        the node itself is never run: a failed fold leaves it as it was, with
+        no quickening state, and the error happens at runtime as before.
+        """
+        try:
+            value = operation(expr.operator, *(operand.value for operand in operands))
+        except (RuntimeError, ArithmeticError):
+            return expr
+        self.folded += 1
+        return Literal(value)
+
+    def _is_truthy(self, literal: Literal) -> bool:
+        return is_truthy(literal.value)
+
+    # Statements. Each returns the statement to run in its place, or None.
+
+    def visit_block_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt.statements = self.fold(stmt.statements)
+        return stmt
+
+    def visit_class_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        for method in stmt.methods:
+            method.accept(self)
+        return stmt
+
+    def visit_expression_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt.expression = self._fold_expr(stmt.expression)
+        return stmt
+
+    def visit_function_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt.body = self.fold(stmt.body)
+        return stmt
+
+    def visit_if_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt.condition = self._fold_expr(stmt.condition)
+        stmt.then_branch = self._fold_stmt(stmt.then_branch)
+        if stmt.else_branch is not None:
+            stmt.else_branch = self._fold_stmt(stmt.else_branch)
+
+        if not isinstance(stmt.condition, Literal):
+            return stmt
+        # Branches are statements, not declarations, so taking one out of the
+        # `if` leaves the slots of the enclosing scope unchanged.
+        self.folded += 1
+        if self._is_truthy(stmt.condition):
+            return stmt.then_branch
+        return stmt.else_branch
+
+    def visit_print_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt.expression = self._fold_expr(stmt.expression)
+        return stmt
+
+    def visit_return_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        if stmt.value is not None:
+            stmt.value = self._fold_expr(stmt.value)
+        return stmt
+
+    def visit_var_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        if stmt.initializer is not None:
+            stmt.initializer = self._fold_expr(stmt.initializer)
+        return stmt
+
+    def visit_while_stmt(self, stmt: Stmt) -> Optional[Stmt]:
+        stmt.condition = self._fold_expr(stmt.condition)
+        if isinstance(stmt.condition, Literal) and not self._is_truthy(stmt.condition):
+            self.folded += 1
+            return None
+        stmt.body = self._fold_stmt(stmt.body)
+        return stmt
+
+    # Expressions. Each returns the expression to evaluate in its place.
+
+    def visit_assign_expr(self, expr: Expr) -> Expr:
+        expr.value = self._fold_expr(expr.value)
+        return expr
+
+    def visit_binary_expr(self, expr: Expr) -> Expr:
+        expr.left = self._fold_expr(expr.left)
+        expr.right = self._fold_expr(expr.right)
+        if not (isinstance(expr.left, Literal) and isinstance(expr.right, Literal)):
+            return expr
+        return self._evaluate(expr, BINARY_OPERATORS[expr.operator.type], expr.left, expr.right)
+
+    def visit_call_expr(self, expr: Expr) -> Expr:
+        expr.callee = self._fold_expr(expr.callee)
+        expr.arguments = [self._fold_expr(argument) for argument in expr.arguments]
+        return expr
+
+    def visit_get_expr(self, expr: Expr) -> Expr:
+        expr.object = self._fold_expr(expr.object)
+        return expr
+
+    def visit_grouping_expr(self, expr: Expr) -> Expr:
+        self.folded += 1
+        return self._fold_expr(expr.expression)
+
+    def visit_literal_expr(self, expr: Expr) -> Expr:
+        return expr
+
+    def visit_logical_expr(self, expr: Expr) -> Expr:
+        expr.left = self._fold_expr(expr.left)
+        expr.right = self._fold_expr(expr.right)
+        if not isinstance(expr.left, Literal):
+            return expr
+
+        # A constant left operand decides whether the right one is evaluated.
+        self.folded += 1
+        if self._is_truthy(expr.left) == (expr.operator.type == TokenType.OR):
+            return expr.left
+        return expr.right
+
+    def visit_set_expr(self, expr: Expr) -> Expr:
+        expr.object = self._fold_expr(expr.object)
+        expr.value = self._fold_expr(expr.value)
+        return expr
+
+    def visit_super_expr(self, expr: Expr) -> Expr:
+        return expr
+
+    def visit_this_expr(self, expr: Expr) -> Expr:
+        return expr
+
+    def visit_unary_expr(self, expr: Expr) -> Expr:
+        expr.right = self._fold_expr(expr.right)
+        if isinstance(expr.right, Literal):
+            return self._evaluate(expr, UNARY_OPERATORS[expr.operator.type], expr.right)
+        return expr
+
+    def visit_variable_expr(self, expr: Expr) -> Expr:
+        return expr
@@ -1,3 +1,6 @@
+from enum import IntEnum
+from itertools import islice
+
 from .expr import (
     Binary,
     Literal,
@@ -13,7 +16,7 @@ from .expr import (
     Super,
 )
 from .token_type import TokenType
-from .error_handler import error
+from .error_handler import current_reporter
 from .stmt import (
     Expression as StmtExpression,
     Print as StmtPrint,
@@ -26,31 +29,155 @@ from .stmt import (
     Class,
 )
 
+# Tokens starting a declaration or statement, and the method parsing the rest
+# of it once the token is consumed.
+DECLARATION_PARSERS = {
+    TokenType.CLASS: "class_declaration",
+    TokenType.FUN: "function_declaration",
+    TokenType.VAR: "var_declaration",
+}
+STATEMENT_PARSERS = {
+    TokenType.FOR: "for_statement",
+    TokenType.IF: "if_statement",
+    TokenType.PRINT: "print_statement",
+    TokenType.RETURN: "return_statement",
+    TokenType.WHILE: "while_statement",
+    TokenType.LEFT_BRACE: "block_statement",
+}
+
+# Operators of each binary precedence level, and the prefix operators.
+EQUALITY_OPERATORS = frozenset({TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL})
+COMPARISON_OPERATORS = frozenset(
+    {
+        TokenType.GREATER,
+        TokenType.GREATER_EQUAL,
+        TokenType.LESS,
+        TokenType.LESS_EQUAL,
+    }
+)
+TERM_OPERATORS = frozenset({TokenType.MINUS, TokenType.PLUS})
+FACTOR_OPERATORS = frozenset({TokenType.SLASH, TokenType.STAR})
+UNARY_OPERATORS = frozenset({TokenType.BANG, TokenType.MINUS})
+
+KEYWORD_LITERALS = {TokenType.FALSE: False, TokenType.TRUE: True, TokenType.NIL: None}
+LITERAL_TOKENS = frozenset({TokenType.NUMBER, TokenType.STRING})
+
+
+class Precedence(IntEnum):
+    """Expression precedence levels, from loosest to tightest binding."""
+
+    ASSIGNMENT = 1
+    OR = 2
+    AND = 3
+    EQUALITY = 4
+    COMPARISON = 5
+    TERM = 6
+    FACTOR = 7
+    UNARY = 8
+    CALL = 9
+
+
+# Tokens that can start an expression, and the method parsing it once the
+# token is consumed.
+PREFIX_PARSERS = {
+    TokenType.IDENTIFIER: "variable",
+    TokenType.THIS: "this",
+    TokenType.SUPER: "super_expr",
+    TokenType.LEFT_PAREN: "grouping",
+}
+PREFIX_PARSERS.update(dict.fromkeys(LITERAL_TOKENS, "literal"))
+PREFIX_PARSERS.update(dict.fromkeys(KEYWORD_LITERALS, "keyword_literal"))
+PREFIX_PARSERS.update(dict.fromkeys(UNARY_OPERATORS, "unary"))
+
+# Tokens that can follow an expression to extend it: their precedence as
+# a plain int, and the method parsing the rest once the token is consumed.
+INFIX_RULES = {
+    TokenType.EQUAL: (int(Precedence.ASSIGNMENT), "assignment"),
+    TokenType.OR: (int(Precedence.OR), "logical"),
+    TokenType.AND: (int(Precedence.AND), "logical"),
+    TokenType.LEFT_PAREN: (int(Precedence.CALL), "call"),
+    TokenType.DOT: (int(Precedence.CALL), "get"),
+}
+for operators, precedence in (
+    (EQUALITY_OPERATORS, Precedence.EQUALITY),
+    (COMPARISON_OPERATORS, Precedence.COMPARISON),
+    (TERM_OPERATORS, Precedence.TERM),
+    (FACTOR_OPERATORS, Precedence.FACTOR),
+):
+    for kind in operators:
+        INFIX_RULES[kind] = (int(precedence), "binary")
+
+
+# Number of tokens `TokenStream` pulls from the scanner at a time.
+TOKEN_CHUNK = 64
+
+
+class TokenStream(dict):
+    """Indexable view of a lazily scanned token iterator.
+
+    Lets `Parser` pull tokens as it needs them instead of scanning the whole
+    source first. Tokens are keyed by their index in the token sequence, so
+    the parser's indexing works unchanged and costs a plain dict lookup;
+    only a read past the buffered tokens calls `__missing__`, which pulls
+    the next `TOKEN_CHUNK` tokens. `discard_before` drops tokens the parser
+    is done with.
+    """
 
-class Parser:
     def __init__(self, tokens):
+        super().__init__()
+        self.pending = iter(tokens)
+        self.scanned = 0  # Number of tokens pulled from `pending`.
+        self.start = 0  # Index of the oldest buffered token.
+
+    def __missing__(self, index):
+        while self.scanned <= index:
+            buffered = len(self)
+            chunk = islice(self.pending, TOKEN_CHUNK)
+            self.update(zip(range(self.scanned, self.scanned + TOKEN_CHUNK), chunk))
+            if len(self) == buffered:
+                raise IndexError(index)
+            self.scanned += len(self) - buffered
+        return self[index]
+
+    def discard_before(self, index):
+        """Drop the buffered tokens before `index`; they can't be read again."""
+        for position in range(self.start, min(index, self.scanned)):
+            del self[position]
+        self.start = max(self.start, index)
+
+
+class Parser:
+    def __init__(self, tokens, errors=None):
         self.tokens = tokens
         self.current = 0
+        # Syntax errors go to `errors`, by default the current reporter.
+        self.errors = current_reporter() if errors is None else errors
 
     def parse(self):
-        statements = []
+        return list(self.declarations())
+
+    def declarations(self):
+        """Yield top-level declarations one at a time, as they are parsed.
+
+        A declaration with a syntax error is reported and yielded as None.
+        """
         while not self.is_at_end():
-            statements.append(self.declaration())
-        return statements
+            yield self.declaration()
 
     def declaration(self):
         try:
-            if self.match(TokenType.CLASS):
-                return self.class_declaration()
-            if self.match(TokenType.FUN):
-                return self.function("function")
-            if self.match(TokenType.VAR):
-                return self.var_declaration()
+            parse = DECLARATION_PARSERS.get(self.peek().type)
+            if parse is not None:
+                self.advance()
+                return getattr(self, parse)()
             return self.statement()
         except ParseError:
             self.synchronize()
             return None
 
+    def function_declaration(self):
+        return self.function("function")
+
     def var_declaration(self):
         name = self.consume(TokenType.IDENTIFIER, "Expect variable name.")
 
@@ -62,20 +189,15 @@ class Parser:
         return StmtVar(name, initializer)
 
     def statement(self):
-        if self.match(TokenType.FOR):
-            return self.for_statement()
-        if self.match(TokenType.IF):
-            return self.if_statement()
-        if self.match(TokenType.PRINT):
-            return self.print_statement()
-        if self.match(TokenType.RETURN):
-            return self.return_statement()
-        if self.match(TokenType.WHILE):
-            return self.while_statement()
-        if self.match(TokenType.LEFT_BRACE):
-            return StmtBlock(self.block())
+        parse = STATEMENT_PARSERS.get(self.peek().type)
+        if parse is not None:
+            self.advance()
+            return getattr(self, parse)()
         return self.expression_statement()
 
+    def block_statement(self):
+        return StmtBlock(self.block())
+
     def block(self):
         statements = []
 
@@ -182,112 +304,87 @@ class Parser:
         return Function(name, parameters, body)
 
     def expression(self):
-        return self.assignment()
-
-    def assignment(self):
-        expr = self.or_expr()
-
-        if self.match(TokenType.EQUAL):
-            equals = self.previous()
-            value = self.assignment()
-
-            if isinstance(expr, Variable):
-                name = expr.name
-                return Assign(name, value)
-            elif isinstance(expr, Get):
-                return Set(expr.object, expr.name, value)
-
-            self.error(equals, "Invalid assignment target.")
-
-        return expr
+        return self.parse_precedence(Precedence.ASSIGNMENT)
+
+    def parse_precedence(self, precedence):
+        """Parse an expression, taking in infix operators that bind at least
+        as tightly as `precedence`.
+
+        The token starting the expression picks its prefix parser; then, as
+        long as the next token is an infix operator of high enough
+        precedence, its infix parser extends the expression.
+        """
+        token = self.tokens[self.current]
+        prefix = PREFIX_PARSERS.get(token.type)
+        if prefix is None:
+            raise self.error(token, "Expect expression.")
+        # A token with a prefix parser is never EOF.
+        self.current += 1
+        expr = getattr(self, prefix)(token)
 
-    def or_expr(self):
-        expr = self.and_expr()
-
-        while self.match(TokenType.OR):
-            operator = self.previous()
-            right = self.and_expr()
-            expr = Logical(expr, operator, right)
-
-        return expr
-
-    def and_expr(self):
-        expr = self.equality()
-
-        while self.match(TokenType.AND):
-            operator = self.previous()
-            right = self.equality()
-            expr = Logical(expr, operator, right)
-
-        return expr
+        while True:
+            token = self.tokens[self.current]
+            rule = INFIX_RULES.get(token.type)
+            if rule is None or rule[0] < precedence:
+                return expr
+            self.current += 1
+            expr = getattr(self, rule[1])(expr, token, rule[0])
 
-    def equality(self):
-        expr = self.comparison()
+    # Prefix parsers: called with the token that starts the expression,
+    # already consumed.
 
-        while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
-            operator = self.previous()
-            right = self.comparison()
-            expr = Binary(expr, operator, right)
+    def literal(self, token):
+        return Literal(token.literal)
 
-        return expr
+    def keyword_literal(self, token):
+        return Literal(KEYWORD_LITERALS[token.type])
 
-    def comparison(self):
-        expr = self.term()
+    def variable(self, token):
+        return Variable(token)
 
-        while self.match(
-            TokenType.GREATER,
-            TokenType.GREATER_EQUAL,
-            TokenType.LESS,
-            TokenType.LESS_EQUAL,
-        ):
-            operator = self.previous()
-            right = self.term()
-            expr = Binary(expr, operator, right)
+    def this(self, token):
+        return This(token)
 
-        return expr
+    def super_expr(self, keyword):
+        self.consume(TokenType.DOT, "Expect '.' after 'super'.")
+        method = self.consume(TokenType.IDENTIFIER, "Expect superclass method name.")
+        return Super(keyword, method)
 
-    def term(self):
-        expr = self.factor()
+    def grouping(self, token):
+        expr = self.expression()
+        self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
+        return Grouping(expr)
 
-        while self.match(TokenType.MINUS, TokenType.PLUS):
-            operator = self.previous()
-            right = self.factor()
-            expr = Binary(expr, operator, right)
+    def unary(self, operator):
+        return Unary(operator, self.parse_precedence(Precedence.UNARY))
 
-        return expr
+    # Infix parsers: called with the expression to the left, the consumed
+    # operator token and the operator's precedence.
 
-    def factor(self):
-        expr = self.unary()
+    def assignment(self, target, equals, precedence):
+        # Right-associative: the value may itself be an assignment.
+        value = self.parse_precedence(precedence)
 
-        while self.match(TokenType.SLASH, TokenType.STAR):
-            operator = self.previous()
-            right = self.unary()
-            expr = Binary(expr, operator, right)
+        if isinstance(target, Variable):
+            return Assign(target.name, value)
+        elif isinstance(target, Get):
+            return Set(target.object, target.name, value)
 
-        return expr
+        self.error(equals, "Invalid assignment target.")
+        return target
 
-    def unary(self):
-        if self.match(TokenType.BANG, TokenType.MINUS):
-            operator = self.previous()
-            right = self.unary()
-            return Unary(operator, right)
+    def logical(self, left, operator, precedence):
+        return Logical(left, operator, self.parse_precedence(precedence + 1))
 
-        return self.call()
+    def binary(self, left, operator, precedence):
+        return Binary(left, operator, self.parse_precedence(precedence + 1))
 
-    def call(self):
-        expr = self.primary()
+    def call(self, callee, paren, precedence):
+        return self.finish_call(callee)
 
-        while True:
-            if self.match(TokenType.LEFT_PAREN):
-                expr = self.finish_call(expr)
-            elif self.match(TokenType.DOT):
-                name = self.consume(
-                    TokenType.IDENTIFIER, "Expect property name after '.'."
-                )
-                expr = Get(expr, name)
-            else:
-                break
-        return expr
+    def get(self, object, dot, precedence):
+        name = self.consume(TokenType.IDENTIFIER, "Expect property name after '.'.")
+        return Get(object, name)
 
     def finish_call(self, callee):
         arguments = []
@@ -300,41 +397,15 @@ class Parser:
         paren = self.consume(TokenType.RIGHT_PAREN, "Expect ')' after arguments.")
         return Call(callee, paren, arguments)
 
-    def primary(self):
-        if self.match(TokenType.FALSE):
-            return Literal(False)
-        if self.match(TokenType.TRUE):
-            return Literal(True)
-        if self.match(TokenType.NIL):
-            return Literal(None)
-
-        if self.match(TokenType.NUMBER, TokenType.STRING):
-            return Literal(self.previous().literal)
-
-        if self.match(TokenType.SUPER):
-            keyword = self.previous()
-            self.consume(TokenType.DOT, "Expect '.' after 'super'.")
-            method = self.consume(TokenType.IDENTIFIER, "Expect superclass method name.")
-            return Super(keyword, method)
-
-        if self.match(TokenType.THIS):
-            return This(self.previous())
-
-        if self.match(TokenType.IDENTIFIER):
-            return Variable(self.previous())
-
-        if self.match(TokenType.LEFT_PAREN):
-            expr = self.expression()
-            self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
-            return Grouping(expr)
-
-        raise self.error(self.peek(), "Expect expression.")
-
     def match(self, *types):
-        for token_type in types:
-            if self.check(token_type):
-                self.advance()
-                return True
+        return self.match_any(types)
+
+    def match_any(self, kinds):
+        """Consume the next token if its kind is one of `kinds`."""
+        if self.tokens[self.current].type in kinds:
+            # A matched token is never EOF, so this cannot run past the end.
+            self.current += 1
+            return True
         return False
 
     def consume(self, token_type, message):
@@ -362,7 +433,7 @@ class Parser:
         return self.tokens[self.current - 1]
 
     def error(self, token, message):
-        error(token, message)
+        self.errors.error(token, message)
         return ParseError()
 
     def synchronize(self):
@@ -0,0 +1,66 @@
+"""Type-specialised (quickened) operators for the tree-walker.
+
+The first time a `Binary` or `Unary` node is evaluated it looks at the types
+of its operands and rewrites itself: `guard` records the operand type and
+`operation` the plain Python operator that is correct for that type, such as
+float addition or string concatenation. From then on operands that pass the
+guard skip the dispatch on the operator token and the operand checks. Any
+other operands take the generic path, which still raises the runtime error
+for bad operands.
+"""
+from operator import add, sub, mul, truediv, gt, ge, lt, le, eq, ne, neg, not_
+
+from .token_type import TokenType
+
+# Guard of sites whose operands have no specialisation. No value has it as
+# its type, so these sites always take the generic path.
+GENERIC = object()
+
+BINARY_SPECIALIZATIONS = {
+    (TokenType.PLUS, float): add,
+    (TokenType.PLUS, str): add,
+    (TokenType.MINUS, float): sub,
+    (TokenType.STAR, float): mul,
+    (TokenType.SLASH, float): truediv,
+    (TokenType.GREATER, float): gt,
+    (TokenType.GREATER_EQUAL, float): ge,
+    (TokenType.LESS, float): lt,
+    (TokenType.LESS_EQUAL, float): le,
+    (TokenType.EQUAL_EQUAL, float): eq,
+    (TokenType.EQUAL_EQUAL, str): eq,
+    (TokenType.EQUAL_EQUAL, bool): eq,
+    (TokenType.BANG_EQUAL, float): ne,
+    (TokenType.BANG_EQUAL, str): ne,
+    (TokenType.BANG_EQUAL, bool): ne,
+}
+
+UNARY_SPECIALIZATIONS = {
+    (TokenType.MINUS, float): neg,
+    (TokenType.BANG, bool): not_,
+}
+
+
+def quicken_binary(expr, left, right):
+    """Specialises a `Binary` node for the operand types it was first run with.
+
+    Both operands must have the same type; mixed sites stay generic.
+    """
+    operation = None
+    if type(left) is type(right):
+        operation = BINARY_SPECIALIZATIONS.get((expr.operator.type, type(left)))
+
+    if operation is None:
+        expr.guard = GENERIC
+    else:
+        expr.guard = type(left)
+        expr.operation = operation
+
+
+def quicken_unary(expr, right):
+    """Specialises a `Unary` node for the operand type it was first run with."""
+    operation = UNARY_SPECIALIZATIONS.get((expr.operator.type, type(right)))
+    if operation is None:
+        expr.guard = GENERIC
+    else:
+        expr.guard = type(right)
+        expr.operation = operation
@@ -0,0 +1,253 @@
+import re
+from sys import intern
+from itertools import chain
+from typing import Iterable, Iterator, Optional, Union
+
+from .token import Token
+from .token_type import TokenType
+from .error_handler import ErrorReporter, current_reporter
+from .scanner import Scanner, SINGLE_CHARACTER_TOKENS, EQUAL_SUFFIX_TOKENS
+
+# Splits the source into lexemes in one pass. Spaces, tabs and carriage
+# returns before a lexeme are skipped; a newline starts a lexeme of its own
+# that runs over any whitespace after it, so line counting only looks at
+# those. The last alternatives catch a single unexpected character and the
+# end of the source.
+LEXEME_REGEX = r"""
+    [ \t\r]*
+    (
+        [A-Za-z_][A-Za-z0-9_]*
+      | [!=<>]=?
+      | [(){},.\-+;*]
+      | \n[ \t\r\n]*
+      | [0-9]+(?:\.[0-9]+)?
+      | "[^"]*"?
+      | //[^\n]*
+      | /\*.*?(?:\*/|\Z)
+      | /
+      | %(character)s
+      | \Z
+    )
+"""
+LEXEME_PATTERN = re.compile(LEXEME_REGEX % {"character": "."}, re.VERBOSE | re.DOTALL)
+# The same over UTF-8 bytes, where an unexpected character can take several
+# bytes: a lead byte and its continuation bytes.
+BYTES_LEXEME_PATTERN = re.compile(
+    (LEXEME_REGEX % {"character": r"[\xc0-\xff][\x80-\xbf]* | ."}).encode(),
+    re.VERBOSE | re.DOTALL,
+)
+BYTES_NEWLINE = re.compile(b"\n")
+
+# Token kind of every lexeme whose kind follows from its text alone.
+FIXED_TOKENS = dict(Scanner.keywords)
+FIXED_TOKENS.update(SINGLE_CHARACTER_TOKENS)
+FIXED_TOKENS["/"] = TokenType.SLASH
+for character, (alone, with_equal) in EQUAL_SUFFIX_TOKENS.items():
+    FIXED_TOKENS[character] = alone
+    FIXED_TOKENS[character + "="] = with_equal
+# The kind and lexeme of each fixed token, keyed by its text and by its
+# UTF-8 bytes, so every token of the same keyword or operator shares one
+# lexeme string.
+SHARED_TOKENS = {text: (kind, text) for text, kind in FIXED_TOKENS.items()}
+SHARED_BYTES_TOKENS = {text.encode(): (kind, text) for text, kind in FIXED_TOKENS.items()}
+
+# Number of characters `RegexScanner.iter_tokens` scans at a time.
+SCAN_CHUNK = 4096
+
+
+# The quote and block comment delimiters, as text and as bytes.
+DELIMITERS = {str: ('"', "/*", "*/"), bytes: (b'"', b"/*", b"*/")}
+
+
+def cuts_lexeme(lexemes):
+    """Tells whether the last lexeme of a chunk is a string or block comment
+    that the end of the chunk cut short."""
+    for last in reversed(lexemes):
+        if last:
+            break
+    else:
+        return False
+    quote, comment_start, comment_end = DELIMITERS[type(last)]
+    if last[:1] == quote:
+        return len(last) == 1 or last[-1:] != quote
+    if last[:2] == comment_start:
+        return len(last) < 4 or last[-2:] != comment_end
+    return False
+
+
+IDENTIFIER_START = frozenset("_abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ")
+DIGITS = frozenset("0123456789")
+IDENTIFIER_START_BYTES = frozenset(character.encode() for character in IDENTIFIER_START)
+DIGIT_BYTES = frozenset(character.encode() for character in DIGITS)
+
+
+class RegexScanner:
+    """Scans source code with one compiled regular expression.
+
+    Produces the same tokens, line numbers and error reports as `Scanner`,
+    but the regular expression engine splits the source into lexemes, so
+    Python code only runs once per lexeme instead of once per character.
+
+    Attributes:
+        source (str): The input source code to scan.
+        tokens (list[Token]): List of tokens generated during scanning.
+        line (int): Current line number in the source (for error reporting).
+        errors (ErrorReporter): Gets the errors found while scanning.
+    """
+
+    pattern = LEXEME_PATTERN
+
+    def __init__(self, source: str, errors: Optional[ErrorReporter] = None):
+        """Initializes the scanner with source code.
+
+        Args:
+            source: The source code string to tokenize.
+            errors: The reporter to report errors to; by default the current
+                one.
+        """
+        self.source = source
+        self.errors = current_reporter() if errors is None else errors
+        self.tokens = []
+        self.line = 1
+
+    def scan_tokens(self) -> list[Token]:
+        """Scans the entire source code and generates tokens.
+
+        Returns:
+            A list of tokens representing the source code.
+        """
+        self.tokens.extend(self.generate_tokens(self.pattern.findall(self.source)))
+        return self.tokens
+
+    def iter_tokens(self) -> Iterator[Token]:
+        """Scans the source lazily, yielding each token once it is matched.
+
+        Returns:
+            An iterator over the tokens, ending with the EOF token. Tokens are
+            not kept in `tokens`.
+        """
+        return self.generate_tokens(chain.from_iterable(self.lexeme_chunks()))
+
+    def lexeme_chunks(self) -> Iterator[list[str]]:
+        """Splits the source into lexemes one chunk of lines at a time.
+
+        Each chunk ends after a newline, which only a string or a block
+        comment can span; a chunk that cuts one of those is grown until the
+        lexeme is complete or the source ends.
+        """
+        source = self.source
+        start = 0
+        size = SCAN_CHUNK
+        while start < len(source):
+            end = self.line_end(start + size)
+            lexemes = self.pattern.findall(source, start, end)
+            if end < len(source) and cuts_lexeme(lexemes):
+                size *= 2
+                continue
+            yield lexemes
+            start = end
+            size = SCAN_CHUNK
+
+    def line_end(self, position: int) -> int:
+        """Returns the index after the first newline at or after `position`,
+        or the length of the source if there is none."""
+        return self.source.find("\n", position) + 1 or len(self.source)
+
+    def generate_tokens(self, lexemes: Iterable[str]) -> Iterator[Token]:
+        """Turns lexemes into tokens, reporting the ones that are errors.
+
+        Args:
+            lexemes: The lexemes of the source, in order.
+
+        Yields:
+            The tokens, followed by the EOF token.
+        """
+        fixed = SHARED_TOKENS.get
+
+        for text in lexemes:
+            token = fixed(text)
+            if token is not None:
+                yield Token(token[0], token[1], None, self.line)
+                continue
+
+            first = text[:1]
+            if first == "\n":
+                self.line += text.count("\n")
+            elif first in IDENTIFIER_START:
+                # Interned, so tokens of the same name share the string and
+                # environment lookups by name compare it by identity.
+                yield Token(TokenType.IDENTIFIER, intern(text), None, self.line)
+            elif first in DIGITS:
+                yield Token(TokenType.NUMBER, text, float(text), self.line)
+            elif first == '"':
+                # Like `Scanner`, a string spanning lines gets its last line.
+                self.line += text.count("\n")
+                if len(text) > 1 and text[-1] == '"':
+                    yield Token(TokenType.STRING, text, text[1:-1], self.line)
+                else:
+                    self.errors.error(self.line, "Unterminated string.")
+            elif first == "/":
+                self.line += text.count("\n")  # A comment.
+            elif text:
+                self.errors.error(self.line, f"Unexpected character: {text}")
+
+        yield Token(TokenType.EOF, "", None, self.line)
+
+
+class BufferScanner(RegexScanner):
+    """Scans UTF-8 source held in a bytes-like buffer, such as a memory-mapped
+    file, without decoding the whole of it.
+
+    The regular expression runs over the bytes; only identifiers, numbers,
+    strings and unexpected characters are decoded when their tokens are made,
+    and keywords and punctuation reuse shared text. Produces the same tokens
+    and errors as `RegexScanner` on the decoded source.
+
+    Attributes:
+        source (bytes | memoryview | mmap): The UTF-8 encoded source to scan.
+    """
+
+    pattern = BYTES_LEXEME_PATTERN
+
+    def line_end(self, position: int) -> int:
+        newline = BYTES_NEWLINE.search(self.source, position)
+        return newline.end() if newline is not None else len(self.source)
+
+    def generate_tokens(self, lexemes: Iterable[bytes]) -> Iterator[Token]:
+        fixed = SHARED_BYTES_TOKENS.get
+
+        for text in lexemes:
+            token = fixed(text)
+            if token is not None:
+                yield Token(token[0], token[1], None, self.line)
+                continue
+
+            first = text[:1]
+            if first == b"\n":
+                self.line += text.count(b"\n")
+            elif first in IDENTIFIER_START_BYTES:
+                yield Token(TokenType.IDENTIFIER, intern(text.decode("ascii")), None, self.line)
+            elif first in DIGIT_BYTES:
+                yield Token(TokenType.NUMBER, text.decode("ascii"), float(text), self.line)
+            elif first == b'"':
+                self.line += text.count(b"\n")
+                if len(text) > 1 and text[-1:] == b'"':
+                    lexeme = text.decode("utf-8")
+                    yield Token(TokenType.STRING, lexeme, lexeme[1:-1], self.line)
+                else:
+                    self.errors.error(self.line, "Unterminated string.")
+            elif first == b"/":
+                self.line += text.count(b"\n")  # A comment.
+            elif text:
+                self.errors.error(self.line, f"Unexpected character: {text.decode('utf-8')}")
+
+        yield Token(TokenType.EOF, "", None, self.line)
+
+
+def scanner_for(
+    source: Union[str, bytes, memoryview], errors: Optional[ErrorReporter] = None
+) -> RegexScanner:
+    """Returns the scanner for source given as text or as a UTF-8 buffer."""
+    if isinstance(source, str):
+        return RegexScanner(source, errors)
+    return BufferScanner(source, errors)
@@ -0,0 +1,88 @@
+"""Incremental front-end for the interactive prompt.
+
+A `Session` runs one input at a time against a long-lived interpreter.
+Its resolver keeps the global scope between inputs, so an input can use
+the globals earlier ones declared, and only the new input is scanned,
+parsed, resolved and folded. Globals are looked up by name at runtime, so
+redefining a function takes effect in every function that calls it
+without resolving those again.
+
+Each session reports errors to its own `ErrorReporter`, which becomes its
+interpreter's too, so sessions can run in separate threads of one process.
+"""
+from typing import Dict, List, Optional, Union
+
+from .regex_scanner import scanner_for
+from .parser import Parser
+from .resolver import Resolver
+from .optimizer import ConstantFolder
+from .stmt import Stmt, Var, Function, Class
+from .error_handler import ErrorReporter
+
+
+class Session:
+    """The state of a REPL between inputs.
+
+    Attributes:
+        interpreter: The engine the inputs run on.
+        resolver (Resolver): Resolves every input; its global scope holds
+            the globals declared so far.
+        declarations (dict[str, Stmt]): The latest resolved declaration of
+            each global, by name.
+        errors (ErrorReporter): Gets the errors of every input, compile and
+            runtime errors alike; it is the interpreter's `errors`. Its flags
+            and diagnostics are those of the last input, so a long session
+            does not pile them up.
+    """
+
+    def __init__(self, interpreter, errors=None):
+        """Initializes a session with no globals.
+
+        Args:
+            interpreter: The engine to run the inputs on.
+            errors: The reporter to report errors to; by default a new one
+                that collects diagnostics without printing them.
+        """
+        self.interpreter = interpreter
+        self.errors = ErrorReporter() if errors is None else errors
+        interpreter.errors = self.errors
+        self.resolver = Resolver(interpreter)
+        self.resolver.redefine_globals = True
+        self.folder = ConstantFolder()
+        self.declarations: Dict[str, Stmt] = {}
+
+    def run(self, source: Union[str, bytes, memoryview]) -> None:
+        """Compiles an input and runs it unless it has errors."""
+        self.errors.had_runtime_error = False
+        statements = self.compile(source)
+        if statements is not None:
+            self.interpreter.interpret(statements)
+
+    def compile(self, source: Union[str, bytes, memoryview]) -> Optional[List[Stmt]]:
+        """Scans, parses, resolves and folds an input; returns None after an
+        error.
+
+        Globals declared by earlier inputs may be declared again, once per
+        input. An input with errors never runs, so the globals it declared
+        are forgotten.
+        """
+        self.errors.had_error = False
+        self.errors.diagnostics.clear()
+        statements = Parser(scanner_for(source, self.errors).scan_tokens(), self.errors).parse()
+        if self.errors.had_error:
+            return None
+        resolver = self.resolver
+        resolver.declared_globals = {}
+        resolver.resolve(statements)
+        if self.errors.had_error:
+            global_scope = resolver.scopes[0]
+            for name, redefined in resolver.declared_globals.items():
+                if not redefined:
+                    del global_scope[name]
+            return None
+
+        statements = self.folder.fold(statements)
+        for statement in statements:
+            if isinstance(statement, (Var, Function, Class)):
+                self.declarations[statement.name.lexeme] = statement
+        return statements
@@ -1,10 +1,10 @@
 from enum import Enum, auto
-from typing import Dict, List
-from app.expr import Expr, Visitor as ExprVisitor
+from typing import Dict, List, Optional
+from app.expr import Expr, Visitor as ExprVisitor, Call
 from app.stmt import Stmt, Visitor as StmtVisitor, Block, Var, Function
 from app.interpreter import Interpreter
 from app.token import Token
-from app.error_handler import error
+from app.error_handler import ErrorReporter
 
 
 class FunctionType(Enum):
@@ -21,11 +21,22 @@ class ClassType(Enum):
 
 
 class Resolver(ExprVisitor, StmtVisitor):
-    def __init__(self, interpreter: Interpreter):
+    def __init__(self, interpreter: Interpreter, errors: Optional[ErrorReporter] = None):
         self.interpreter = interpreter
+        # Resolution errors go to `errors`, by default the interpreter's.
+        self.errors = interpreter.errors if errors is None else errors
         self.scopes: List[Dict[str, bool]] = [{}]  # Always have a global scope
+        # Slot index of every name declared in the matching scope.
+        self.slots: List[Dict[str, int]] = [{}]
         self.current_function = FunctionType.NONE
+        self.current_declaration = None
         self.current_class = ClassType.NONE
+        # Set by `repl.Session`: whether globals an earlier input declared
+        # may be declared again, once per input.
+        self.redefine_globals = False
+        # When redefining globals, the globals declared since this was last
+        # cleared, each mapped to whether it was declared before.
+        self.declared_globals: Dict[str, bool] = {}
 
     def resolve(self, statements: List[Stmt]) -> None:
         """Resolve a list of statements."""
@@ -43,10 +54,12 @@ class Resolver(ExprVisitor, StmtVisitor):
     def _begin_scope(self) -> None:
         """Create a new scope."""
         self.scopes.append({})
+        self.slots.append({})
 
     def _end_scope(self) -> None:
         """Remove the most recently added scope."""
         self.scopes.pop()
+        self.slots.pop()
 
     def _declare(self, name: Token) -> None:
         """Declare a variable in the current scope.
@@ -58,10 +71,28 @@ class Resolver(ExprVisitor, StmtVisitor):
             return
 
         scope = self.scopes[-1]
+        redefining = self.redefine_globals and len(self.scopes) == 1
         if name.lexeme in scope:
-            error(name, "Already a variable with this name in this scope.")
+            if redefining and name.lexeme not in self.declared_globals:
+                # The new global replaces the old one, which stays readable
+                # until then, as in `var count = count + 1;`.
+                self.declared_globals[name.lexeme] = True
+                return
+            self.errors.error(name, "Already a variable with this name in this scope.")
             return
         scope[name.lexeme] = False
+        self._assign_slot(name.lexeme)
+        if redefining:
+            self.declared_globals[name.lexeme] = False
+
+    def _assign_slot(self, name: str) -> None:
+        """Give a name the next free slot in the innermost scope.
+
+        Slots are handed out in declaration order, which is the order the
+        interpreter defines the variables in at runtime.
+        """
+        slots = self.slots[-1]
+        slots[name] = len(slots)
 
     def _define(self, name: Token) -> None:
         """Define a variable in the current scope.
@@ -76,13 +107,15 @@ class Resolver(ExprVisitor, StmtVisitor):
     def _resolve_local(self, expr: Expr, name: Token) -> None:
         """Resolve a local variable in the current scope chain.
 
-        If we find the variable, we tell the interpreter how many scopes there are between
-        the current scope and the scope where the variable is found.
-        If we walk through all scopes and never find it, we assume it's global.
+        If we find the variable, we record on the node how many scopes there are between
+        the current scope and the scope where the variable is found, and its slot there.
+        Variables in the global scope, or not found at all, keep a depth of None and are
+        looked up by name at runtime.
         """
-        for i in range(len(self.scopes) - 1, -1, -1):
+        for i in range(len(self.scopes) - 1, 0, -1):
             if name.lexeme in self.scopes[i]:
-                self.interpreter.resolve(expr, len(self.scopes) - 1 - i)
+                expr.depth = len(self.scopes) - 1 - i
+                expr.slot = self.slots[i][name.lexeme]
                 return
 
     def visit_block_stmt(self, stmt: Block) -> None:
@@ -92,8 +125,14 @@ class Resolver(ExprVisitor, StmtVisitor):
         self._end_scope()
         return None
 
+    def _mark_closure(self) -> None:
+        """Note that the enclosing function creates closures over its frame."""
+        if self.current_declaration is not None:
+            self.current_declaration.creates_closures = True
+
     def visit_class_stmt(self, stmt: Stmt) -> None:
         """Visit a class declaration."""
+        self._mark_closure()
         self._declare(stmt.name)
         self._define(stmt.name)
 
@@ -104,7 +143,7 @@ class Resolver(ExprVisitor, StmtVisitor):
             stmt.superclass is not None
             and stmt.name.lexeme == stmt.superclass.name.lexeme
         ):
-            error(stmt.superclass.name, "A class can't inherit from itself.")
+            self.errors.error(stmt.superclass.name, "A class can't inherit from itself.")
 
         if stmt.superclass is not None:
             self.current_class = ClassType.SUBCLASS
@@ -112,13 +151,12 @@ class Resolver(ExprVisitor, StmtVisitor):
 
             self._begin_scope()
             self.scopes[-1]["super"] = True
+            self._assign_slot("super")
 
-        self._begin_scope()
-        self.scopes[-1]["this"] = True
         method_names = set()
         for method in stmt.methods:
             if method.name.lexeme in method_names:
-                error(
+                self.errors.error(
                     method.name,
                     f"Method '{method.name.lexeme}' is already defined in this class.",
                 )
@@ -130,7 +168,6 @@ class Resolver(ExprVisitor, StmtVisitor):
                 declaration = FunctionType.INITIALIZER
 
             self._resolve_function(method, declaration)
-        self._end_scope()
 
         if stmt.superclass is not None:
             self._end_scope()
@@ -149,7 +186,7 @@ class Resolver(ExprVisitor, StmtVisitor):
     def visit_variable_expr(self, expr: Expr) -> None:
         """Visit a variable expression."""
         if self.scopes and self.scopes[-1].get(expr.name.lexeme) is False:
-            error(expr.name, f"Can't read local variable in its own initializer.")
+            self.errors.error(expr.name, f"Can't read local variable in its own initializer.")
             return
 
         declared = False
@@ -158,7 +195,7 @@ class Resolver(ExprVisitor, StmtVisitor):
                 declared = True
                 break
         if not declared and self.scopes:
-            error(expr.name, f"Variable '{expr.name.lexeme}' used before declaration.")
+            self.errors.error(expr.name, f"Variable '{expr.name.lexeme}' used before declaration.")
             return
 
         self._resolve_local(expr, expr.name)
@@ -172,6 +209,7 @@ class Resolver(ExprVisitor, StmtVisitor):
 
     def visit_function_stmt(self, stmt: Function) -> None:
         """Visit a function declaration."""
+        self._mark_closure()
         self._declare(stmt.name)
         self._define(stmt.name)
         self._resolve_function(stmt, FunctionType.FUNCTION)
@@ -180,9 +218,15 @@ class Resolver(ExprVisitor, StmtVisitor):
     def _resolve_function(self, function: Function, type: FunctionType) -> None:
         """Resolve a function's body."""
         enclosing_function = self.current_function
+        enclosing_declaration = self.current_declaration
         self.current_function = type
+        self.current_declaration = function
 
         self._begin_scope()
+        if type in (FunctionType.METHOD, FunctionType.INITIALIZER):
+            # Methods find `this` in slot 0 of their own frame.
+            self.scopes[-1]["this"] = True
+            self._assign_slot("this")
         for param in function.params:
             self._declare(param)
             self._define(param)
@@ -190,6 +234,7 @@ class Resolver(ExprVisitor, StmtVisitor):
         self._end_scope()
 
         self.current_function = enclosing_function
+        self.current_declaration = enclosing_declaration
 
     def visit_expression_stmt(self, stmt: Stmt) -> None:
         """Visit an expression statement."""
@@ -212,12 +257,15 @@ class Resolver(ExprVisitor, StmtVisitor):
     def visit_return_stmt(self, stmt: Stmt) -> None:
         """Visit a return statement."""
         if self.current_function == FunctionType.NONE:
-            error(stmt.keyword, "Can't return from top-level code.")
+            self.errors.error(stmt.keyword, "Can't return from top-level code.")
             return
         if stmt.value is not None:
             if self.current_function == FunctionType.INITIALIZER:
-                error(stmt.keyword, "Can't return a value from an initializer.")
+                self.errors.error(stmt.keyword, "Can't return a value from an initializer.")
             self._resolve_expr(stmt.value)
+            # The call is the last thing the function does, so the caller's
+            # call loop can run it in place of this one.
+            stmt.tail_call = isinstance(stmt.value, Call)
         return None
 
     def visit_while_stmt(self, stmt: Stmt) -> None:
@@ -273,7 +321,7 @@ class Resolver(ExprVisitor, StmtVisitor):
     def visit_this_expr(self, expr: Expr) -> None:
         """Visit a this expression."""
         if self.current_class == ClassType.NONE:
-            error(expr.keyword, "Can't use 'this' outside of a class.")
+            self.errors.error(expr.keyword, "Can't use 'this' outside of a class.")
             return
         self._resolve_local(expr, expr.keyword)
         return None
@@ -281,9 +329,9 @@ class Resolver(ExprVisitor, StmtVisitor):
     def visit_super_expr(self, expr: Expr) -> None:
         """Visit a super expression."""
         if self.current_class == ClassType.NONE:
-            error(expr.keyword, "Can't use 'super' outside of a class.")
+            self.errors.error(expr.keyword, "Can't use 'super' outside of a class.")
         elif self.current_class != ClassType.SUBCLASS:
-            error(expr.keyword, "Can't use 'super' in a class with no superclass.")
+            self.errors.error(expr.keyword, "Can't use 'super' in a class with no superclass.")
             
         self._resolve_local(expr, expr.keyword)
         return None
@@ -1,6 +1,29 @@
+from typing import Optional
 from .token import Token
 from .token_type import TokenType
-from .error_handler import error
+from .error_handler import ErrorReporter, current_reporter
+
+# Characters that always make a token on their own.
+SINGLE_CHARACTER_TOKENS = {
+    "(": TokenType.LEFT_PAREN,
+    ")": TokenType.RIGHT_PAREN,
+    "{": TokenType.LEFT_BRACE,
+    "}": TokenType.RIGHT_BRACE,
+    ",": TokenType.COMMA,
+    ".": TokenType.DOT,
+    "-": TokenType.MINUS,
+    "+": TokenType.PLUS,
+    ";": TokenType.SEMICOLON,
+    "*": TokenType.STAR,
+}
+
+# Characters whose token changes when followed by "=": (alone, with "=").
+EQUAL_SUFFIX_TOKENS = {
+    "!": (TokenType.BANG, TokenType.BANG_EQUAL),
+    "=": (TokenType.EQUAL, TokenType.EQUAL_EQUAL),
+    "<": (TokenType.LESS, TokenType.LESS_EQUAL),
+    ">": (TokenType.GREATER, TokenType.GREATER_EQUAL),
+}
 
 
 class Scanner:
@@ -12,15 +35,19 @@ class Scanner:
         start (int): Starting index of the current lexeme being scanned.
         current (int): Current index being scanned in the source.
         line (int): Current line number in the source (for error reporting).
+        errors (ErrorReporter): Gets the errors found while scanning.
     """
 
-    def __init__(self, source: str):
+    def __init__(self, source: str, errors: Optional[ErrorReporter] = None):
         """Initializes the scanner with source code.
         
         Args:
             source: The source code string to tokenize.
+            errors: The reporter to report errors to; by default the current
+                one.
         """
         self.source = source
+        self.errors = current_reporter() if errors is None else errors
         self.tokens = []
         self.start = 0
         self.current = 0
@@ -69,38 +96,14 @@ class Scanner:
     def scan_token(self) -> None:
         """Processes the next character and generates a token."""
         c = self.advance()
-        if c == "(":
-            self.add_token(TokenType.LEFT_PAREN)
-        elif c == ")":
-            self.add_token(TokenType.RIGHT_PAREN)
-        elif c == "{":
-            self.add_token(TokenType.LEFT_BRACE)
-        elif c == "}":
-            self.add_token(TokenType.RIGHT_BRACE)
-        elif c == ",":
-            self.add_token(TokenType.COMMA)
-        elif c == ".":
-            self.add_token(TokenType.DOT)
-        elif c == "-":
-            self.add_token(TokenType.MINUS)
-        elif c == "+":
-            self.add_token(TokenType.PLUS)
-        elif c == ";":
-            self.add_token(TokenType.SEMICOLON)
-        elif c == "*":
-            self.add_token(TokenType.STAR)
-        elif c == "!":
-            self.add_token(TokenType.BANG_EQUAL if self.match("=") else TokenType.BANG)
-        elif c == "=":
-            self.add_token(
-                TokenType.EQUAL_EQUAL if self.match("=") else TokenType.EQUAL
-            )
-        elif c == "<":
-            self.add_token(TokenType.LESS_EQUAL if self.match("=") else TokenType.LESS)
-        elif c == ">":
-            self.add_token(
-                TokenType.GREATER_EQUAL if self.match("=") else TokenType.GREATER
-            )
+        kind = SINGLE_CHARACTER_TOKENS.get(c)
+        if kind is not None:
+            self.add_token(kind)
+            return
+
+        kinds = EQUAL_SUFFIX_TOKENS.get(c)
+        if kinds is not None:
+            self.add_token(kinds[1] if self.match("=") else kinds[0])
         elif c == "/":
             if self.match("/"):
                 while self.peek() != "\n" and not self.is_at_end():
@@ -127,7 +130,7 @@ class Scanner:
         elif self.is_alpha(c):
             self.identifier()
         else:
-            error(self.line, f"Unexpected character: {c}")
+            self.errors.error(self.line, f"Unexpected character: {c}")
 
     def advance(self) -> str:
         """Consumes the next character in the source.
@@ -190,7 +193,7 @@ class Scanner:
             self.advance()
 
         if self.is_at_end():
-            error(self.line, "Unterminated string.")
+            self.errors.error(self.line, "Unterminated string.")
             return
 
         self.advance()
@@ -0,0 +1,24 @@
+class Shape:
+    """Field layout shared by instances that added the same fields in the same order.
+
+    `slots` maps each field name to its index in the instance's value list.
+    Adding a field moves an instance along a transition to the child shape,
+    which is created once and then shared, so instances built the same way
+    end up with the identical `Shape` object.
+    """
+
+    __slots__ = ("slots", "transitions")
+
+    def __init__(self, slots=None):
+        self.slots = slots if slots is not None else {}
+        self.transitions = {}
+
+    def with_field(self, name):
+        """Returns the shape reached by adding field `name` to this one."""
+        shape = self.transitions.get(name)
+        if shape is None:
+            slots = dict(self.slots)
+            slots[name] = len(slots)
+            shape = Shape(slots)
+            self.transitions[name] = shape
+        return shape
@@ -28,11 +28,15 @@ class Visitor:
 
 
 class Stmt:
+    __slots__ = ()
+
     def accept(self, visitor):
         pass
 
 
 class Expression(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression):
         self.expression = expression
 
@@ -41,6 +45,8 @@ class Expression(Stmt):
 
 
 class Print(Stmt):
+    __slots__ = ("expression",)
+
     def __init__(self, expression):
         self.expression = expression
 
@@ -49,6 +55,8 @@ class Print(Stmt):
 
 
 class Var(Stmt):
+    __slots__ = ("name", "initializer")
+
     def __init__(self, name, initializer):
         self.name = name
         self.initializer = initializer
@@ -58,6 +66,8 @@ class Var(Stmt):
 
 
 class Block(Stmt):
+    __slots__ = ("statements",)
+
     def __init__(self, statements):
         self.statements = statements
 
@@ -66,6 +76,8 @@ class Block(Stmt):
 
 
 class If(Stmt):
+    __slots__ = ("condition", "then_branch", "else_branch")
+
     def __init__(self, condition, then_branch, else_branch):
         self.condition = condition
         self.then_branch = then_branch
@@ -76,6 +88,8 @@ class If(Stmt):
 
 
 class While(Stmt):
+    __slots__ = ("condition", "body")
+
     def __init__(self, condition, body):
         self.condition = condition
         self.body = body
@@ -85,25 +99,36 @@ class While(Stmt):
 
 
 class Function(Stmt):
+    __slots__ = ("name", "params", "body", "creates_closures")
+
     def __init__(self, name, params, body):
         self.name = name
         self.params = params
         self.body = body
+        # Set by the Resolver if the body declares functions or classes, which
+        # can keep a reference to the call's environment.
+        self.creates_closures = False
 
     def accept(self, visitor):
         return visitor.visit_function_stmt(self)
 
 
 class Return(Stmt):
+    __slots__ = ("keyword", "value", "tail_call")
+
     def __init__(self, keyword, value):
         self.keyword = keyword
         self.value = value
+        # Set by the Resolver when the returned value is a call in tail position.
+        self.tail_call = False
 
     def accept(self, visitor):
         return visitor.visit_return_stmt(self)
 
 
 class Class(Stmt):
+    __slots__ = ("name", "superclass", "methods")
+
     def __init__(self, name, superclass, methods):
         self.name = name
         self.superclass = superclass
@@ -1,7 +1,17 @@
+from array import array
+
 from .token_type import TokenType
 
+# Token kinds indexed by their value, to turn a stored kind back into a
+# `TokenType` without calling the enum.
+KINDS = [None] * (max(TokenType) + 1)
+for kind in TokenType:
+    KINDS[kind] = kind
+
 
 class Token:
+    __slots__ = ("type", "lexeme", "literal", "line")
+
     def __init__(self, type: TokenType, lexeme: str, literal: object, line: int):
         self.type = type
         self.lexeme = lexeme
@@ -10,3 +20,59 @@ class Token:
 
     def __str__(self):
         return f"{self.type} {self.lexeme} {self.literal}"
+
+
+class TokenBuffer:
+    """A token list stored column by column instead of one object per token.
+
+    Kinds and lines are packed into arrays and lexemes kept in a list, so
+    lexemes the scanner shares (keywords, punctuation, repeated names) cost
+    one reference each; the literals of the few number and string tokens
+    live in a table keyed by index. Indexing makes a `Token` view, so the
+    buffer can be handed to `Parser` in place of a list. The view for the
+    most recently read index is reused, as the parser reads the same token
+    several times in a row.
+
+    Attributes:
+        kinds (array): The kind of each token.
+        lines (array): The line of each token.
+        lexemes (list[str]): The lexeme of each token.
+        literals (dict[int, object]): Literal values by token index.
+    """
+
+    __slots__ = ("kinds", "lines", "lexemes", "literals", "view")
+
+    def __init__(self, tokens=()):
+        self.kinds = array("B")
+        self.lines = array("L")
+        self.lexemes = []
+        self.literals = {}
+        self.view = None
+        self.extend(tokens)
+
+    def append(self, token: Token) -> None:
+        if token.literal is not None:
+            self.literals[len(self.lexemes)] = token.literal
+        self.kinds.append(token.type)
+        self.lines.append(token.line)
+        self.lexemes.append(token.lexeme)
+
+    def extend(self, tokens) -> None:
+        for token in tokens:
+            self.append(token)
+
+    def __len__(self):
+        return len(self.lexemes)
+
+    def __getitem__(self, index: int) -> Token:
+        view = self.view
+        if view is not None and view[0] == index:
+            return view[1]
+        token = Token(
+            KINDS[self.kinds[index]],
+            self.lexemes[index],
+            self.literals.get(index),
+            self.lines[index],
+        )
+        self.view = (index, token)
+        return token
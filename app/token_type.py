@@ -1,7 +1,15 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
-class TokenType(Enum):
+class TokenType(IntEnum):
+    """Token kinds.
+
+    Kinds are small integers: they hash and compare as cheaply as ints, so
+    they can key the scanner, parser and interpreter dispatch tables.
+    """
+
+    __str__ = Enum.__str__
+
     # Single-character tokens.
     LEFT_PAREN = 1
     RIGHT_PAREN = 2
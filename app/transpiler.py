@@ -0,0 +1,786 @@
+import marshal
+import math
+import traceback
+from .stmt import Visitor as StmtVisitor
+from .expr import Visitor as ExprVisitor, Binary, Logical, Grouping, Unary, Literal, Get, Super
+from .token import Token
+from .token_type import TokenType
+from .error_handler import ErrorReporter, print_diagnostic, RuntimeError
+from .transpiler_runtime import make_namespace
+
+GENERATED_FILENAME = "<lox>"
+
+# CPython refuses to compile code nested past its parser's and compiler's
+# limits, so an expression nested this deep and a loop inside this many
+# loops are moved into helper functions.
+MAX_EXPRESSION_DEPTH = 20
+MAX_LOOP_DEPTH = 16
+
+ARITHMETIC_OPERATORS = {
+    TokenType.MINUS: "-",
+    TokenType.STAR: "*",
+    TokenType.SLASH: "/",
+    TokenType.GREATER: ">",
+    TokenType.GREATER_EQUAL: ">=",
+    TokenType.LESS: "<",
+    TokenType.LESS_EQUAL: "<=",
+}
+
+BOOLEAN_OPERATORS = {
+    TokenType.GREATER,
+    TokenType.GREATER_EQUAL,
+    TokenType.LESS,
+    TokenType.LESS_EQUAL,
+    TokenType.EQUAL_EQUAL,
+    TokenType.BANG_EQUAL,
+}
+
+
+class Binding:
+    """A declared Lox variable and the Python name it is stored under."""
+
+    def __init__(self, name, python_name, function, is_global=False):
+        self.name = name
+        self.python_name = python_name
+        self.function = function
+        self.is_global = is_global
+        self.captured = False
+
+
+class FunctionInfo:
+    """Per-function analysis result: the outer bindings its body needs."""
+
+    def __init__(self, parent):
+        self.parent = parent
+        self.free = {}
+
+
+class ScopeAnalyzer(ExprVisitor, StmtVisitor):
+    """Maps every declaration and variable reference to a `Binding`.
+
+    Scoping mirrors the `Resolver`. Top-level declarations are globals; every
+    other binding gets a program-unique Python name. A binding read or written
+    from a function other than the one declaring it is marked `captured`, and
+    each function in between records it as free so the generated code can
+    pass its cell down explicitly.
+    """
+
+    def __init__(self):
+        self.scopes = []
+        self.function = None
+        self.references = {}
+        self.declarations = {}
+        self.functions = {}
+        self.globals = {}
+        self.name_counts = {}
+
+    def analyze(self, statements):
+        self.function = FunctionInfo(None)
+        self.scopes = [{}]
+        for statement in statements:
+            statement.accept(self)
+
+    def unique_name(self, name):
+        count = self.name_counts.get(name, 0)
+        self.name_counts[name] = count + 1
+        return f"v_{name}" if count == 0 else f"v_{name}_{count}"
+
+    def global_binding(self, name):
+        binding = self.globals.get(name)
+        if binding is None:
+            binding = Binding(name, f"g_{name}", None, is_global=True)
+            self.globals[name] = binding
+        return binding
+
+    def declare(self, name, key):
+        if len(self.scopes) == 1:
+            binding = self.global_binding(name)
+        else:
+            binding = Binding(name, self.unique_name(name), self.function)
+        self.scopes[-1][name] = binding
+        self.declarations[key] = binding
+        return binding
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            binding = scope.get(name)
+            if binding is not None:
+                break
+        else:
+            return self.global_binding(name)
+
+        if not binding.is_global and binding.function is not self.function:
+            binding.captured = True
+            function = self.function
+            while function is not binding.function:
+                function.free[binding] = None
+                function = function.parent
+        return binding
+
+    def function_body(self, stmt, this_key=None):
+        enclosing = self.function
+        self.function = FunctionInfo(enclosing)
+        self.functions[stmt] = self.function
+        self.scopes.append({})
+        if this_key is not None:
+            self.declare("this", this_key)
+        for param in stmt.params:
+            self.declare(param.lexeme, param)
+        for statement in stmt.body:
+            statement.accept(self)
+        self.scopes.pop()
+        self.function = enclosing
+
+    def visit_block_stmt(self, stmt):
+        self.scopes.append({})
+        for statement in stmt.statements:
+            statement.accept(self)
+        self.scopes.pop()
+
+    def visit_class_stmt(self, stmt):
+        self.declare(stmt.name.lexeme, stmt)
+        if stmt.superclass is not None:
+            stmt.superclass.accept(self)
+            self.scopes.append({})
+            self.declare("super", (stmt, "super"))
+        for method in stmt.methods:
+            self.function_body(method, (method, "this"))
+        if stmt.superclass is not None:
+            self.scopes.pop()
+
+    def visit_expression_stmt(self, stmt):
+        stmt.expression.accept(self)
+
+    def visit_function_stmt(self, stmt):
+        self.declare(stmt.name.lexeme, stmt)
+        self.function_body(stmt)
+
+    def visit_if_stmt(self, stmt):
+        stmt.condition.accept(self)
+        stmt.then_branch.accept(self)
+        if stmt.else_branch is not None:
+            stmt.else_branch.accept(self)
+
+    def visit_print_stmt(self, stmt):
+        stmt.expression.accept(self)
+
+    def visit_return_stmt(self, stmt):
+        if stmt.value is not None:
+            stmt.value.accept(self)
+
+    def visit_var_stmt(self, stmt):
+        if stmt.initializer is not None:
+            stmt.initializer.accept(self)
+        self.declare(stmt.name.lexeme, stmt)
+
+    def visit_while_stmt(self, stmt):
+        stmt.condition.accept(self)
+        stmt.body.accept(self)
+
+    def visit_assign_expr(self, expr):
+        expr.value.accept(self)
+        self.references[expr] = self.lookup(expr.name.lexeme)
+
+    def visit_binary_expr(self, expr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_call_expr(self, expr):
+        expr.callee.accept(self)
+        for argument in expr.arguments:
+            argument.accept(self)
+
+    def visit_get_expr(self, expr):
+        expr.object.accept(self)
+
+    def visit_grouping_expr(self, expr):
+        expr.expression.accept(self)
+
+    def visit_literal_expr(self, expr):
+        pass
+
+    def visit_logical_expr(self, expr):
+        expr.left.accept(self)
+        expr.right.accept(self)
+
+    def visit_set_expr(self, expr):
+        expr.object.accept(self)
+        expr.value.accept(self)
+
+    def visit_super_expr(self, expr):
+        self.references[expr] = (self.lookup("super"), self.lookup("this"))
+
+    def visit_this_expr(self, expr):
+        self.references[expr] = self.lookup("this")
+
+    def visit_unary_expr(self, expr):
+        expr.right.accept(self)
+
+    def visit_variable_expr(self, expr):
+        self.references[expr] = self.lookup(expr.name.lexeme)
+
+
+class Transpiler(ExprVisitor, StmtVisitor):
+    """Generates Python source for a resolved Lox program.
+
+    Lox functions become Python functions and Lox locals become Python
+    locals; captured locals are boxed in a `Cell` handed to inner functions
+    through keyword-only defaults, which gives every execution of a
+    declaration its own variable just like a fresh `Environment` would.
+    Runtime type checks use walrus temporaries so operands are evaluated
+    once, in order, before the check.
+
+    Left-associative chains such as `a + b + c` are evaluated step by step
+    into one temporary rather than nested, and deeply nested expressions and
+    loops are moved into helper functions, so no program nests the generated
+    code deeper than CPython can compile.
+    """
+
+    def __init__(self, repl_mode=False, token_table="_T"):
+        self.repl_mode = repl_mode
+        self.token_table = token_table
+        self.tokens = []
+        self.token_indexes = {}
+        self.lines = []
+        self.line_map = []
+        self.indent = 0
+        self.temp_count = 0
+        self.current_line = 0
+        self.function = None
+        self.analysis = ScopeAnalyzer()
+        self.expression_depth = 0
+        self.loop_depth = 0
+        self.statement_helpers = 0
+        # The Python functions a helper may be nested in, innermost last:
+        # how the helper declares their locals, and the locals it may assign.
+        self.python_scopes = [("global", set())]
+
+    def transpile(self, statements):
+        """Returns the Python source; `tokens` and `line_map` are filled in."""
+        self.analysis.analyze(statements)
+        for statement in statements:
+            statement.accept(self)
+        return "\n".join(self.lines) + "\n"
+
+    # Emission helpers.
+
+    def emit(self, text):
+        self.lines.append("    " * self.indent + text)
+        self.line_map.append(self.current_line)
+
+    def emit_body(self, statements):
+        start = len(self.lines)
+        for statement in statements:
+            statement.accept(self)
+        if len(self.lines) == start:
+            self.emit("pass")
+
+    def token(self, token):
+        """Returns a source reference to `token` in the program's token table."""
+        self.current_line = token.line
+        index = self.token_indexes.get(id(token))
+        if index is None:
+            index = len(self.tokens)
+            self.tokens.append(token)
+            self.token_indexes[id(token)] = index
+        return f"{self.token_table}[{index}]"
+
+    def temp(self):
+        self.temp_count += 1
+        return f"_t{self.temp_count}"
+
+    def expression(self, expr):
+        """Returns the code of `expr`, calling a helper function for it when
+        it is nested too deeply to be compiled inline."""
+        if self.expression_depth < MAX_EXPRESSION_DEPTH:
+            self.expression_depth += 1
+            try:
+                return expr.accept(self)
+            finally:
+                self.expression_depth -= 1
+
+        depth = self.expression_depth
+        self.expression_depth = 0
+        code = self.expression(expr)
+        self.expression_depth = depth
+        # Helpers of nested expressions are emitted before this one, so
+        # every helper is defined right before the statement using it.
+        helper = self.begin_helper()
+        self.emit(f"return {code}")
+        self.end_helper()
+        return f"{helper}()"
+
+    def begin_helper(self):
+        """Emits the header of a helper function; returns its name.
+
+        The helper may assign the locals of the functions it is nested in,
+        so it declares them all `nonlocal`, or `global` at the top level.
+        """
+        self.temp_count += 1
+        helper = f"_h{self.temp_count}"
+        self.emit(f"def {helper}():")
+        self.indent += 1
+        for keyword, names in self.python_scopes:
+            if names:
+                self.emit(f"{keyword} {', '.join(sorted(names))}")
+        self.python_scopes.append(("nonlocal", set()))
+        return helper
+
+    def end_helper(self):
+        self.python_scopes.pop()
+        self.indent -= 1
+
+    def hoist(self, stmt):
+        """Emits `stmt` in a helper function and a call to it.
+
+        A `return` in the helper returns its value in a 1-tuple, which the
+        caller returns in turn, so the Lox function still returns it.
+        """
+        loop_depth = self.loop_depth
+        self.loop_depth = 0
+        self.statement_helpers += 1
+        helper = self.begin_helper()
+        self.emit_body([stmt])
+        self.end_helper()
+        self.statement_helpers -= 1
+        self.loop_depth = loop_depth
+        if self.function is None:
+            self.emit(f"{helper}()")
+            return
+        result = self.temp()
+        self.emit(f"if ({result} := {helper}()) is not None:")
+        self.indent += 1
+        self.emit(f"return {result}" if self.statement_helpers else f"return {result}[0]")
+        self.indent -= 1
+
+    def bind(self, binding):
+        """Records that a local is assigned in the current Python function."""
+        if not binding.is_global and not binding.captured:
+            self.python_scopes[-1][1].add(binding.python_name)
+
+    def read(self, binding):
+        if binding.captured:
+            return f"{binding.python_name}.value"
+        return binding.python_name
+
+    def define(self, binding, value):
+        """Emits the statement that creates a binding with its initial value."""
+        self.bind(binding)
+        if binding.captured:
+            self.emit(f"{binding.python_name} = _Cell({value})")
+        else:
+            self.emit(f"{binding.python_name} = {value}")
+
+    def store(self, binding, value):
+        """Emits a statement overwriting an existing binding."""
+        if binding.captured:
+            self.emit(f"{binding.python_name}.value = {value}")
+        else:
+            self.emit(f"{binding.python_name} = {value}")
+
+    def truthy(self, expr):
+        """Returns a Python condition testing the Lox truthiness of `expr`."""
+        code = self.expression(expr)
+        if (
+            isinstance(expr, Binary) and expr.operator.type in BOOLEAN_OPERATORS
+        ) or (isinstance(expr, Unary) and expr.operator.type == TokenType.BANG):
+            return code
+        if isinstance(expr, Literal):
+            return "True" if expr.value is not None and expr.value is not False else "False"
+        value = self.temp()
+        return f"(({value} := {code}) is not None and {value} is not False)"
+
+    def emit_function(self, stmt, python_name, this_binding=None, initializer=False):
+        info = self.analysis.functions[stmt]
+        params = [self.analysis.declarations[param] for param in stmt.params]
+        if this_binding is not None:
+            params.insert(0, this_binding)
+
+        signature = [param.python_name for param in params]
+        # The token table is a default too, so it lives as long as the
+        # functions that may report errors with it (see `execute`).
+        signature.append("*")
+        signature.append(f"{self.token_table}={self.token_table}")
+        signature.extend(f"{free.python_name}={free.python_name}" for free in info.free)
+
+        self.current_line = stmt.name.line
+        self.emit(f"@_lox_function({stmt.name.lexeme!r})")
+        self.emit(f"def {python_name}({', '.join(signature)}):")
+        self.indent += 1
+        for param in params:
+            if param.captured:
+                self.emit(f"{param.python_name} = _Cell({param.python_name})")
+
+        enclosing = self.function, self.python_scopes, self.loop_depth, self.statement_helpers
+        self.function = (this_binding if initializer else None,)
+        self.python_scopes = [("nonlocal", set())]
+        self.loop_depth = self.statement_helpers = 0
+        for param in params:
+            self.bind(param)
+        self.emit_body(stmt.body)
+        if initializer:
+            self.emit(f"return {self.read(this_binding)}")
+        self.function, self.python_scopes, self.loop_depth, self.statement_helpers = enclosing
+        self.indent -= 1
+
+    # Statements.
+
+    def visit_block_stmt(self, stmt):
+        for statement in stmt.statements:
+            statement.accept(self)
+
+    def visit_class_stmt(self, stmt):
+        binding = self.analysis.declarations[stmt]
+        superclass = "None"
+        if stmt.superclass is not None:
+            superclass = self.temp()
+            self.emit(
+                f"{superclass} = _check_superclass({self.expression(stmt.superclass)}, "
+                f"{self.token(stmt.superclass.name)})"
+            )
+
+        self.current_line = stmt.name.line
+        self.define(binding, "None")
+        if stmt.superclass is not None:
+            self.define(self.analysis.declarations[(stmt, "super")], superclass)
+
+        methods = []
+        for method in stmt.methods:
+            python_name = self.temp()
+            self.emit_function(
+                method,
+                python_name,
+                self.analysis.declarations[(method, "this")],
+                method.name.lexeme == "init",
+            )
+            methods.append(f"{method.name.lexeme!r}: {python_name}")
+
+        self.current_line = stmt.name.line
+        self.store(
+            binding,
+            f"_make_class({stmt.name.lexeme!r}, {superclass}, {{{', '.join(methods)}}})",
+        )
+
+    def visit_expression_stmt(self, stmt):
+        code = self.expression(stmt.expression)
+        if self.repl_mode:
+            self.emit(f"_print({code})")
+        else:
+            self.emit(code)
+
+    def visit_function_stmt(self, stmt):
+        binding = self.analysis.declarations[stmt]
+        if not binding.captured:
+            self.bind(binding)
+            self.emit_function(stmt, binding.python_name)
+            return
+
+        # The cell must exist before the function is defined so a recursive
+        # function can receive its own cell.
+        self.define(binding, "None")
+        python_name = self.temp()
+        self.emit_function(stmt, python_name)
+        self.store(binding, python_name)
+
+    def visit_if_stmt(self, stmt):
+        self.emit(f"if {self.truthy(stmt.condition)}:")
+        self.indent += 1
+        self.emit_body([stmt.then_branch])
+        self.indent -= 1
+        if stmt.else_branch is not None:
+            self.emit("else:")
+            self.indent += 1
+            self.emit_body([stmt.else_branch])
+            self.indent -= 1
+
+    def visit_print_stmt(self, stmt):
+        self.emit(f"_print({self.expression(stmt.expression)})")
+
+    def visit_return_stmt(self, stmt):
+        this_binding = self.function[0] if self.function is not None else None
+        if this_binding is not None:
+            value = self.read(this_binding)
+        elif stmt.value is None:
+            value = "None"
+        else:
+            value = self.expression(stmt.value)
+        self.emit(f"return ({value},)" if self.statement_helpers else f"return {value}")
+
+    def visit_var_stmt(self, stmt):
+        value = "None"
+        if stmt.initializer is not None:
+            value = self.expression(stmt.initializer)
+        self.current_line = stmt.name.line
+        self.define(self.analysis.declarations[stmt], value)
+
+    def visit_while_stmt(self, stmt):
+        if self.loop_depth >= MAX_LOOP_DEPTH:
+            self.hoist(stmt)
+            return
+        self.emit(f"while {self.truthy(stmt.condition)}:")
+        self.indent += 1
+        self.loop_depth += 1
+        self.emit_body([stmt.body])
+        self.loop_depth -= 1
+        self.indent -= 1
+
+    # Expressions.
+
+    def visit_assign_expr(self, expr):
+        binding = self.analysis.references[expr]
+        value = self.expression(expr.value)
+        if binding.is_global:
+            return f"_set_global({binding.python_name!r}, {value}, {self.token(expr.name)})"
+        if binding.captured:
+            return f"_set_cell({binding.python_name}, {value})"
+        return f"({binding.python_name} := {value})"
+
+    def chain(self, expr):
+        """Returns the code of a left-associative chain of binary and logical
+        operators, such as `a + b - c`, as a sequence of steps updating one
+        temporary instead of nested expressions."""
+        operations = []
+        while isinstance(expr, (Binary, Logical)):
+            operations.append(expr)
+            expr = expr.left
+            while isinstance(expr, Grouping):
+                expr = expr.expression
+        value = self.temp()
+        steps = [f"{value} := {self.expression(expr)}"]
+        for operation in reversed(operations):
+            right = self.expression(operation.right)
+            if isinstance(operation, Binary):
+                steps.append(f"{value} := {self.binary(operation, value, right, value)}")
+            else:
+                steps.append(f"{value} := {self.logical(operation, value, right, value)}")
+        return f"({', '.join(steps)})[-1]"
+
+    def is_chain(self, expr):
+        while isinstance(expr, Grouping):
+            expr = expr.expression
+        return isinstance(expr, (Binary, Logical))
+
+    def visit_binary_expr(self, expr):
+        if self.is_chain(expr.left):
+            return self.chain(expr)
+        return self.binary(expr, self.expression(expr.left), self.expression(expr.right))
+
+    def binary(self, expr, left, right, a=None):
+        """Returns the code of a binary operator; `a` names a temporary
+        already holding the left operand."""
+        kind = expr.operator.type
+        if kind == TokenType.EQUAL_EQUAL:
+            return f"({left} == {right})"
+        if kind == TokenType.BANG_EQUAL:
+            return f"({left} != {right})"
+
+        token = self.token(expr.operator)
+        b = self.temp()
+        if a is None:
+            a = self.temp()
+            operands = f"({a} := {left}, {b} := {right})"
+        else:
+            operands = f"({b} := {right},)"
+        if kind == TokenType.PLUS:
+            return (
+                f"({a} + {b} if {operands} and (({a}.__class__ is _float and "
+                f"{b}.__class__ is _float) or ({a}.__class__ is _str and "
+                f"{b}.__class__ is _str)) else _add_error({token}))"
+            )
+
+        operator = ARITHMETIC_OPERATORS[kind]
+        return (
+            f"({a} {operator} {b} if {operands} and {a}.__class__ is _float and "
+            f"{b}.__class__ is _float else _operands_error({token}))"
+        )
+
+    def visit_call_expr(self, expr):
+        callee = expr.callee
+        paren = self.token(expr.paren)
+
+        if isinstance(callee, Get):
+            receiver = self.expression(callee.object)
+            arguments = [self.expression(argument) for argument in expr.arguments]
+            parts = [receiver, repr(callee.name.lexeme), self.token(callee.name), paren]
+            return f"_invoke({', '.join(parts + arguments)})"
+
+        if isinstance(callee, Super):
+            super_binding, this_binding = self.analysis.references[callee]
+            arguments = [self.expression(argument) for argument in expr.arguments]
+            parts = [
+                self.read(super_binding),
+                self.read(this_binding),
+                repr(callee.method.lexeme),
+                self.token(callee.method),
+                paren,
+            ]
+            return f"_super_invoke({', '.join(parts + arguments)})"
+
+        function = self.temp()
+        temps = [self.temp() for _ in expr.arguments]
+        bindings = [f"{function} := {self.expression(callee)}"]
+        bindings.extend(
+            f"{temp} := {self.expression(argument)}"
+            for temp, argument in zip(temps, expr.arguments)
+        )
+        arguments = ", ".join(temps)
+        fallback = ", ".join([function, paren] + temps)
+        return (
+            f"({function}({arguments}) if ({', '.join(bindings)},) and "
+            f"{function}.__class__ is _Function and "
+            f"{function}.__code__.co_argcount == {len(temps)} else _call({fallback}))"
+        )
+
+    def visit_get_expr(self, expr):
+        value = self.temp()
+        name = repr(expr.name.lexeme)
+        return (
+            f"({value}.fields[{name}] if ({value} := {self.expression(expr.object)})"
+            f".__class__ is _Instance and {name} in {value}.fields "
+            f"else _get({value}, {name}, {self.token(expr.name)}))"
+        )
+
+    def visit_grouping_expr(self, expr):
+        return self.expression(expr.expression)
+
+    def visit_literal_expr(self, expr):
+        value = expr.value
+        if isinstance(value, float) and not math.isfinite(value):
+            return f"_float({str(value)!r})"
+        return repr(value)
+
+    def visit_logical_expr(self, expr):
+        if self.is_chain(expr.left):
+            return self.chain(expr)
+        return self.logical(expr, self.expression(expr.left), self.expression(expr.right))
+
+    def logical(self, expr, left, right, value=None):
+        """Returns the code of `and` or `or`; `value` names a temporary
+        already holding the left operand."""
+        if value is None:
+            value = self.temp()
+            test = f"(({value} := {left}) is not None and {value} is not False)"
+        else:
+            test = f"({value} is not None and {value} is not False)"
+        if expr.operator.type == TokenType.OR:
+            return f"({value} if {test} else {right})"
+        return f"({right} if {test} else {value})"
+
+    def visit_set_expr(self, expr):
+        receiver = f"_check_fields({self.expression(expr.object)}, {self.token(expr.name)})"
+        return f"_set({receiver}, {expr.name.lexeme!r}, {self.expression(expr.value)})"
+
+    def visit_super_expr(self, expr):
+        super_binding, this_binding = self.analysis.references[expr]
+        return (
+            f"_super_bind({self.read(super_binding)}, {self.read(this_binding)}, "
+            f"{expr.method.lexeme!r}, {self.token(expr.method)})"
+        )
+
+    def visit_this_expr(self, expr):
+        self.current_line = expr.keyword.line
+        return self.read(self.analysis.references[expr])
+
+    def visit_unary_expr(self, expr):
+        right = self.expression(expr.right)
+        value = self.temp()
+        if expr.operator.type == TokenType.MINUS:
+            return (
+                f"(-{value} if ({value} := {right}).__class__ is _float "
+                f"else _operand_error({self.token(expr.operator)}))"
+            )
+        return f"(({value} := {right}) is None or {value} is False)"
+
+    def visit_variable_expr(self, expr):
+        self.current_line = expr.name.line
+        return self.read(self.analysis.references[expr])
+
+
+class CompiledProgram:
+    """Generated code for one Lox program plus what is needed to run it."""
+
+    def __init__(self, code, source, tokens, token_table, line_map):
+        self.code = code
+        self.source = source
+        self.tokens = tokens
+        self.token_table = token_table
+        self.line_map = line_map
+
+    def __reduce__(self):
+        # Code objects don't pickle; marshal is their format in .pyc files.
+        return (
+            unmarshal_program,
+            (marshal.dumps(self.code), self.source, self.tokens, self.token_table, self.line_map),
+        )
+
+
+def unmarshal_program(code, source, tokens, token_table, line_map):
+    return CompiledProgram(marshal.loads(code), source, tokens, token_table, line_map)
+
+
+class PythonInterpreter:
+    """Engine that transpiles Lox to Python and lets CPython execute it.
+
+    Lox globals persist in `namespace` between programs. A compiled program
+    pickles, so `run_file` keeps it in a `.loxc` file of its own (see
+    `loxc_variant`) and later runs of the script skip code generation too.
+    """
+
+    # Suffix of the `.loxc` files holding this engine's compiled programs.
+    loxc_variant = ".python"
+
+    def __init__(self, errors=None):
+        self.namespace = make_namespace(self)
+        # Gets this interpreter's errors; by default they are printed.
+        self.errors = ErrorReporter(print_diagnostic) if errors is None else errors
+
+    def compile(self, statements, repl_mode=False):
+        # Every program names its token table `_T`: functions bind theirs
+        # when they are defined, so only the running program's is a global.
+        transpiler = Transpiler(repl_mode)
+        try:
+            source = transpiler.transpile(statements)
+            code = compile(source, GENERATED_FILENAME, "exec")
+        except (SyntaxError, RecursionError) as failure:
+            # The generator keeps within CPython's limits, but a program can
+            # still be too deep for its recursion limit.
+            line = transpiler.current_line
+            if isinstance(failure, SyntaxError) and failure.lineno:
+                line = transpiler.line_map[failure.lineno - 1]
+            self.errors.error(line, "Program is nested too deeply for the python engine.")
+            return None
+        return CompiledProgram(
+            code, source, transpiler.tokens, transpiler.token_table, transpiler.line_map
+        )
+
+    def interpret(self, statements, repl_mode=False):
+        program = self.compile(statements, repl_mode)
+        if program is not None:
+            self.execute(program)
+
+    def execute(self, program):
+        # Top-level code reads the token table as a global while it runs;
+        # dropping it afterwards leaves a long-lived namespace holding only
+        # the tables of functions that are still defined.
+        self.namespace[program.token_table] = program.tokens
+        try:
+            exec(program.code, self.namespace)
+        except RuntimeError as error:
+            self.errors.report_runtime_error(error)
+        except NameError as error:
+            self.errors.report_runtime_error(self.undefined_variable(program, error))
+        except RecursionError:
+            self.errors.report_runtime_error(RuntimeError(None, "Stack overflow."))
+        finally:
+            del self.namespace[program.token_table]
+
+    def undefined_variable(self, program, error):
+        """Translates a NameError for a missing `g_` global into a Lox error."""
+        name = error.name[2:] if error.name and error.name.startswith("g_") else error.name
+        line = 0
+        for frame in reversed(traceback.extract_tb(error.__traceback__)):
+            if frame.filename == GENERATED_FILENAME:
+                line = program.line_map[frame.lineno - 1]
+                break
+        token = Token(TokenType.IDENTIFIER, name, None, line)
+        return RuntimeError(token, f"Undefined variable '{name}'.")
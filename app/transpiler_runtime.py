@@ -0,0 +1,245 @@
+"""Runtime support for Python code generated by `app.transpiler`.
+
+Lox functions become plain Python functions, so most values need no wrapper.
+Classes, instances and the operations Python cannot express with Lox's
+semantics (property access, calls that need arity checks, runtime type
+errors) are implemented here and exposed to generated code through the
+namespace built by `make_namespace`.
+"""
+from types import FunctionType, MethodType
+from .error_handler import RuntimeError
+from .lox_callable import LoxCallable
+from .native_functions import NativeClock
+
+
+class Cell:
+    """Box for a local variable captured by an inner function."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+
+class LoxPyClass:
+    def __init__(self, name, superclass, methods):
+        self.name = name
+        self.superclass = superclass
+        # Inherited methods are copied down so lookups never walk the chain.
+        self.methods = dict(superclass.methods) if superclass is not None else {}
+        self.methods.update(methods)
+
+    def __str__(self):
+        return self.name
+
+
+class LoxPyInstance:
+    __slots__ = ("klass", "fields")
+
+    def __init__(self, klass):
+        self.klass = klass
+        self.fields = {}
+
+    def __str__(self):
+        return f"{self.klass.name} instance"
+
+
+def lox_function(name):
+    """Decorator giving a generated function its Lox name for printing."""
+
+    def rename(function):
+        function.__name__ = name
+        return function
+
+    return rename
+
+
+def stringify(value):
+    if value is None:
+        return "nil"
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, float):
+        text = str(value)
+        if text.endswith(".0"):
+            text = text[:-2]
+        return text
+    if type(value) is FunctionType:
+        return f"<fn {value.__name__}>"
+    if type(value) is MethodType:
+        return f"<fn {value.__func__.__name__}>"
+    return str(value)
+
+
+def print_value(value):
+    print(stringify(value))
+
+
+def arity_error(token, expected, got):
+    return RuntimeError(token, f"Expected {expected} arguments but got {got}.")
+
+
+def make_call(interpreter):
+    """Builds the generic call helper; natives receive `interpreter`."""
+
+    def call(callee, token, *arguments):
+        kind = type(callee)
+        if kind is FunctionType:
+            if callee.__code__.co_argcount != len(arguments):
+                raise arity_error(token, callee.__code__.co_argcount, len(arguments))
+            return callee(*arguments)
+
+        if kind is MethodType:
+            arity = callee.__func__.__code__.co_argcount - 1
+            if arity != len(arguments):
+                raise arity_error(token, arity, len(arguments))
+            return callee(*arguments)
+
+        if kind is LoxPyClass:
+            instance = LoxPyInstance(callee)
+            initializer = callee.methods.get("init")
+            arity = 0 if initializer is None else initializer.__code__.co_argcount - 1
+            if arity != len(arguments):
+                raise arity_error(token, arity, len(arguments))
+            if initializer is not None:
+                initializer(instance, *arguments)
+            return instance
+
+        if isinstance(callee, LoxCallable):
+            if callee.arity() != len(arguments):
+                raise arity_error(token, callee.arity(), len(arguments))
+            return callee.call(interpreter, list(arguments))
+
+        raise RuntimeError(token, "Can only call functions and classes.")
+
+    return call
+
+
+def get_property(obj, name, token):
+    if type(obj) is not LoxPyInstance:
+        raise RuntimeError(token, "Only instances have properties.")
+    fields = obj.fields
+    if name in fields:
+        return fields[name]
+    method = obj.klass.methods.get(name)
+    if method is None:
+        raise RuntimeError(token, f"Undefined property '{name}'")
+    return MethodType(method, obj)
+
+
+def check_fields(obj, token):
+    """Returns `obj` if it can hold fields; evaluated before the assigned value."""
+    if type(obj) is not LoxPyInstance:
+        raise RuntimeError(token, "Only instances have fields.")
+    return obj
+
+
+def set_property(obj, name, value):
+    obj.fields[name] = value
+    return value
+
+
+def make_invoke(call):
+    def invoke(obj, name, name_token, paren, *arguments):
+        """Calls `obj.name(*arguments)` without allocating a bound method."""
+        if type(obj) is not LoxPyInstance:
+            raise RuntimeError(name_token, "Only instances have properties.")
+        fields = obj.fields
+        if name in fields:
+            return call(fields[name], paren, *arguments)
+        method = obj.klass.methods.get(name)
+        if method is None:
+            raise RuntimeError(name_token, f"Undefined property '{name}'")
+        arity = method.__code__.co_argcount - 1
+        if arity != len(arguments):
+            raise arity_error(paren, arity, len(arguments))
+        return method(obj, *arguments)
+
+    return invoke
+
+
+def super_method(superclass, name, token):
+    method = superclass.methods.get(name)
+    if method is None:
+        raise RuntimeError(token, f"Undefined property '{name}'.")
+    return method
+
+
+def super_bind(superclass, this, name, token):
+    return MethodType(super_method(superclass, name, token), this)
+
+
+def super_invoke(superclass, this, name, name_token, paren, *arguments):
+    method = super_method(superclass, name, name_token)
+    arity = method.__code__.co_argcount - 1
+    if arity != len(arguments):
+        raise arity_error(paren, arity, len(arguments))
+    return method(this, *arguments)
+
+
+def check_superclass(value, token):
+    if type(value) is not LoxPyClass:
+        raise RuntimeError(token, "Superclass must be a class.")
+    return value
+
+
+def set_cell(cell, value):
+    cell.value = value
+    return value
+
+
+def number_operand_error(token):
+    raise RuntimeError(token, "Operand must be a number.")
+
+
+def number_operands_error(token):
+    raise RuntimeError(token, "Operands must be numbers.")
+
+
+def add_operands_error(token):
+    raise RuntimeError(token, "Operands must be two numbers or two strings.")
+
+
+def make_namespace(interpreter):
+    """Creates the module namespace generated programs run in.
+
+    Lox globals live in the same dictionary under a `g_` prefix, so they
+    persist across programs run by the same interpreter.
+    """
+    namespace = {}
+
+    def set_global(name, value, token):
+        if name not in namespace:
+            raise RuntimeError(token, f"Undefined variable '{token.lexeme}'.")
+        namespace[name] = value
+        return value
+
+    call = make_call(interpreter)
+    namespace.update(
+        {
+            "__name__": "__lox__",
+            "_Cell": Cell,
+            "_Function": FunctionType,
+            "_Instance": LoxPyInstance,
+            "_float": float,
+            "_str": str,
+            "_lox_function": lox_function,
+            "_print": print_value,
+            "_call": call,
+            "_invoke": make_invoke(call),
+            "_get": get_property,
+            "_check_fields": check_fields,
+            "_set": set_property,
+            "_super_bind": super_bind,
+            "_super_invoke": super_invoke,
+            "_check_superclass": check_superclass,
+            "_make_class": LoxPyClass,
+            "_set_cell": set_cell,
+            "_set_global": set_global,
+            "_operand_error": number_operand_error,
+            "_operands_error": number_operands_error,
+            "_add_error": add_operands_error,
+            "g_clock": NativeClock(),
+        }
+    )
+    return namespace
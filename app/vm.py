@@ -0,0 +1,495 @@
+from .bytecode import OpCode
+from .compiler import Compiler
+from .error_handler import ErrorReporter, print_diagnostic, RuntimeError
+from .lox_callable import LoxCallable
+from .native_functions import NativeClock
+
+# Default maximum Lox call depth; calls beyond it are a "Stack overflow.".
+FRAMES_MAX = 4096
+
+# Opcodes as plain ints so the dispatch loop compares cheaply.
+OP_CONSTANT = int(OpCode.CONSTANT)
+OP_NIL = int(OpCode.NIL)
+OP_TRUE = int(OpCode.TRUE)
+OP_FALSE = int(OpCode.FALSE)
+OP_POP = int(OpCode.POP)
+OP_POPN = int(OpCode.POPN)
+OP_GET_LOCAL = int(OpCode.GET_LOCAL)
+OP_SET_LOCAL = int(OpCode.SET_LOCAL)
+OP_GET_GLOBAL = int(OpCode.GET_GLOBAL)
+OP_DEFINE_GLOBAL = int(OpCode.DEFINE_GLOBAL)
+OP_SET_GLOBAL = int(OpCode.SET_GLOBAL)
+OP_GET_UPVALUE = int(OpCode.GET_UPVALUE)
+OP_SET_UPVALUE = int(OpCode.SET_UPVALUE)
+OP_GET_PROPERTY = int(OpCode.GET_PROPERTY)
+OP_SET_PROPERTY = int(OpCode.SET_PROPERTY)
+OP_GET_SUPER = int(OpCode.GET_SUPER)
+OP_EQUAL = int(OpCode.EQUAL)
+OP_NOT_EQUAL = int(OpCode.NOT_EQUAL)
+OP_GREATER = int(OpCode.GREATER)
+OP_GREATER_EQUAL = int(OpCode.GREATER_EQUAL)
+OP_LESS = int(OpCode.LESS)
+OP_LESS_EQUAL = int(OpCode.LESS_EQUAL)
+OP_ADD = int(OpCode.ADD)
+OP_SUBTRACT = int(OpCode.SUBTRACT)
+OP_MULTIPLY = int(OpCode.MULTIPLY)
+OP_DIVIDE = int(OpCode.DIVIDE)
+OP_NOT = int(OpCode.NOT)
+OP_NEGATE = int(OpCode.NEGATE)
+OP_PRINT = int(OpCode.PRINT)
+OP_PRINT_EXPR = int(OpCode.PRINT_EXPR)
+OP_JUMP = int(OpCode.JUMP)
+OP_JUMP_IF_FALSE = int(OpCode.JUMP_IF_FALSE)
+OP_JUMP_IF_TRUE = int(OpCode.JUMP_IF_TRUE)
+OP_POP_JUMP_IF_FALSE = int(OpCode.POP_JUMP_IF_FALSE)
+OP_CALL = int(OpCode.CALL)
+OP_INVOKE = int(OpCode.INVOKE)
+OP_SUPER_INVOKE = int(OpCode.SUPER_INVOKE)
+OP_CLOSURE = int(OpCode.CLOSURE)
+OP_CLOSE_UPVALUE = int(OpCode.CLOSE_UPVALUE)
+OP_RETURN = int(OpCode.RETURN)
+OP_CLASS = int(OpCode.CLASS)
+OP_INHERIT = int(OpCode.INHERIT)
+OP_METHOD = int(OpCode.METHOD)
+
+
+class Closure:
+    def __init__(self, function, upvalues=None):
+        self.function = function
+        self.upvalues = upvalues or []
+
+    def __str__(self):
+        return str(self.function)
+
+
+class Upvalue:
+    """A captured variable: a stack slot while open, its own value once closed."""
+
+    __slots__ = ("location", "value", "closed")
+
+    def __init__(self, location):
+        self.location = location
+        self.value = None
+        self.closed = False
+
+
+class VMClass:
+    def __init__(self, name):
+        self.name = name
+        self.methods = {}
+
+    def __str__(self):
+        return self.name
+
+
+class VMInstance:
+    def __init__(self, klass):
+        self.klass = klass
+        self.fields = {}
+
+    def __str__(self):
+        return f"{self.klass.name} instance"
+
+
+class BoundMethod:
+    def __init__(self, receiver, method):
+        self.receiver = receiver
+        self.method = method
+
+    def __str__(self):
+        return str(self.method)
+
+
+class VM:
+    """Stack-based virtual machine executing bytecode produced by `Compiler`.
+
+    It exposes the same `interpret(statements, repl_mode)` entry point as the
+    tree-walking `Interpreter`, so `app.lox` can switch between the two.
+    Lox calls push frames on `frames` rather than the Python stack, so the
+    recursion depth is bounded only by `stack_size`.
+    """
+
+    def __init__(self, stack_size=FRAMES_MAX, errors=None):
+        self.stack_size = stack_size
+        # Gets this VM's errors; by default they are printed.
+        self.errors = ErrorReporter(print_diagnostic) if errors is None else errors
+        self.globals = {"clock": NativeClock()}
+        self.stack = []
+        self.frames = []
+        self.open_upvalues = {}
+
+    def interpret(self, statements, repl_mode=False):
+        function = Compiler(repl_mode).compile(statements)
+        closure = Closure(function)
+        self.stack.append(closure)
+        try:
+            self.run(closure)
+        except RuntimeError as error:
+            self.errors.report_runtime_error(error)
+        finally:
+            # A runtime error leaves frames unwound without closing their
+            # upvalues; closures that escaped must keep their values.
+            self.close_upvalues(0)
+            self.stack.clear()
+            self.frames.clear()
+
+    def run(self, closure):
+        stack = self.stack
+        frames = self.frames
+        globals = self.globals
+        open_upvalues = self.open_upvalues
+        frames_max = self.stack_size
+        push = stack.append
+        pop = stack.pop
+        _float = float
+        _str = str
+
+        chunk = closure.function.chunk
+        code = chunk.code
+        constants = chunk.constants
+        tokens = chunk.tokens
+        upvalues = closure.upvalues
+        ip = 0
+        base = 0
+
+        while True:
+            op = code[ip]
+            ip += 1
+
+            if op == OP_GET_LOCAL:
+                push(stack[base + code[ip]])
+                ip += 1
+            elif op == OP_CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op == OP_GET_GLOBAL:
+                name = constants[code[ip]]
+                if name not in globals:
+                    raise RuntimeError(tokens[ip], f"Undefined variable '{name}'.")
+                push(globals[name])
+                ip += 1
+            elif op == OP_POP:
+                pop()
+            elif op == OP_POP_JUMP_IF_FALSE:
+                value = pop()
+                if value is None or value is False:
+                    ip = code[ip]
+                else:
+                    ip += 1
+            elif op == OP_JUMP:
+                ip = code[ip]
+            elif op == OP_SET_LOCAL:
+                stack[base + code[ip]] = stack[-1]
+                ip += 1
+            elif op == OP_ADD:
+                right = pop()
+                left = stack[-1]
+                if type(left) is _float and type(right) is _float:
+                    stack[-1] = left + right
+                elif type(left) is _str and type(right) is _str:
+                    stack[-1] = left + right
+                else:
+                    raise RuntimeError(
+                        tokens[ip - 1], "Operands must be two numbers or two strings."
+                    )
+            elif op == OP_SUBTRACT:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left - right
+            elif op == OP_LESS:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left < right
+            elif op == OP_LESS_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left <= right
+            elif op == OP_GREATER:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left > right
+            elif op == OP_GREATER_EQUAL:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left >= right
+            elif op == OP_MULTIPLY:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left * right
+            elif op == OP_DIVIDE:
+                right = pop()
+                left = stack[-1]
+                if type(left) is not _float or type(right) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operands must be numbers.")
+                stack[-1] = left / right
+            elif op == OP_EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] == right
+            elif op == OP_NOT_EQUAL:
+                right = pop()
+                stack[-1] = stack[-1] != right
+            elif op == OP_GET_UPVALUE:
+                upvalue = upvalues[code[ip]]
+                push(upvalue.value if upvalue.closed else stack[upvalue.location])
+                ip += 1
+            elif op == OP_SET_UPVALUE:
+                upvalue = upvalues[code[ip]]
+                if upvalue.closed:
+                    upvalue.value = stack[-1]
+                else:
+                    stack[upvalue.location] = stack[-1]
+                ip += 1
+            elif op == OP_GET_PROPERTY:
+                instance = stack[-1]
+                if type(instance) is not VMInstance:
+                    raise RuntimeError(tokens[ip], "Only instances have properties.")
+                name = constants[code[ip]]
+                fields = instance.fields
+                if name in fields:
+                    stack[-1] = fields[name]
+                else:
+                    method = instance.klass.methods.get(name)
+                    if method is None:
+                        raise RuntimeError(tokens[ip], f"Undefined property '{name}'")
+                    stack[-1] = BoundMethod(instance, method)
+                ip += 1
+            elif op == OP_SET_PROPERTY:
+                value = pop()
+                instance = stack[-1]
+                if type(instance) is not VMInstance:
+                    raise RuntimeError(tokens[ip], "Only instances have fields.")
+                instance.fields[constants[code[ip]]] = value
+                stack[-1] = value
+                ip += 1
+            elif op in (OP_CALL, OP_INVOKE, OP_SUPER_INVOKE):
+                token = tokens[ip - 1]
+                if op == OP_CALL:
+                    argc = code[ip]
+                    ip += 1
+                    callee = stack[-1 - argc]
+                    if type(callee) is Closure:
+                        target = callee
+                    else:
+                        target = self.call_value(callee, argc, token)
+                        if target is None:
+                            continue
+                elif op == OP_INVOKE:
+                    name = constants[code[ip]]
+                    name_token = tokens[ip]
+                    argc = code[ip + 1]
+                    ip += 2
+                    receiver = stack[-1 - argc]
+                    if type(receiver) is not VMInstance:
+                        raise RuntimeError(name_token, "Only instances have properties.")
+                    if name in receiver.fields:
+                        callee = receiver.fields[name]
+                        stack[-1 - argc] = callee
+                        if type(callee) is Closure:
+                            target = callee
+                        else:
+                            target = self.call_value(callee, argc, token)
+                            if target is None:
+                                continue
+                    else:
+                        target = receiver.klass.methods.get(name)
+                        if target is None:
+                            raise RuntimeError(name_token, f"Undefined property '{name}'")
+                else:
+                    name = constants[code[ip]]
+                    name_token = tokens[ip]
+                    argc = code[ip + 1]
+                    ip += 2
+                    superclass = pop()
+                    target = superclass.methods.get(name)
+                    if target is None:
+                        raise RuntimeError(name_token, f"Undefined property '{name}'.")
+
+                arity = target.function.arity
+                if argc != arity:
+                    raise RuntimeError(
+                        token, f"Expected {arity} arguments but got {argc}."
+                    )
+                if len(frames) == frames_max:
+                    raise RuntimeError(token, "Stack overflow.")
+
+                frames.append((closure, ip, base))
+                closure = target
+                chunk = closure.function.chunk
+                code = chunk.code
+                constants = chunk.constants
+                tokens = chunk.tokens
+                upvalues = closure.upvalues
+                ip = 0
+                base = len(stack) - argc - 1
+            elif op == OP_RETURN:
+                result = pop()
+                if open_upvalues:
+                    self.close_upvalues(base)
+                if not frames:
+                    return
+                del stack[base:]
+                push(result)
+                closure, ip, base = frames.pop()
+                chunk = closure.function.chunk
+                code = chunk.code
+                constants = chunk.constants
+                tokens = chunk.tokens
+                upvalues = closure.upvalues
+            elif op == OP_NIL:
+                push(None)
+            elif op == OP_TRUE:
+                push(True)
+            elif op == OP_FALSE:
+                push(False)
+            elif op == OP_JUMP_IF_FALSE:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip = code[ip]
+                else:
+                    ip += 1
+            elif op == OP_JUMP_IF_TRUE:
+                value = stack[-1]
+                if value is None or value is False:
+                    ip += 1
+                else:
+                    ip = code[ip]
+            elif op == OP_NOT:
+                value = stack[-1]
+                stack[-1] = value is None or value is False
+            elif op == OP_NEGATE:
+                value = stack[-1]
+                if type(value) is not _float:
+                    raise RuntimeError(tokens[ip - 1], "Operand must be a number.")
+                stack[-1] = -value
+            elif op == OP_PRINT:
+                print(self.stringify(pop()))
+            elif op == OP_PRINT_EXPR:
+                print(self.stringify(pop()))
+            elif op == OP_POPN:
+                del stack[-code[ip]:]
+                ip += 1
+            elif op == OP_SET_GLOBAL:
+                name = constants[code[ip]]
+                if name not in globals:
+                    raise RuntimeError(tokens[ip], f"Undefined variable '{name}'.")
+                globals[name] = stack[-1]
+                ip += 1
+            elif op == OP_DEFINE_GLOBAL:
+                globals[constants[code[ip]]] = pop()
+                ip += 1
+            elif op == OP_CLOSURE:
+                function = constants[code[ip]]
+                ip += 1
+                captured = []
+                for _ in range(function.upvalue_count):
+                    is_local = code[ip]
+                    index = code[ip + 1]
+                    ip += 2
+                    if is_local:
+                        captured.append(self.capture_upvalue(base + index))
+                    else:
+                        captured.append(upvalues[index])
+                push(Closure(function, captured))
+            elif op == OP_CLOSE_UPVALUE:
+                self.close_upvalues(len(stack) - 1)
+                pop()
+            elif op == OP_GET_SUPER:
+                superclass = pop()
+                name = constants[code[ip]]
+                method = superclass.methods.get(name)
+                if method is None:
+                    raise RuntimeError(tokens[ip], f"Undefined property '{name}'.")
+                stack[-1] = BoundMethod(stack[-1], method)
+                ip += 1
+            elif op == OP_CLASS:
+                push(VMClass(constants[code[ip]]))
+                ip += 1
+            elif op == OP_INHERIT:
+                subclass = pop()
+                superclass = stack[-1]
+                if type(superclass) is not VMClass:
+                    raise RuntimeError(tokens[ip - 1], "Superclass must be a class.")
+                subclass.methods.update(superclass.methods)
+            elif op == OP_METHOD:
+                method = pop()
+                stack[-1].methods[constants[code[ip]]] = method
+                ip += 1
+            else:
+                raise ValueError(f"Unknown opcode {op}.")
+
+    def call_value(self, callee, argc, token):
+        """Calls a non-closure value.
+
+        Returns the closure whose frame the VM must enter next, or None if the
+        call was completed here and its result is already on the stack.
+        """
+        stack = self.stack
+        if type(callee) is BoundMethod:
+            stack[-1 - argc] = callee.receiver
+            return callee.method
+
+        if type(callee) is VMClass:
+            stack[-1 - argc] = VMInstance(callee)
+            initializer = callee.methods.get("init")
+            if initializer is not None:
+                return initializer
+            if argc != 0:
+                raise RuntimeError(token, f"Expected 0 arguments but got {argc}.")
+            return None
+
+        if isinstance(callee, LoxCallable):
+            if argc != callee.arity():
+                raise RuntimeError(
+                    token, f"Expected {callee.arity()} arguments but got {argc}."
+                )
+            arguments = stack[len(stack) - argc :]
+            result = callee.call(self, arguments)
+            del stack[len(stack) - argc - 1 :]
+            stack.append(result)
+            return None
+
+        raise RuntimeError(token, "Can only call functions and classes.")
+
+    def capture_upvalue(self, location):
+        upvalue = self.open_upvalues.get(location)
+        if upvalue is None:
+            upvalue = Upvalue(location)
+            self.open_upvalues[location] = upvalue
+        return upvalue
+
+    def close_upvalues(self, last):
+        """Closes every open upvalue pointing at or above stack slot `last`."""
+        for location in [loc for loc in self.open_upvalues if loc >= last]:
+            upvalue = self.open_upvalues.pop(location)
+            upvalue.value = self.stack[location]
+            upvalue.closed = True
+
+    def is_truthy(self, value):
+        return value is not None and value is not False
+
+    def stringify(self, obj):
+        if obj is None:
+            return "nil"
+
+        if isinstance(obj, bool):
+            return "true" if obj else "false"
+
+        if isinstance(obj, float):
+            text = str(obj)
+            if text.endswith(".0"):
+                text = text[:-2]
+            return text
+
+        return str(obj)
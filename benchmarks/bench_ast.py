@@ -0,0 +1,82 @@
+"""Memory held by the AST of a large generated program, and its run time.
+
+Generates a program of many small classes and functions, reports how long
+scanning, parsing and resolving it takes and how much memory the resolved
+statements keep alive, then runs it on the tree-walker.
+
+Usage:
+    python -m benchmarks.bench_ast [--declarations N]
+"""
+import argparse
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.regex_scanner import RegexScanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+from app.resolver import Resolver  # noqa: E402
+from app.interpreter import Interpreter  # noqa: E402
+
+
+def generated_source(declarations):
+    return "\n".join(
+        f"""
+        class C{i} {{
+            init(n) {{ this.n = n; }}
+            get() {{ return this.n + {i}; }}
+        }}
+        fun f{i}(n) {{
+            var c = C{i}(n);
+            var total = 0;
+            for (var j = 0; j < 10; j = j + 1) total = total + c.get();
+            return total;
+        }}
+        print f{i}({i});"""
+        for i in range(declarations)
+    )
+
+
+def front_end(source, interpreter):
+    statements = Parser(RegexScanner(source).scan_tokens()).parse()
+    Resolver(interpreter).resolve(statements)
+    return statements
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--declarations", type=int, default=10000)
+    args = parser.parse_args()
+
+    source = generated_source(args.declarations)
+
+    start = time.perf_counter()
+    front_end(source, Interpreter())
+    parse = time.perf_counter() - start
+
+    interpreter = Interpreter()
+    gc.collect()
+    tracemalloc.start()
+    statements = front_end(source, interpreter)
+    gc.collect()
+    ast = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        interpreter.interpret(statements)
+    run = time.perf_counter() - start
+
+    print(f"{args.declarations:,} declarations, {len(source):,} characters")
+    print(f"{'front end':<16}{parse * 1000:>10.0f}ms")
+    print(f"{'AST memory':<16}{ast / 1e6:>10.1f}MB")
+    print(f"{'run':<16}{run * 1000:>10.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
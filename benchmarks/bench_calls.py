@@ -0,0 +1,49 @@
+"""Micro-benchmark for Lox function calls and returns.
+
+Runs the recursive `fib` from `examples/fibonacci.lox` with a larger
+argument, so the time is dominated by calls and `return` statements, and
+reports the best time and the number of calls per second.
+
+Usage:
+    python -m benchmarks.bench_calls [--n N] [--repeat N] [--engines tree,closure]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.lox import ENGINES  # noqa: E402
+from benchmarks.bench_engines import ROOT, run_once  # noqa: E402
+
+PROGRAM = os.path.join(ROOT, "examples", "fibonacci.lox")
+
+
+def call_count(n):
+    """Number of `fib` calls made when computing fib(n) recursively."""
+    a, b = 1, 1
+    for _ in range(n):
+        a, b = b, a + b + 1
+    return a
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--n", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--engines", default="tree,closure")
+    args = parser.parse_args()
+
+    with open(PROGRAM, encoding="utf-8") as file:
+        source = file.read() + f"\nprint fib({args.n});\n"
+
+    calls = call_count(args.n)
+    print(f"fib({args.n}): {calls:,} calls")
+    print(f"{'engine':<12}{'best':>12}{'calls/s':>16}")
+    for name in args.engines.split(","):
+        seconds = min(run_once(ENGINES[name], source) for _ in range(args.repeat))
+        print(f"{name:<12}{seconds * 1000:>10.2f}ms{calls / seconds:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
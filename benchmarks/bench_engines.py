@@ -0,0 +1,65 @@
+"""Compare the execution engines selectable with `app.lox --engine`.
+
+Each program is scanned, parsed and resolved once per run and then executed
+by a fresh engine instance; program output is discarded. The best of
+`--repeat` runs is reported for every engine.
+
+Usage:
+    python -m benchmarks.bench_engines [--repeat N] [program.lox ...]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scanner import Scanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+from app.resolver import Resolver  # noqa: E402
+from app.lox import ENGINES  # noqa: E402
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_PROGRAMS = [
+    os.path.join(ROOT, "examples", "fibonacci.lox"),
+    os.path.join(ROOT, "examples", "binary_tree.lox"),
+    os.path.join(ROOT, "benchmarks", "programs", "fib.lox"),
+    os.path.join(ROOT, "benchmarks", "programs", "binary_tree.lox"),
+]
+
+
+def run_once(engine_class, source):
+    engine = engine_class()
+    statements = Parser(Scanner(source).scan_tokens()).parse()
+    Resolver(engine).resolve(statements)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.interpret(statements)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("programs", nargs="*", default=DEFAULT_PROGRAMS)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--engines", default=",".join(ENGINES))
+    args = parser.parse_args()
+
+    engines = args.engines.split(",")
+    print(f"{'program':<38}" + "".join(f"{name:>12}" for name in engines) + "   speedup")
+    for path in args.programs:
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+        timings = []
+        for name in engines:
+            timings.append(min(run_once(ENGINES[name], source) for _ in range(args.repeat)))
+        row = f"{os.path.relpath(path, ROOT):<38}"
+        row += "".join(f"{seconds * 1000:>10.2f}ms" for seconds in timings)
+        row += "   " + " ".join(f"{timings[0] / seconds:.2f}x" for seconds in timings[1:])
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
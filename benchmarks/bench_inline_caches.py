@@ -0,0 +1,56 @@
+"""Inline cache hit rates for property access in the environment-based engines.
+
+Runs each program once per engine and reports the execution time together
+with the hit and miss counters of the property inline caches.
+
+Usage:
+    python -m benchmarks.bench_inline_caches [--engines tree,closure] [program.lox ...]
+"""
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scanner import Scanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+from app.resolver import Resolver  # noqa: E402
+from app.lox import ENGINES  # noqa: E402
+from benchmarks.bench_engines import ROOT  # noqa: E402
+
+DEFAULT_PROGRAMS = [
+    os.path.join(ROOT, "benchmarks", "programs", "methods.lox"),
+    os.path.join(ROOT, "benchmarks", "programs", "binary_tree.lox"),
+    os.path.join(ROOT, "examples", "doubly_linked_list.lox"),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("programs", nargs="*", default=DEFAULT_PROGRAMS)
+    parser.add_argument("--engines", default="tree,closure")
+    args = parser.parse_args()
+
+    print(f"{'program':<38}{'engine':<10}{'time':>12}   cache")
+    for path in args.programs:
+        with open(path, encoding="utf-8") as file:
+            source = file.read()
+        for name in args.engines.split(","):
+            engine = ENGINES[name]()
+            statements = Parser(Scanner(source).scan_tokens()).parse()
+            Resolver(engine).resolve(statements)
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                engine.interpret(statements)
+            seconds = time.perf_counter() - start
+            print(
+                f"{os.path.relpath(path, ROOT):<38}{name:<10}"
+                f"{seconds * 1000:>10.2f}ms   {engine.cache_stats}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Memory report for Lox instances on a large tree-building program.
+
+Builds a complete binary tree of `Node` instances with three fields each,
+keeps it alive in a global and reports the memory traced by `tracemalloc`
+per node, along with the build time.
+
+Usage:
+    python -m benchmarks.bench_instances [--depth N] [--engines tree,closure]
+"""
+import argparse
+import contextlib
+import gc
+import io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scanner import Scanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+from app.resolver import Resolver  # noqa: E402
+from app.lox import ENGINES  # noqa: E402
+
+PROGRAM = """
+class Node {
+  init(value) {
+    this.value = value;
+    this.left = nil;
+    this.right = nil;
+  }
+}
+
+fun build(depth) {
+  var node = Node(depth);
+  if (depth > 0) {
+    node.left = build(depth - 1);
+    node.right = build(depth - 1);
+  }
+  return node;
+}
+
+var root = build(%d);
+"""
+
+
+def measure(engine_class, depth):
+    """Returns (bytes per node, seconds) for building a tree of `depth`."""
+    engine = engine_class()
+    statements = Parser(Scanner(PROGRAM % depth).scan_tokens()).parse()
+    Resolver(engine).resolve(statements)
+
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine.interpret(statements)
+    seconds = time.perf_counter() - start
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    nodes = 2 ** (depth + 1) - 1
+    return allocated / nodes, seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--depth", type=int, default=14)
+    parser.add_argument("--engines", default="tree,closure")
+    args = parser.parse_args()
+
+    print(f"{2 ** (args.depth + 1) - 1:,} nodes")
+    print(f"{'engine':<12}{'bytes/node':>12}{'build':>12}")
+    for name in args.engines.split(","):
+        per_node, seconds = measure(ENGINES[name], args.depth)
+        print(f"{name:<12}{per_node:>12.1f}{seconds * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
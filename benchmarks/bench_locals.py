@@ -0,0 +1,42 @@
+"""Micro-benchmark for local variable access in the environment-based engines.
+
+Runs `benchmarks/programs/locals.lox`, a loop that reads and writes locals
+at distances 0-2 on every iteration, and reports the best time together with
+the number of local variable accesses per second.
+
+Usage:
+    python -m benchmarks.bench_locals [--repeat N] [--engines tree,closure]
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.lox import ENGINES  # noqa: E402
+from benchmarks.bench_engines import ROOT, run_once  # noqa: E402
+
+PROGRAM = os.path.join(ROOT, "benchmarks", "programs", "locals.lox")
+ITERATIONS = 20000
+# Local reads and writes per loop iteration of `sum` in locals.lox.
+ACCESSES_PER_ITERATION = 20
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--engines", default="tree,closure")
+    args = parser.parse_args()
+
+    with open(PROGRAM, encoding="utf-8") as file:
+        source = file.read()
+
+    accesses = ITERATIONS * ACCESSES_PER_ITERATION
+    print(f"{'engine':<12}{'best':>12}{'accesses/s':>16}")
+    for name in args.engines.split(","):
+        seconds = min(run_once(ENGINES[name], source) for _ in range(args.repeat))
+        print(f"{name:<12}{seconds * 1000:>10.2f}ms{accesses / seconds:>16,.0f}")
+
+
+if __name__ == "__main__":
+    main()
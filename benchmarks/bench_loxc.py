@@ -0,0 +1,61 @@
+"""Start-up time with and without the `.loxc` program cache.
+
+Times getting a large generated program ready to run three ways: running
+the front-end (scan, parse, resolve, fold), doing that and writing the
+cache, and loading the cached program. Nothing is executed.
+
+Usage:
+    python -m benchmarks.bench_loxc [--declarations N] [--repeat N]
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import lox, loxc  # noqa: E402
+from benchmarks.bench_ast import generated_source  # noqa: E402
+
+
+def best_time(function, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--declarations", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    source = generated_source(args.declarations)
+    directory = tempfile.mkdtemp()
+    try:
+        path = os.path.join(directory, "program.lox")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(source)
+        timings = {
+            "front-end": best_time(lambda: lox.front_end(source), args.repeat),
+            "front-end+store": best_time(
+                lambda: loxc.store(path, source, lox.front_end(source)), args.repeat
+            ),
+            "load": best_time(lambda: loxc.load(path, source), args.repeat),
+        }
+        size = os.path.getsize(loxc.cache_path(path))
+    finally:
+        shutil.rmtree(directory)
+
+    print(f"source: {len(source):,} characters, cache: {size:,} bytes")
+    for name, seconds in timings.items():
+        print(f"{name:<18}{seconds * 1000:>10.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Micro-benchmark for operator dispatch in the tree-walker and the parser.
+
+Evaluates a few expressions many times with `Interpreter.evaluate`, once with
+the operator nodes quickened as usual and once with every node forced onto
+the generic path, which dispatches on the operator's token kind. Also times
+scanning and parsing a long run of such expressions.
+
+Usage:
+    python -m benchmarks.bench_operators [--iterations N] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scanner import Scanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+from app.interpreter import Interpreter  # noqa: E402
+from app.expr import Binary, Unary  # noqa: E402
+from app.quickening import GENERIC  # noqa: E402
+
+EXPRESSIONS = {
+    "arithmetic": "1 + 2 * 3 - 4 / 5",
+    "comparison": "(1 < 2) == (3 >= 4) != (5 <= 6)",
+    "strings": '"a" + "b" + "c" == "abc"',
+    "logical": "!nil and -1 or 2",
+}
+
+
+def parse_expression(source):
+    return Parser(Scanner(source + ";").scan_tokens()).parse()[0].expression
+
+
+def operator_nodes(expr):
+    """Yields the `Binary` and `Unary` nodes of an expression tree."""
+    if isinstance(expr, (Binary, Unary)):
+        yield expr
+    for child in ("left", "right", "expression"):
+        node = getattr(expr, child, None)
+        if node is not None:
+            yield from operator_nodes(node)
+
+
+def time_evaluation(expr, iterations, repeat):
+    interpreter = Interpreter()
+    evaluate = interpreter.evaluate
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            evaluate(expr)
+        best = min(best, time.perf_counter() - start)
+    return best / iterations
+
+
+def time_parsing(source, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        Parser(Scanner(source).scan_tokens()).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'expression':<14}{'quickened':>14}{'generic':>14}")
+    for name, source in EXPRESSIONS.items():
+        quickened = time_evaluation(parse_expression(source), args.iterations, args.repeat)
+        expr = parse_expression(source)
+        for node in operator_nodes(expr):
+            node.guard = GENERIC
+        generic = time_evaluation(expr, args.iterations, args.repeat)
+        print(f"{name:<14}{quickened * 1e9:>12.0f}ns{generic * 1e9:>12.0f}ns")
+
+    source = "\n".join(f"print {expression};" for expression in EXPRESSIONS.values())
+    source = "\n".join([source] * 500)
+    seconds = time_parsing(source, args.repeat)
+    print(f"{'scan+parse':<14}{seconds * 1000:>12.2f}ms for {len(source):,} characters")
+
+
+if __name__ == "__main__":
+    main()
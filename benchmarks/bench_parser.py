@@ -0,0 +1,62 @@
+"""Parser throughput on expression-heavy input.
+
+Scans a long generated run of statements made of nested arithmetic,
+comparisons, logical operators, calls and property accesses once, then
+times parsing the tokens and reports tokens per second.
+
+Usage:
+    python -m benchmarks.bench_parser [--statements N] [--repeat N]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.regex_scanner import RegexScanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+
+OPERATORS = ["+", "-", "*", "/", "<", "<=", ">", ">=", "==", "!=", "and", "or"]
+
+
+def generated_expression(generator, depth):
+    if depth == 0:
+        return generator.choice(["1", "2.5", "x", '"s"', "true", "nil", "a.b", "f(x)"])
+    left = generated_expression(generator, depth - 1)
+    right = generated_expression(generator, depth - 1)
+    shape = generator.randrange(4)
+    if shape == 0:
+        return f"({left} {generator.choice(OPERATORS)} {right})"
+    if shape == 1:
+        return f"-{left} * !{right}"
+    if shape == 2:
+        return f"g({left}, {right}).h"
+    return f"{left} {generator.choice(OPERATORS)} {right}"
+
+
+def generated_source(statements):
+    generator = random.Random(0)
+    return "\n".join(
+        f"print {generated_expression(generator, 4)};" for _ in range(statements)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--statements", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tokens = RegexScanner(generated_source(args.statements)).scan_tokens()
+    best = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        Parser(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    print(f"{len(tokens):,} tokens: {best * 1000:.0f}ms, {len(tokens) / best / 1e6:.2f}M tokens/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Front-end time per REPL input as a session grows.
+
+Enters `--inputs` function declarations, each calling the one before,
+into a `repl.Session` and reports the mean time to compile each block of
+inputs. Then compares the time of one more input in the session with
+running the front-end over the whole history, which is what a REPL
+without a persistent global scope would need to see the earlier globals.
+Nothing is executed.
+
+Usage:
+    python -m benchmarks.bench_repl [--inputs N] [--block N]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import lox  # noqa: E402
+from app.interpreter import Interpreter  # noqa: E402
+from app.repl import Session  # noqa: E402
+
+
+def declaration(index):
+    if index == 0:
+        return "fun f0(n) { return n; }"
+    return f"fun f{index}(n) {{ if (n > 0) return f{index - 1}(n - 1); return {index}; }}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--inputs", type=int, default=5000)
+    parser.add_argument("--block", type=int, default=1000)
+    args = parser.parse_args()
+
+    session = Session(Interpreter())
+    history = []
+    print(f"{'inputs':<16}{'per input':>12}")
+    for first in range(0, args.inputs, args.block):
+        inputs = [declaration(index) for index in range(first, first + args.block)]
+        start = time.perf_counter()
+        for source in inputs:
+            session.compile(source)
+        elapsed = time.perf_counter() - start
+        history.extend(inputs)
+        label = f"{first}-{first + len(inputs) - 1}"
+        print(f"{label:<16}{elapsed / len(inputs) * 1e6:>10.1f}us")
+
+    source = declaration(len(history))
+    start = time.perf_counter()
+    session.compile(source)
+    incremental = time.perf_counter() - start
+    start = time.perf_counter()
+    lox.front_end("\n".join(history + [source]))
+    replayed = time.perf_counter() - start
+    print(f"one more input: session {incremental * 1e6:.1f}us, "
+          f"whole history {replayed * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
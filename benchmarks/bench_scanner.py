@@ -0,0 +1,94 @@
+"""Scanner throughput in MB/s.
+
+Scans a large generated source, made by repeating the example programs,
+with the character-at-a-time `Scanner`, with `RegexScanner` and with
+`BufferScanner` over the UTF-8 bytes. Then writes the source to a file and
+reports the peak memory of scanning it lazily, once read into a string and
+once memory-mapped as `run_file` does.
+
+Usage:
+    python -m benchmarks.bench_scanner [--size MB] [--repeat N]
+"""
+import argparse
+import glob
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.scanner import Scanner  # noqa: E402
+from app.regex_scanner import RegexScanner, BufferScanner  # noqa: E402
+from app.lox import mapped_source  # noqa: E402
+from benchmarks.bench_engines import ROOT  # noqa: E402
+
+SCANNERS = {
+    "scanner": Scanner,
+    "regex": RegexScanner,
+    "buffer": lambda source: BufferScanner(source.encode("utf-8")),
+}
+
+
+def generated_source(size):
+    """Concatenates the example programs until the source has `size` bytes."""
+    programs = []
+    for path in sorted(glob.glob(os.path.join(ROOT, "examples", "*.lox"))):
+        with open(path, encoding="utf-8") as file:
+            programs.append(file.read())
+    unit = "\n".join(programs)
+    return unit * max(1, size // len(unit.encode("utf-8")))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    source = generated_source(int(args.size * 1_000_000))
+    megabytes = len(source.encode("utf-8")) / 1_000_000
+    print(f"source: {megabytes:.2f} MB")
+    print(f"{'scanner':<12}{'best':>12}{'MB/s':>10}{'tokens':>12}")
+    for name, scanner_class in SCANNERS.items():
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            tokens = scanner_class(source).scan_tokens()
+            best = min(best, time.perf_counter() - start)
+        print(f"{name:<12}{best * 1000:>10.1f}ms{megabytes / best:>10.2f}{len(tokens):>12,}")
+
+    with tempfile.NamedTemporaryFile("w", suffix=".lox", encoding="utf-8", delete=False) as file:
+        file.write(source)
+    try:
+        print(f"{'file':<12}{'peak memory':>14}")
+        print(f"{'read':<12}{peak_memory(read_and_scan, file.name) / 1e6:>12.1f}MB")
+        print(f"{'mapped':<12}{peak_memory(map_and_scan, file.name) / 1e6:>12.1f}MB")
+    finally:
+        os.remove(file.name)
+
+
+def read_and_scan(path):
+    with open(path, encoding="utf-8") as file:
+        for _ in RegexScanner(file.read()).iter_tokens():
+            pass
+
+
+def map_and_scan(path):
+    with mapped_source(path) as source:
+        for _ in BufferScanner(source).iter_tokens():
+            pass
+
+
+def peak_memory(scan, path):
+    tracemalloc.start()
+    try:
+        scan(path)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+if __name__ == "__main__":
+    main()
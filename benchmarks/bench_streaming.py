@@ -0,0 +1,84 @@
+"""Time to first output and peak memory of `run` versus `run_streaming`.
+
+Runs a long generated script of small top-level declarations, each followed
+by a print, with the batch front-end, which scans and parses the whole
+script before executing it, and with the streaming one, which executes each
+declaration as soon as it is parsed.
+
+Usage:
+    python -m benchmarks.bench_streaming [--declarations N] [--engine NAME]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import lox  # noqa: E402
+
+RUNNERS = {"batch": lox.run, "streaming": lox.run_streaming}
+
+
+class FirstWrite:
+    """Stands in for stdout and records when output first appears."""
+
+    def __init__(self):
+        self.first = None
+
+    def write(self, text):
+        if self.first is None:
+            self.first = time.perf_counter()
+
+    def flush(self):
+        pass
+
+
+def generated_source(declarations):
+    return "\n".join(
+        f"fun f{i}(n) {{ var x = n * {i}; return x + 1; }}\nprint f{i}({i});"
+        for i in range(declarations)
+    )
+
+
+def measure(run, source, engine):
+    """Returns (seconds to first output, total seconds, peak bytes).
+
+    Memory is measured on a second run, as tracing slows the first down.
+    """
+    stdout = sys.stdout
+    try:
+        lox.set_engine(engine)
+        sys.stdout = FirstWrite()
+        start = time.perf_counter()
+        run(source)
+        total = time.perf_counter() - start
+        first = sys.stdout.first - start
+
+        lox.set_engine(engine)
+        tracemalloc.start()
+        run(source)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        sys.stdout = stdout
+    return first, total, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--declarations", type=int, default=20000)
+    parser.add_argument("--engine", choices=sorted(lox.ENGINES), default="tree")
+    args = parser.parse_args()
+
+    source = generated_source(args.declarations)
+    print(f"source: {len(source):,} characters, engine: {args.engine}")
+    print(f"{'front-end':<12}{'first output':>14}{'total':>12}{'peak memory':>14}")
+    for name, run in RUNNERS.items():
+        first, total, peak = measure(run, source, args.engine)
+        print(f"{name:<12}{first * 1000:>12.1f}ms{total * 1000:>10.0f}ms{peak / 1e6:>12.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
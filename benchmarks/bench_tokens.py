@@ -0,0 +1,76 @@
+"""Memory held by the tokens of a large generated source.
+
+Scans the source made by `bench_scanner` and keeps its tokens three ways:
+as objects with an instance `__dict__` (how `Token` used to be), as
+`Token`s with `__slots__`, and in a column-wise `TokenBuffer`. Reports the
+memory each keeps alive and how long `Parser` takes to parse from it.
+
+Usage:
+    python -m benchmarks.bench_tokens [--size MB]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.regex_scanner import RegexScanner  # noqa: E402
+from app.parser import Parser  # noqa: E402
+from app.token import TokenBuffer  # noqa: E402
+from benchmarks.bench_scanner import generated_source  # noqa: E402
+
+
+class DictToken:
+    """A token with an instance `__dict__`, for comparison."""
+
+    def __init__(self, token):
+        self.type = token.type
+        self.lexeme = token.lexeme
+        self.literal = token.literal
+        self.line = token.line
+
+
+STORES = {
+    "dict tokens": lambda tokens: [DictToken(token) for token in tokens],
+    "slot tokens": list,
+    "token buffer": TokenBuffer,
+}
+
+
+def retained_memory(build, tokens):
+    """Returns the store built from `tokens` and the bytes it keeps alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        store = build(tokens)
+        gc.collect()
+        return store, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=float, default=2.0)
+    args = parser.parse_args()
+
+    source = generated_source(int(args.size * 1_000_000))
+    print(f"source: {len(source.encode('utf-8')) / 1e6:.2f} MB")
+    print(f"{'store':<14}{'memory':>10}{'per token':>12}{'parse':>12}")
+    for name, build in STORES.items():
+        # Each store gets its own tokens, so none counts the others' objects.
+        tokens = iter(RegexScanner(source).iter_tokens())
+        store, size = retained_memory(build, tokens)
+        start = time.perf_counter()
+        Parser(store).parse()
+        seconds = time.perf_counter() - start
+        count = len(store)
+        print(f"{name:<14}{size / 1e6:>8.1f}MB{size / count:>10.0f} B{seconds * 1000:>10.0f}ms")
+        del store
+
+
+if __name__ == "__main__":
+    main()
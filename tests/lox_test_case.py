@@ -0,0 +1,44 @@
+import unittest
+from unittest.mock import patch
+from io import StringIO
+
+from app.scanner import Scanner
+from app.parser import Parser
+from app.resolver import Resolver
+from app.interpreter import Interpreter
+
+
+class LoxTestCase(unittest.TestCase):
+    """Base for tests that scan, parse, resolve and run Lox programs.
+
+    Each test gets a fresh interpreter from `make_interpreter`, which
+    subclasses override to run the same tests on another engine. Programs
+    report their errors to that interpreter's `errors`.
+    """
+
+    def make_interpreter(self):
+        return Interpreter()
+
+    def setUp(self):
+        self.interpreter = self.make_interpreter()
+
+    def compile_program(self, source, resolve=True):
+        """Returns the statements of a program without compile errors."""
+        errors = self.interpreter.errors
+        statements = Parser(Scanner(source, errors).scan_tokens(), errors).parse()
+        if resolve:
+            Resolver(self.interpreter).resolve(statements)
+        self.assertFalse(errors.had_error)
+        return statements
+
+    def run_statements(self, statements):
+        """Runs statements on the interpreter; returns stdout and stderr."""
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            self.interpreter.interpret(statements)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def run_program(self, source, resolve=True):
+        """Compiles and runs a program; returns stdout and stderr."""
+        return self.run_statements(self.compile_program(source, resolve))
@@ -0,0 +1,68 @@
+import unittest
+from unittest.mock import patch
+
+import test_interpreter
+from lox_test_case import LoxTestCase
+from app.closure_compiler import ClosureCompiler, ClosureInterpreter, CompiledFunction
+from app.expr import Binary, Call, Variable
+
+
+class TestClosureInterpreterSemantics(test_interpreter.TestInterpreter):
+    """Runs the tree-walker's interpreter tests against the closure engine."""
+
+    def make_interpreter(self):
+        return ClosureInterpreter()
+
+
+class TestClosureTailCalls(test_interpreter.TestTailCalls):
+    def make_interpreter(self):
+        return ClosureInterpreter()
+
+
+class TestClosureMethodCalls(test_interpreter.TestMethodCalls):
+    function_class = CompiledFunction
+
+    def make_interpreter(self):
+        return ClosureInterpreter()
+
+
+class TestClosureCompiler(LoxTestCase):
+    def make_interpreter(self):
+        return ClosureInterpreter()
+
+    def test_execution_does_not_visit_ast(self):
+        interpreter = self.interpreter
+        statements = self.compile_program(
+            """
+            fun fib(n) { if (n <= 1) return n; return fib(n - 1) + fib(n - 2); }
+            var result = fib(10);
+            """
+        )
+        compiled = ClosureCompiler(interpreter).compile(statements)
+
+        def fail(self, visitor):
+            raise AssertionError("AST visited during execution")
+
+        with patch.object(Binary, "accept", fail), patch.object(
+            Call, "accept", fail
+        ), patch.object(Variable, "accept", fail):
+            for statement in compiled:
+                statement(interpreter.globals)
+
+        self.assertEqual(interpreter.globals.values["result"], 55)
+
+    def test_functions_are_compiled_lox_functions(self):
+        self.run_program("class A { m() { return this; } } fun f() {}")
+        globals = self.interpreter.globals.values
+        self.assertIsInstance(globals["f"], CompiledFunction)
+        method = globals["A"].find_method("m")
+        self.assertIsInstance(method.bind(object()), CompiledFunction)
+
+    def test_runtime_error_reports_operator(self):
+        _, stderr = self.run_program('var a = 1; print a < "x";')
+        self.assertTrue(self.interpreter.errors.had_runtime_error)
+        self.assertEqual(stderr.strip(), "Operands must be numbers.")
+
+
+if __name__ == "__main__":
+    unittest.main()
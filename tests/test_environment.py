@@ -1,6 +1,7 @@
 import unittest
-from app.environment import Environment
+from app.environment import Environment, GlobalEnvironment
 from app.error_handler import RuntimeError
+from app.interpreter import Interpreter
 
 
 class MockToken:
@@ -10,7 +11,7 @@ class MockToken:
 
 class TestEnvironment(unittest.TestCase):
     def setUp(self):
-        self.env = Environment()
+        self.env = GlobalEnvironment()
 
     def test_define_and_get(self):
         token = MockToken("x")
@@ -35,20 +36,29 @@ class TestEnvironment(unittest.TestCase):
             self.env.assign(token, 100)
         self.assertEqual(str(context.exception), "Undefined variable 'y'.")
 
-    def test_enclosing_environment(self):
-        parent_env = Environment()
+    def test_local_frames_hold_only_slots(self):
+        child_env = Environment(enclosing=self.env)
+        self.assertFalse(hasattr(child_env, "values"))
+        self.assertIs(child_env.enclosing, self.env)
+
+    def test_slots_by_depth(self):
+        interpreter = Interpreter()
+        parent_env = Environment(slots=[1, 2])
         child_env = Environment(enclosing=parent_env)
-        parent_token = MockToken("a")
-        child_token = MockToken("b")
+        interpreter.environment = child_env
+        interpreter.declare(MockToken("c"), 3)
 
-        parent_env.define("a", 1)
-        child_env.define("b", 2)
+        self.assertEqual(child_env.get_at(0, 0), 3)
+        self.assertEqual(child_env.get_at(1, 1), 2)
 
-        self.assertEqual(child_env.get(parent_token), 1)
-        self.assertEqual(child_env.get(child_token), 2)
+        child_env.assign_at(1, 0, 42)
+        self.assertEqual(parent_env.slots, [42, 2])
 
-        child_env.assign(parent_token, 42)
-        self.assertEqual(parent_env.get(parent_token), 42)
+    def test_globals_are_declared_by_name(self):
+        interpreter = Interpreter()
+        interpreter.declare(MockToken("g"), 7)
+        self.assertEqual(interpreter.globals.get(MockToken("g")), 7)
+        self.assertEqual(interpreter.globals.slots, [])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from io import StringIO
+
+from app.lox import ENGINES
+from app.regex_scanner import scanner_for
+from app.parser import Parser
+from app.resolver import Resolver
+from app.error_handler import (
+    Diagnostic,
+    ErrorReporter,
+    RuntimeError,
+    current_reporter,
+    default_reporter,
+    error,
+    error_state,
+    report_runtime_error,
+)
+from app.token import Token
+from app.token_type import TokenType
+
+
+class TestDiagnostic(unittest.TestCase):
+    def test_formats_like_the_command_line(self):
+        self.assertEqual(
+            str(Diagnostic("compile", 3, "Expect ';'.", " at end")),
+            "[line 3] Error at end: Expect ';'.",
+        )
+        self.assertEqual(str(Diagnostic("runtime", 3, "Stack overflow.")), "Stack overflow.")
+
+
+class TestErrorReporter(unittest.TestCase):
+    def test_collects_diagnostics_of_the_active_reporter(self):
+        reporter = ErrorReporter()
+        token = Token(TokenType.IDENTIFIER, "x", None, 7)
+        with reporter.active():
+            self.assertIs(current_reporter(), reporter)
+            error(token, "Bad name.")
+            report_runtime_error(RuntimeError(token, "Bad value."))
+            self.assertTrue(error_state["had_error"] and error_state["had_runtime_error"])
+        self.assertIs(current_reporter(), default_reporter)
+        self.assertEqual(
+            [(d.kind, d.line, d.where, d.message) for d in reporter.diagnostics],
+            [("compile", 7, " at 'x'", "Bad name."), ("runtime", 7, "", "Bad value.")],
+        )
+
+    def test_error_state_sets_flags_of_the_current_reporter(self):
+        reporter = ErrorReporter()
+        with reporter.active():
+            error_state["had_error"] = True
+        self.assertTrue(reporter.had_error)
+        with self.assertRaises(KeyError):
+            error_state["had_warning"]
+
+    def test_default_reporter_prints_right_away(self):
+        error_state["had_error"] = False
+        with patch("sys.stderr", new=StringIO()) as stderr:
+            error(2, "Unexpected character: @")
+        self.assertTrue(default_reporter.had_error)
+        self.assertEqual(default_reporter.diagnostics, [])
+        self.assertEqual(stderr.getvalue(), "[line 2] Error: Unexpected character: @\n")
+        error_state["had_error"] = False
+
+    def test_threads_report_to_their_own_reporter(self):
+        reporters = [ErrorReporter() for _ in range(4)]
+        barrier = threading.Barrier(len(reporters))
+
+        def report(number):
+            with reporters[number].active():
+                barrier.wait()
+                for _ in range(100):
+                    error(number + 1, "Error.")
+
+        threads = [threading.Thread(target=report, args=(n,)) for n in range(len(reporters))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for number, reporter in enumerate(reporters):
+            self.assertEqual({d.line for d in reporter.diagnostics}, {number + 1})
+            self.assertEqual(len(reporter.diagnostics), 100)
+
+
+class TestInterpreterErrors(unittest.TestCase):
+    """Every engine owns its errors, so runs outside a session don't share
+    flags either."""
+
+    def run_program(self, engine, source):
+        interpreter = ENGINES[engine](errors=ErrorReporter())
+        errors = interpreter.errors
+        statements = Parser(scanner_for(source, errors).scan_tokens(), errors).parse()
+        Resolver(interpreter).resolve(statements)
+        if not errors.had_error:
+            interpreter.interpret(statements)
+        return errors.had_error, errors.had_runtime_error, [str(d) for d in errors.diagnostics]
+
+    def test_engines_in_threads_keep_their_errors_apart(self):
+        sources = ["print 1;", "{ var a = a; }", 'print -"a";']
+        expected = [
+            (False, False, []),
+            (True, False, ["[line 1] Error at 'a': Can't read local variable in its own initializer."]),
+            (False, True, ["Operand must be a number."]),
+        ]
+        for engine in ENGINES:
+            with self.subTest(engine=engine):
+                with patch("sys.stdout", new=StringIO()), patch(
+                    "sys.stderr", new=StringIO()
+                ) as stderr, ThreadPoolExecutor(max_workers=6) as pool:
+                    results = list(
+                        pool.map(lambda n: self.run_program(engine, sources[n % 3]), range(60))
+                    )
+                self.assertEqual(results, expected * 20)
+                self.assertEqual(stderr.getvalue(), "")
+                self.assertFalse(default_reporter.had_error or default_reporter.had_runtime_error)
+
+
+if __name__ == "__main__":
+    unittest.main()
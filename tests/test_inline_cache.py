@@ -0,0 +1,128 @@
+import unittest
+
+from lox_test_case import LoxTestCase
+from app.closure_compiler import ClosureInterpreter
+from app.inline_cache import POLYMORPHIC_LIMIT, CacheStats
+
+
+class TestInlineCache(LoxTestCase):
+
+    def test_repeated_access_hits(self):
+        stdout, _ = self.run_program(
+            """
+            class Point {
+                init(x) { this.x = x; }
+                getX() { return this.x; }
+            }
+            var p = Point(1);
+            var total = 0;
+            for (var i = 0; i < 10; i = i + 1) total = total + p.getX() + p.x;
+            print total;
+            """
+        )
+        self.assertEqual(stdout, "20\n")
+        stats = self.interpreter.cache_stats
+        # One miss each for `this.x =`, `p.getX`, `p.x` and `this.x` in getX.
+        self.assertEqual(stats.misses, 4)
+        self.assertEqual(stats.hits, 27)
+
+    def test_polymorphic_and_megamorphic_sites(self):
+        classes = " ".join(
+            f"class C{i} {{ init() {{ this.f{i} = {i}; this.v = {i}; }} }}"
+            for i in range(POLYMORPHIC_LIMIT + 3)
+        )
+        objects = ", ".join(f"C{i}()" for i in range(POLYMORPHIC_LIMIT + 3))
+        source = f"""
+            {classes}
+            fun value(o) {{ return o.v; }}
+            fun sum(a, b, c, d, e, f, g) {{
+                return value(a) + value(b) + value(c) + value(d) + value(e)
+                    + value(f) + value(g);
+            }}
+            print sum({objects});
+            print sum({objects});
+        """
+        stdout, stderr = self.run_program(source)
+        self.assertEqual(stderr, "")
+        self.assertEqual(stdout, "21\n21\n")
+
+    def test_fields_shadow_methods(self):
+        stdout, _ = self.run_program(
+            """
+            class A { m() { return "method"; } }
+            fun get(o) { return o.m; }
+            var a = A();
+            var b = A();
+            b.m = "field";
+            print get(a)();
+            print get(b);
+            """
+        )
+        self.assertEqual(stdout, "method\nfield\n")
+
+    def test_cached_site_sees_redefined_class(self):
+        self.run_program(
+            """
+            class A { m() { return 1; } }
+            fun call(o) { return o.m(); }
+            print call(A());
+            """
+        )
+        self.run_program("class A { m() { return 2; } }")
+        # Globals from earlier REPL lines are looked up by name at runtime.
+        stdout, _ = self.run_program("print call(A());", resolve=False)
+        self.assertEqual(stdout, "2\n")
+
+    def test_redefinition_flushes_stale_entries(self):
+        self.run_program("class A { m() { return 0; } } fun call(o) { return o.m(); }")
+        for version in range(POLYMORPHIC_LIMIT + 2):
+            self.run_program(f"class A {{ m() {{ return {version}; }} }}")
+            self.run_program("call(A());", resolve=False)
+
+        # The site would be megamorphic if shapes of replaced classes stayed.
+        stats = self.interpreter.cache_stats
+        hits, misses = stats.hits, stats.misses
+        self.run_program("call(A()); call(A());", resolve=False)
+        self.assertEqual((stats.hits - hits, stats.misses - misses), (2, 0))
+
+    def test_redefinition_in_another_interpreter_keeps_entries(self):
+        self.run_program(
+            """
+            class A { m() { return 1; } }
+            class B { m() { return 2; } }
+            class C { m() { return 3; } }
+            fun call(o) { return o.m(); }
+            call(A()); call(B());
+            """
+        )
+        interpreter = self.interpreter
+        self.interpreter = self.make_interpreter()
+        self.run_program("class A {}")
+        self.run_program("class A {}")
+        self.interpreter = interpreter
+
+        stats = self.interpreter.cache_stats
+        hits, misses = stats.hits, stats.misses
+        self.run_program("call(C()); call(A());", resolve=False)
+        self.assertEqual((stats.hits - hits, stats.misses - misses), (1, 1))
+
+    def test_undefined_property_is_not_cached(self):
+        _, stderr = self.run_program("class A {} var a = A(); print a.missing;")
+        self.assertEqual(stderr.strip(), "Undefined property 'missing'")
+        self.assertEqual(self.interpreter.cache_stats.hits, 0)
+
+    def test_stats_hit_rate(self):
+        stats = CacheStats()
+        self.assertEqual(stats.hit_rate, 0.0)
+        stats.hits, stats.misses = 3, 1
+        self.assertEqual(stats.hit_rate, 0.75)
+        self.assertEqual(str(stats), "3 hits, 1 misses (75.0% hit rate)")
+
+
+class TestClosureInlineCache(TestInlineCache):
+    def make_interpreter(self):
+        return ClosureInterpreter()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,36 +1,40 @@
 import unittest
 from unittest.mock import patch
 from io import StringIO
+from lox_test_case import LoxTestCase
 from app.scanner import Scanner
 from app.parser import Parser
 from app.interpreter import Interpreter
-from app.error_handler import error_state
 from app.resolver import Resolver
 from app.token import Token, TokenType
 from app.stmt import Class, Return, Function, Expression
 from app.expr import Assign, Literal, Variable
 from app.lox_class import LoxClass
+from app.lox_function import LoxFunction
 
 
 class TestInterpreter(unittest.TestCase):
+    def make_interpreter(self):
+        """Create the execution engine under test."""
+        return Interpreter()
+
     def interpret_expression(self, source, expected_output=None, expected_error=None):
-        error_state["had_runtime_error"] = False
+        # Create the interpreter first: errors are reported to its `errors`
+        interpreter = self.make_interpreter()
 
-        scanner = Scanner(source)
+        scanner = Scanner(source, interpreter.errors)
         tokens = scanner.scan_tokens()
 
-        parser = Parser(tokens)
+        parser = Parser(tokens, interpreter.errors)
         statements = parser.parse()
 
-        # Create interpreter and resolver
-        interpreter = Interpreter()
         resolver = Resolver(interpreter)
         resolver.resolve(statements)
         if expected_error:
             with patch("sys.stderr", new=StringIO()) as mock_stderr:
                 interpreter.interpret(statements)
                 self.assertTrue(
-                    error_state["had_runtime_error"],
+                    interpreter.errors.had_runtime_error,
                     "Runtime error should have occurred",
                 )
                 self.assertIn(expected_error, mock_stderr.getvalue().strip())
@@ -45,7 +49,7 @@ class TestInterpreter(unittest.TestCase):
                     interpreter.interpret(statements, repl_mode=False)
 
                 self.assertFalse(
-                    error_state["had_runtime_error"],
+                    interpreter.errors.had_runtime_error,
                     "No runtime error should have occurred",
                 )
                 # Compare outputs after stripping trailing whitespace and newlines
@@ -803,6 +807,12 @@ class TestInterpreter(unittest.TestCase):
             expected_error="Expected 2 arguments but got 1.",
         )
 
+    def test_unbounded_recursion_is_a_stack_overflow(self):
+        self.interpret_expression(
+            "fun f(n) { return 1 + f(n + 1); } f(0);",
+            expected_error="Stack overflow.",
+        )
+
     def test_super_method_call(self):
         # Test that a subclass can call a method from its superclass using 'super'
         self.interpret_expression(
@@ -853,5 +863,150 @@ class TestInterpreter(unittest.TestCase):
         )
 
 
+class TestTailCalls(LoxTestCase):
+    """Calls in `return` position run in constant Python stack."""
+
+    def test_deep_self_recursion(self):
+        stdout, _ = self.run_program(
+            """
+            fun count(n, total) {
+                if (n == 0) return total;
+                return count(n - 1, total + n);
+            }
+            print count(20000, 0);
+            """
+        )
+        self.assertEqual(stdout, "200010000\n")
+
+    def test_deep_mutual_recursion(self):
+        stdout, _ = self.run_program(
+            """
+            fun isEven(n, odd) { if (n == 0) return true; return odd(n - 1, isEven); }
+            fun isOdd(n, even) { if (n == 0) return false; return even(n - 1, isOdd); }
+            print isEven(10001, isOdd);
+            """
+        )
+        self.assertEqual(stdout, "false\n")
+
+    def test_deep_method_recursion(self):
+        stdout, _ = self.run_program(
+            """
+            class Node {
+                init(value, next) { this.value = value; this.next = next; }
+                find(target) {
+                    if (this.value == target) return this;
+                    if (this.next == nil) return nil;
+                    return this.next.find(target);
+                }
+            }
+            var head = nil;
+            for (var i = 0; i < 5000; i = i + 1) head = Node(i, head);
+            print head.find(0).value;
+            """
+        )
+        self.assertEqual(stdout, "0\n")
+
+    def test_closures_keep_their_frames(self):
+        stdout, _ = self.run_program(
+            """
+            fun zero() { return 0; }
+            fun build(n, rest) {
+                fun sum() { return n + rest(); }
+                if (n == 0) return sum;
+                return build(n - 1, sum);
+            }
+            print build(3, zero)();
+            """
+        )
+        self.assertEqual(stdout, "6\n")
+
+    def test_tail_call_to_class(self):
+        stdout, _ = self.run_program(
+            """
+            class Point { init(x) { this.x = x; } }
+            fun make(x) { return Point(x); }
+            print make(4).x;
+            """
+        )
+        self.assertEqual(stdout, "4\n")
+
+    def test_tail_call_errors(self):
+        _, stderr = self.run_program(
+            """
+            fun one(a) { return a; }
+            fun f() { return one(1, 2); }
+            f();
+            """
+        )
+        self.assertEqual(stderr.strip(), "Expected 1 arguments but got 2.")
+
+
+class TestMethodCalls(LoxTestCase):
+    """`object.method(...)` calls the method without binding it first."""
+
+    function_class = LoxFunction
+
+    def test_direct_calls_do_not_bind(self):
+        with patch.object(self.function_class, "bind", side_effect=AssertionError):
+            stdout, stderr = self.run_program(
+                """
+                class Counter {
+                    init(start) { this.count = start; }
+                    add(n) { this.count = this.count + n; return this; }
+                    twice(n) { return this.add(n).add(n); }
+                }
+                var counter = Counter(1);
+                print counter.add(2).twice(3).count;
+                print counter.init(0).count;
+                """
+            )
+        self.assertEqual(stderr, "")
+        self.assertEqual(stdout, "9\n0\n")
+
+    def test_escaping_methods_stay_bound(self):
+        stdout, _ = self.run_program(
+            """
+            class Box {
+                init(value) { this.value = value; }
+                get() { return this.value; }
+            }
+            var a = Box("a");
+            var b = Box("b");
+            var get = a.get;
+            b.other = a.get;
+            print get();
+            print b.other();
+            print b.get();
+            """
+        )
+        self.assertEqual(stdout, "a\na\nb\n")
+
+    def test_fields_are_called_as_values(self):
+        stdout, _ = self.run_program(
+            """
+            class Box {}
+            fun double(n) { return n * 2; }
+            var box = Box();
+            box.f = double;
+            box.make = Box;
+            print box.f(4);
+            print box.make();
+            """
+        )
+        self.assertEqual(stdout, "8\nBox instance\n")
+
+    def test_method_call_errors(self):
+        cases = [
+            ("class A { m(a) {} } A().m();", "Expected 1 arguments but got 0."),
+            ('class A {} var a = A(); a.f = 1; a.f();', "Can only call functions and classes."),
+            ("class A {} A().missing();", "Undefined property 'missing'"),
+            ('"text".length();', "Only instances have properties."),
+        ]
+        for source, message in cases:
+            with self.subTest(source=source):
+                _, stderr = self.run_program(source)
+                self.assertEqual(stderr.strip(), message)
+
+
 if __name__ == "__main__":
     unittest.main()
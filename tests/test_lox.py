@@ -0,0 +1,199 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from io import StringIO
+
+from app import lox, loxc
+
+
+class TestRunStreaming(unittest.TestCase):
+    """`run_streaming` executes each top-level declaration once it is parsed."""
+
+    engine = "tree"
+
+    def setUp(self):
+        lox.set_engine(self.engine)
+        self.addCleanup(lox.set_engine, "tree")
+
+    def run_source(self, run, source):
+        errors = lox.lox_interpreter.errors
+        errors.had_error = errors.had_runtime_error = False
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            run(source)
+        return (
+            stdout.getvalue(),
+            stderr.getvalue(),
+            errors.had_error,
+            errors.had_runtime_error,
+        )
+
+    def run_streaming(self, source):
+        return self.run_source(lox.run_streaming, source)
+
+    def test_same_output_as_run(self):
+        source = """
+            var total = 0;
+            fun add(n) { total = total + n; return total; }
+            class Counter {
+                init() { this.count = 0; }
+                bump() { this.count = this.count + 1; return this; }
+            }
+            for (var i = 1; i <= 3; i = i + 1) print add(i);
+            print Counter().bump().bump().count;
+            if (1 < 2) print "folded";
+        """
+        streamed = self.run_streaming(source)
+        lox.set_engine(self.engine)
+        self.assertEqual(streamed, self.run_source(lox.run, source))
+        self.assertEqual(streamed[0], "1\n3\n6\n2\nfolded\n")
+
+    def test_declarations_run_before_a_later_syntax_error(self):
+        stdout, stderr, had_error, _ = self.run_streaming(
+            'print "first";\nprint ;\nprint "never";\nvar = 1;'
+        )
+        self.assertEqual(stdout, "first\n")
+        self.assertEqual(stderr.count("Error"), 2)
+        self.assertTrue(had_error)
+
+    def test_resolution_error_stops_execution(self):
+        stdout, stderr, had_error, _ = self.run_streaming(
+            'print "first";\n{ var a = a; }\nprint "never";\nreturn 1;'
+        )
+        self.assertEqual(stdout, "first\n")
+        self.assertIn("Can't read local variable in its own initializer.", stderr)
+        self.assertIn("Can't return from top-level code.", stderr)
+        self.assertTrue(had_error)
+
+    def test_runtime_error_stops_execution(self):
+        stdout, stderr, had_error, had_runtime_error = self.run_streaming(
+            'print "first";\nprint -"x";\nprint "never";'
+        )
+        self.assertEqual(stdout, "first\n")
+        self.assertIn("Operand must be a number.", stderr)
+        self.assertFalse(had_error)
+        self.assertTrue(had_runtime_error)
+
+
+class TestClosureRunStreaming(TestRunStreaming):
+    engine = "closure"
+
+
+class TestVMRunStreaming(TestRunStreaming):
+    engine = "vm"
+
+
+class TestPythonRunStreaming(TestRunStreaming):
+    engine = "python"
+
+
+class RunFileTestCase(unittest.TestCase):
+    """Runs scripts written to a temporary directory through `run_file`."""
+
+    def setUp(self):
+        lox.set_engine("tree")
+
+    def run_script(self, source, stream=False, cache=True):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.script_path = os.path.join(directory.name, "script.lox")
+        with open(self.script_path, "wb") as file:
+            file.write(source.encode("utf-8"))
+        return self.run_path(self.script_path, stream, cache)
+
+    def run_path(self, path, stream=False, cache=True):
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            try:
+                lox.run_file(path, stream, cache)
+                status = 0
+            except SystemExit as exit:
+                status = exit.code
+        return stdout.getvalue(), stderr.getvalue(), status
+
+
+class TestRunFile(RunFileTestCase):
+    """`run_file` scans the memory-mapped bytes of the script."""
+
+    def test_runs_the_mapped_script(self):
+        for stream in (False, True):
+            with self.subTest(stream=stream):
+                stdout, _, status = self.run_script('var s = "héllo";\nprint s + " wörld";', stream)
+                self.assertEqual((stdout, status), ("héllo wörld\n", 0))
+
+    def test_empty_script(self):
+        self.assertEqual(self.run_script(""), ("", "", 0))
+
+    def test_exit_codes(self):
+        _, stderr, status = self.run_script("print é;")
+        self.assertEqual(status, 65)
+        self.assertIn("Unexpected character: é", stderr)
+        lox.lox_interpreter.errors.had_error = False
+        self.assertEqual(self.run_script('print -"x";')[2], 70)
+
+
+class TestRunFileCache(RunFileTestCase):
+    """`run_file` reuses the resolved program cached in a `.loxc` file."""
+
+    SOURCE = """
+        class Point {
+            init(x) { this.x = x; }
+            double() { return this.x * 2; }
+        }
+        fun show(n) { print Point(n).double() + 1; }
+        show(20);
+    """
+
+    def test_second_run_loads_the_cache(self):
+        stdout, _, status = self.run_script(self.SOURCE)
+        self.assertEqual((stdout, status), ("41\n", 0))
+        self.assertTrue(os.path.exists(loxc.cache_path(self.script_path)))
+
+        lox.set_engine("tree")
+        with patch.object(lox, "front_end", side_effect=AssertionError):
+            stdout, _, status = self.run_path(self.script_path)
+        self.assertEqual((stdout, status), ("41\n", 0))
+
+    def test_changed_script_is_not_loaded_from_the_cache(self):
+        self.run_script(self.SOURCE)
+        with open(self.script_path, "w", encoding="utf-8") as file:
+            file.write("print 1;")
+        self.assertEqual(self.run_path(self.script_path)[0], "1\n")
+
+    def test_no_cache(self):
+        self.run_script(self.SOURCE, cache=False)
+        self.assertFalse(os.path.exists(loxc.cache_path(self.script_path)))
+
+    def test_scripts_with_errors_are_not_cached(self):
+        self.assertEqual(self.run_script("print ;")[2], 65)
+        self.assertFalse(os.path.exists(loxc.cache_path(self.script_path)))
+
+    def test_python_engine_caches_its_generated_code(self):
+        lox.set_engine("python")
+        self.assertEqual(self.run_script(self.SOURCE)[0], "41\n")
+        self.assertTrue(os.path.exists(loxc.cache_path(self.script_path, ".python")))
+
+        lox.set_engine("python")
+        with patch.object(lox, "front_end", side_effect=AssertionError), patch(
+            "app.transpiler.Transpiler", side_effect=AssertionError
+        ):
+            stdout, _, status = self.run_path(self.script_path)
+        self.assertEqual((stdout, status), ("41\n", 0))
+
+    def test_cached_generated_code_reports_runtime_errors(self):
+        lox.set_engine("python")
+        for run in range(2):
+            with self.subTest(run=run):
+                lox.lox_interpreter.errors.had_runtime_error = False
+                if run == 0:
+                    _, stderr, status = self.run_script('var a = "x";\nprint -a;')
+                else:
+                    _, stderr, status = self.run_path(self.script_path)
+                self.assertEqual((stderr, status), ("Operand must be a number.\n", 70))
+
+
+if __name__ == "__main__":
+    unittest.main()
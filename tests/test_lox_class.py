@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from app.lox_class import LoxClass
+
+
+def method(arity=0):
+    function = MagicMock()
+    function.arity.return_value = arity
+    return function
+
+
+class TestLoxClass(unittest.TestCase):
+    def test_method_table_merges_inherited_methods(self):
+        speak, move, override = method(), method(), method()
+        base = LoxClass("Base", None, {"speak": speak, "move": move})
+        derived = LoxClass("Derived", base, {"move": override})
+
+        self.assertIs(derived.find_method("speak"), speak)
+        self.assertIs(derived.find_method("move"), override)
+        self.assertIs(base.find_method("move"), move)
+        self.assertIsNone(derived.find_method("missing"))
+        self.assertEqual(derived.methods, {"move": override})
+
+    def test_lookup_does_not_walk_superclasses(self):
+        root = LoxClass("Root", None, {"m": method()})
+        klass = root
+        for depth in range(20):
+            klass = LoxClass(f"C{depth}", klass, {})
+
+        with patch.object(LoxClass, "find_method", side_effect=AssertionError):
+            self.assertIs(klass.method_table["m"], root.methods["m"])
+
+    def test_initializer_and_arity_are_cached(self):
+        init = method(arity=2)
+        base = LoxClass("Base", None, {"init": init})
+        derived = LoxClass("Derived", base, {})
+
+        self.assertIs(derived.initializer, init)
+        self.assertEqual(derived.arity(), 2)
+        init.arity.reset_mock()
+        derived.arity()
+        init.arity.assert_not_called()
+
+    def test_class_without_initializer(self):
+        klass = LoxClass("Empty")
+        self.assertIsNone(klass.initializer)
+        self.assertEqual(klass.arity(), 0)
+        instance = klass.call(None, [])
+        self.assertIs(instance.klass, klass)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,20 +3,23 @@ from unittest.mock import MagicMock
 from app.lox_function import LoxFunction
 from app.stmt import Function
 from app.token import Token, TokenType
-from app.environment import Environment
+from app.environment import Environment, GlobalEnvironment
+from app.error_handler import Return
 
 
 
 class DummyInterpreter:
     def __init__(self):
-        self.globals = Environment()
+        self.globals = GlobalEnvironment()
         self.executed_body = False
         self.last_environment = None
+        self.completion = None
 
     def execute_block(self, body, environment):
         self.executed_body = True
         self.last_environment = environment
         self.body = body
+        return self.completion
 
     def get(self, name):
         return self.last_environment.get(name)
@@ -45,35 +48,59 @@ class TestLoxFunction(unittest.TestCase):
         result = self.lox_function(interpreter, [123, 456])
         self.assertTrue(interpreter.executed_body)
         self.assertEqual(result, None)
-        # Environment should have the parameters bound
-        self.assertEqual(interpreter.last_environment.get(self.param_a), 123)
-        self.assertEqual(interpreter.last_environment.get(self.param_b), 456)
+        # Parameters should be bound to the first slots, in order
+        self.assertEqual(interpreter.last_environment.slots, [123, 456])
         # The body passed to execute_block should be correct
         self.assertIs(interpreter.body, self.body)
 
+    def test_call_returns_completion_value(self):
+        interpreter = DummyInterpreter()
+        interpreter.completion = Return(789)
+        self.assertEqual(self.lox_function(interpreter, [1, 2]), 789)
+
     def test_initializer_returns_this(self):
         """Test that initializers return this instead of the return value"""
         # Create a dummy function declaration node for an initializer
         name_token = Token(TokenType.IDENTIFIER, "init", None, 1)
         body = [MagicMock()]
         declaration = Function(name_token, [], body)
-        
-        # Create an environment with a 'this' variable
-        environment = Environment()
+
+        # Create the initializer function, bound to an instance
         instance = MagicMock()
-        environment.define("this", instance)
-        
-        # Create the initializer function
-        initializer = LoxFunction(declaration, environment, is_initializer=True)
-        
-        # Call the initializer
+        initializer = LoxFunction(declaration, Environment(), is_initializer=True)
+        bound = initializer.bind(instance)
+
+        # Call the initializer; an early `return;` still yields this
         interpreter = DummyInterpreter()
-        result = initializer(interpreter, [])
-        
+        interpreter.completion = Return(None)
+        result = bound(interpreter, [])
+
         # Verify that it returns this instead of the return value
         self.assertIs(result, instance)
         self.assertTrue(interpreter.executed_body)
 
+    def test_bound_method_puts_this_in_the_frame(self):
+        instance = MagicMock()
+        bound = self.lox_function.bind(instance)
+        self.assertIs(bound.instance, instance)
+        self.assertIs(bound.closure, self.lox_function.closure)
+
+        interpreter = DummyInterpreter()
+        bound(interpreter, [1, 2])
+        # `this` takes slot 0, ahead of the parameters
+        self.assertEqual(interpreter.last_environment.slots, [instance, 1, 2])
+        self.assertIs(interpreter.last_environment.enclosing, bound.closure)
+
+
+class TestSlots(unittest.TestCase):
+    def test_runtime_objects_have_no_instance_dict(self):
+        from app.closure_compiler import CompiledFunction
+        from app.lox_instance import LoxInstance
+
+        for runtime_class in (LoxFunction, CompiledFunction, LoxInstance, Environment, Token):
+            with self.subTest(runtime_class=runtime_class.__name__):
+                self.assertEqual(runtime_class.__dictoffset__, 0)
+
 
 if __name__ == "__main__":
     unittest.main()
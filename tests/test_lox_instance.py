@@ -0,0 +1,63 @@
+import unittest
+from app.lox_class import LoxClass
+from app.lox_instance import LoxInstance
+from app.token import Token, TokenType
+from app.error_handler import RuntimeError
+
+
+def name(lexeme):
+    return Token(TokenType.IDENTIFIER, lexeme, None, 1)
+
+
+class TestLoxInstance(unittest.TestCase):
+    def setUp(self):
+        self.klass = LoxClass("Node")
+
+    def test_set_and_get_fields(self):
+        instance = LoxInstance(self.klass)
+        instance.set(name("value"), 1.0)
+        instance.set(name("next"), None)
+        instance.set(name("value"), 2.0)
+
+        self.assertEqual(instance.get(name("value")), 2.0)
+        self.assertIsNone(instance.get(name("next")))
+        self.assertEqual(instance.values, [2.0, None])
+        self.assertEqual(instance.fields, {"value": 2.0, "next": None})
+
+    def test_same_field_order_shares_shape(self):
+        first = LoxInstance(self.klass)
+        second = LoxInstance(self.klass)
+        for instance in (first, second):
+            instance.set(name("left"), None)
+            instance.set(name("right"), None)
+
+        self.assertIs(first.shape, second.shape)
+        self.assertEqual(first.shape.slots, {"left": 0, "right": 1})
+
+    def test_different_field_order_uses_different_shape(self):
+        first = LoxInstance(self.klass)
+        first.set(name("a"), 1.0)
+        first.set(name("b"), 2.0)
+        second = LoxInstance(self.klass)
+        second.set(name("b"), 2.0)
+        second.set(name("a"), 1.0)
+
+        self.assertIsNot(first.shape, second.shape)
+        self.assertEqual(second.get(name("a")), 1.0)
+
+    def test_shapes_are_per_class(self):
+        other = LoxInstance(LoxClass("Other"))
+        instance = LoxInstance(self.klass)
+        other.set(name("x"), 1.0)
+        instance.set(name("x"), 1.0)
+        self.assertIsNot(other.shape, instance.shape)
+
+    def test_undefined_property(self):
+        instance = LoxInstance(self.klass)
+        with self.assertRaises(RuntimeError) as context:
+            instance.get(name("missing"))
+        self.assertEqual(str(context.exception), "Undefined property 'missing'")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,103 @@
+import gc
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+from io import BytesIO
+
+from app import loxc
+from app.lox import front_end
+from app.ast_printer import AstPrinter
+
+
+class TestLoxc(unittest.TestCase):
+    SOURCE = "var a = 1 + 2;\nfun f(x) { return x.y(a); }\nprint f;"
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.script = os.path.join(directory.name, "script.lox")
+        with open(self.script, "w", encoding="utf-8") as file:
+            file.write(self.SOURCE)
+
+    def printed(self, statements):
+        printer = AstPrinter()
+        return [printer.print(statement) for statement in statements]
+
+    def test_cache_path(self):
+        directory = os.path.dirname(self.script)
+        self.assertEqual(
+            loxc.cache_path(self.script),
+            os.path.join(directory, "__loxcache__", "script.loxc"),
+        )
+
+    def test_round_trip(self):
+        statements = front_end(self.SOURCE)
+        self.assertTrue(loxc.store(self.script, self.SOURCE, statements))
+        loaded = loxc.load(self.script, self.SOURCE.encode("utf-8"))
+        self.assertEqual(self.printed(loaded), self.printed(statements))
+        # Resolution results are kept.
+        self.assertEqual(loaded[1].body[0].value.arguments[0].depth, None)
+        self.assertEqual(loaded[1].body[0].value.callee.object.depth, 0)
+
+    def test_misses(self):
+        self.assertIsNone(loxc.load(self.script, self.SOURCE))
+        loxc.store(self.script, self.SOURCE, front_end(self.SOURCE))
+        self.assertIsNone(loxc.load(self.script, self.SOURCE + " "))
+        with patch.object(loxc, "interpreter_digest", return_value="changed"):
+            self.assertIsNone(loxc.load(self.script, self.SOURCE))
+
+    def test_corrupt_cache_is_a_miss(self):
+        loxc.store(self.script, self.SOURCE, front_end(self.SOURCE))
+        path = loxc.cache_path(self.script)
+        with open(path, "r+b") as file:
+            file.truncate(os.path.getsize(path) - 10)
+        self.assertIsNone(loxc.load(self.script, self.SOURCE))
+
+    def test_digest_covers_the_interpreter_sources(self):
+        loxc.interpreter_digest.cache_clear()
+        self.addCleanup(loxc.interpreter_digest.cache_clear)
+        digest = loxc.interpreter_digest()
+        real_open = open
+
+        def edited_open(path, mode="r", *args, **kwargs):
+            file = real_open(path, mode, *args, **kwargs)
+            if os.path.basename(path) == "expr.py":
+                return BytesIO(file.read() + b"# edited\n")
+            return file
+
+        loxc.interpreter_digest.cache_clear()
+        with patch("builtins.open", edited_open):
+            self.assertNotEqual(loxc.interpreter_digest(), digest)
+
+    def test_collector_pause_nests_and_restores_its_state(self):
+        self.assertTrue(gc.isenabled())
+        with loxc.paused_collection():
+            with loxc.paused_collection():
+                self.assertFalse(gc.isenabled())
+            self.assertFalse(gc.isenabled())
+        self.assertTrue(gc.isenabled())
+        gc.disable()
+        try:
+            with loxc.paused_collection():
+                pass
+            self.assertFalse(gc.isenabled())
+        finally:
+            gc.enable()
+
+    def test_unwritable_cache_directory(self):
+        with open(os.path.join(os.path.dirname(self.script), "__loxcache__"), "w"):
+            pass  # A file where the directory should be.
+        self.assertFalse(loxc.store(self.script, self.SOURCE, front_end(self.SOURCE)))
+
+    def test_unpicklable_program_is_not_stored(self):
+        # A local function fails with AttributeError, a lock with TypeError.
+        for program in (lambda: None, threading.Lock()):
+            with self.subTest(program=program):
+                self.assertFalse(loxc.store(self.script, self.SOURCE, program))
+                self.assertIsNone(loxc.load(self.script, self.SOURCE))
+
+
+if __name__ == "__main__":
+    unittest.main()
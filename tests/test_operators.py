@@ -0,0 +1,49 @@
+import unittest
+from app.operators import BINARY_OPERATORS, UNARY_OPERATORS, SHORT_CIRCUITS_ON
+from app.parser import (
+    EQUALITY_OPERATORS,
+    COMPARISON_OPERATORS,
+    TERM_OPERATORS,
+    FACTOR_OPERATORS,
+    UNARY_OPERATORS as PREFIX_OPERATORS,
+)
+from app.token import Token
+from app.token_type import TokenType
+from app.error_handler import RuntimeError
+
+
+class TestOperatorTables(unittest.TestCase):
+    def test_token_kinds_are_small_integers(self):
+        self.assertIsInstance(TokenType.PLUS, int)
+        self.assertEqual(TokenType.PLUS, 8)
+        self.assertEqual(str(TokenType.PLUS), "TokenType.PLUS")
+
+    def test_every_parsed_operator_has_a_handler(self):
+        binary = EQUALITY_OPERATORS | COMPARISON_OPERATORS | TERM_OPERATORS | FACTOR_OPERATORS
+        self.assertEqual(set(BINARY_OPERATORS), binary)
+        self.assertEqual(set(UNARY_OPERATORS), PREFIX_OPERATORS)
+        self.assertEqual(set(SHORT_CIRCUITS_ON), {TokenType.AND, TokenType.OR})
+
+    def test_handlers(self):
+        def token(kind, lexeme):
+            return Token(kind, lexeme, None, 1)
+
+        plus = token(TokenType.PLUS, "+")
+        self.assertEqual(BINARY_OPERATORS[TokenType.PLUS](plus, 1.0, 2.0), 3.0)
+        self.assertEqual(BINARY_OPERATORS[TokenType.PLUS](plus, "a", "b"), "ab")
+        self.assertIs(BINARY_OPERATORS[TokenType.EQUAL_EQUAL](None, None, None), True)
+        self.assertIs(BINARY_OPERATORS[TokenType.BANG_EQUAL](None, None, False), True)
+        self.assertIs(UNARY_OPERATORS[TokenType.BANG](None, 0.0), False)
+
+        with self.assertRaises(RuntimeError) as raised:
+            BINARY_OPERATORS[TokenType.PLUS](plus, "a", 1.0)
+        self.assertIs(raised.exception.token, plus)
+        minus = token(TokenType.MINUS, "-")
+        with self.assertRaisesRegex(RuntimeError, "Operand must be a number."):
+            UNARY_OPERATORS[TokenType.MINUS](minus, "a")
+        with self.assertRaisesRegex(RuntimeError, "Operands must be numbers."):
+            BINARY_OPERATORS[TokenType.LESS](token(TokenType.LESS, "<"), 1.0, "a")
+
+
+if __name__ == "__main__":
+    unittest.main()
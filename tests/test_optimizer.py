@@ -0,0 +1,96 @@
+import unittest
+from lox_test_case import LoxTestCase
+from app.optimizer import ConstantFolder
+from app.ast_printer import AstPrinter
+from app.expr import Binary
+
+
+class TestConstantFolder(LoxTestCase):
+    def fold(self, source):
+        folder = ConstantFolder()
+        return folder.fold(self.compile_program(source)), folder.folded
+
+    def assert_folds(self, source, expected, count=None):
+        statements, folded = self.fold(source)
+        self.assertEqual(AstPrinter().print(statements), expected)
+        if count is not None:
+            self.assertEqual(folded, count)
+
+    def run_folded(self, source):
+        return self.run_statements(self.fold(source)[0])
+
+    def test_folds_arithmetic_and_removes_groupings(self):
+        self.assert_folds("print 1 + 2 * (3 - 1);", "(print 5.0)", count=4)
+        self.assert_folds("print -(4);", "(print -4.0)", count=2)
+
+    def test_folds_strings_comparisons_and_not(self):
+        self.assert_folds('print "a" + "b";', "(print ab)")
+        self.assert_folds("print 1 < 2;", "(print true)")
+        self.assert_folds('print "a" == "a";', "(print true)")
+        self.assert_folds("print nil == false;", "(print false)")
+        self.assert_folds("print !true;", "(print false)")
+        self.assert_folds("print !nil;", "(print true)")
+
+    def test_folds_inside_functions_and_methods(self):
+        self.assert_folds(
+            "fun f(a) { return a + (1 + 1); } class A { m() { return 2 * 3; } }",
+            "(fun f (a) (return (+ a 2.0)))\n(class A (fun m () (return 6.0)))",
+        )
+
+    def test_simplifies_constant_logical_operands(self):
+        self.assert_folds("var x; print true and x;", "(var x)\n(print x)")
+        self.assert_folds("var x; print false and x;", "(var x)\n(print false)")
+        self.assert_folds('var x; print nil or x;', "(var x)\n(print x)")
+        self.assert_folds('var x; print "s" or x;', "(var x)\n(print s)")
+        self.assert_folds("var x; print x or true;", "(var x)\n(print (or x true))")
+
+    def test_prunes_constant_branches(self):
+        self.assert_folds("if (1 < 2) print 1; else print 2;", "(print 1.0)", count=2)
+        self.assert_folds("if (false) print 1;", "", count=1)
+        self.assert_folds("while (false) print 1;", "", count=1)
+        self.assert_folds(
+            "var x; while (x) if (nil) print 1;", "(var x)\n(while x (block))"
+        )
+        self.assert_folds("while (true) print 1;", "(while true (print 1.0))")
+
+    def test_pruning_keeps_local_slots(self):
+        stdout, _ = self.run_folded(
+            """
+            {
+                var a = 1;
+                if (false) { var b = 2; print b; }
+                var c = 3;
+                print a + c;
+            }
+            """
+        )
+        self.assertEqual(stdout, "4\n")
+
+    def test_runtime_errors_are_not_folded(self):
+        statements, folded = self.fold('print "a" -\n1;')
+        self.assertEqual(folded, 0)
+        binary = statements[0].expression
+        self.assertIsInstance(binary, Binary)
+        self.assertEqual(binary.operator.line, 1)
+
+        _, stderr = self.run_folded('print "a" + 1;')
+        self.assertEqual(stderr.strip(), "Operands must be two numbers or two strings.")
+        self.assertTrue(self.interpreter.errors.had_runtime_error)
+        self.assert_folds("print -\"a\";", '(print (- a))', count=0)
+        self.assert_folds("print 1 / 0;", "(print (/ 1.0 0.0))", count=0)
+
+    def test_mixed_type_equality_is_folded_like_the_engines_compare(self):
+        self.assert_folds("print 1 == true;", "(print true)", count=1)
+        self.assert_folds("print 1 == nil;", "(print false)", count=1)
+        self.assert_folds('print "1" != 1;', "(print true)", count=1)
+
+    def test_failed_fold_leaves_the_node_untouched(self):
+        statements, _ = self.fold('print "a" - 1; print -"a";')
+        binary, unary = statements[0].expression, statements[1].expression
+        self.assertIsInstance(binary, Binary)
+        self.assertIsNone(binary.guard)
+        self.assertIsNone(unary.guard)
+
+
+if __name__ == "__main__":
+    unittest.main()
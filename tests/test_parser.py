@@ -1,9 +1,12 @@
 import unittest
-from app.parser import Parser
+from unittest.mock import patch
+from io import StringIO
+from app.parser import Parser, TokenStream
+from app.regex_scanner import RegexScanner
 from app.ast_printer import AstPrinter
 from app.token_type import TokenType
 from app.token import Token
-from app.error_handler import error_state
+from app.error_handler import ErrorReporter
 from app.stmt import Function, Return
 from app.expr import Literal, Call, Variable
 
@@ -188,13 +191,12 @@ class TestParser(unittest.TestCase):
             Token(TokenType.IDENTIFIER, "foo", "foo", 1),
             Token(TokenType.EOF, "", None, 1),
         ]
-        parser = Parser(tokens)
-
-        error_state["had_error"] = False
+        errors = ErrorReporter()
+        parser = Parser(tokens, errors)
 
         result = parser.parse()
         self.assertEqual([None], result, "Parser should return [None] on error")
-        self.assertTrue(error_state["had_error"], "Error state should be set")
+        self.assertTrue(errors.had_error, "Error state should be set")
 
     def test_equality_expressions(self):
         # Test equality (==) expression
@@ -919,5 +921,75 @@ class TestParser(unittest.TestCase):
         statements = parser.parse()
         self.assertTrue(statements is None or statements == [] or not any(isinstance(stmt, Function) for stmt in statements))
 
+    def test_precedence_and_associativity(self):
+        cases = {
+            "1 + 2 * 3 - 4 / -5;": "(- (+ 1.0 (* 2.0 3.0)) (/ 4.0 (- 5.0)))",
+            "1 - 2 - 3 == 4 != 5;": "(!= (== (- (- 1.0 2.0) 3.0) 4.0) 5.0)",
+            "a = b.c = 1 or 2 and !3 == 4 < 5;":
+                "(= a (= (. b c) (or 1.0 (and 2.0 (== (! 3.0) (< 4.0 5.0))))))",
+            "-f(1)(2).g.h(x, y);": "(- (call (. (. (call (call f 1.0) 2.0) g) h) x y))",
+            "!!(1 + 2) * 3;": "(* (! (! (group (+ 1.0 2.0)))) 3.0)",
+        }
+        printer = AstPrinter()
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                statements = Parser(RegexScanner(source).scan_tokens()).parse()
+                self.assertEqual(printer.print(statements[0]), expected)
+
+    def test_expression_errors(self):
+        cases = {
+            "a + b = c;": "[line 1] Error at '=': Invalid assignment target.\n",
+            "-a = b;": "[line 1] Error at '=': Invalid assignment target.\n",
+            "1 + ;": "[line 1] Error at ';': Expect expression.\n",
+            "a.1;": "[line 1] Error at '1': Expect property name after '.'.\n",
+            "super;": "[line 1] Error at ';': Expect '.' after 'super'.\n",
+            "(1;": "[line 1] Error at ';': Expect ')' after expression.\n",
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                with patch("sys.stderr", new=StringIO()) as stderr:
+                    Parser(RegexScanner(source).scan_tokens()).parse()
+                self.assertEqual(stderr.getvalue(), expected)
+
+    def test_nodes_have_no_instance_dict(self):
+        from app import expr, stmt
+
+        for base in (expr.Expr, stmt.Stmt):
+            for node_class in base.__subclasses__():
+                with self.subTest(node=node_class.__name__):
+                    self.assertEqual(node_class.__dictoffset__, 0)
+
+    def test_declarations_from_a_token_stream(self):
+        tokens = [
+            Token(TokenType.RETURN, "return", None, 1),
+            Token(TokenType.SEMICOLON, ";", None, 1),
+            Token(TokenType.RETURN, "return", None, 2),
+            Token(TokenType.NUMBER, "1", 1.0, 2),
+            Token(TokenType.SEMICOLON, ";", None, 2),
+            Token(TokenType.EOF, "", None, 2)
+        ]
+        pulled = []
+
+        def scan():
+            for token in tokens:
+                pulled.append(token)
+                yield token
+
+        stream = TokenStream(scan())
+        parser = Parser(stream)
+        declarations = parser.declarations()
+        printer = AstPrinter()
+        with patch("app.parser.TOKEN_CHUNK", 1):
+            self.assertEqual(printer.print(next(declarations)), "(return)")
+            # The second declaration has not been scanned yet.
+            self.assertEqual(len(pulled), 2)
+            stream.discard_before(parser.current - 1)
+            self.assertEqual(list(stream.values()), tokens[1:2])
+            self.assertEqual(printer.print(next(declarations)), "(return 1.0)")
+            self.assertEqual(list(declarations), [])
+        self.assertEqual(stream[5], tokens[5])
+        with self.assertRaises(IndexError):
+            stream[6]
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from operator import add, lt, neg
+
+from lox_test_case import LoxTestCase
+from app.quickening import GENERIC
+
+
+class TestQuickening(LoxTestCase):
+    def run_source(self, source):
+        statements = self.compile_program(source)
+        return (statements, *self.run_statements(statements))
+
+    def function_body(self, statements, name):
+        for statement in statements:
+            if getattr(statement, "name", None) and statement.name.lexeme == name:
+                return statement.body
+        raise AssertionError(name)
+
+    def test_numeric_sites_specialise_for_floats(self):
+        statements, stdout, _ = self.run_source(
+            """
+            var total = 0;
+            for (var i = 0; i < 10; i = i + 1) total = total + -i;
+            print total;
+            """
+        )
+        self.assertEqual(stdout, "-45\n")
+        loop = statements[1].statements[1]
+        self.assertIs(loop.condition.guard, float)
+        self.assertIs(loop.condition.operation, lt)
+        update = loop.body.statements[0].expression.value
+        self.assertIs(update.operation, add)
+        self.assertIs(update.right.guard, float)
+        self.assertIs(update.right.operation, neg)
+
+    def test_string_sites_specialise_for_concatenation(self):
+        statements, stdout, _ = self.run_source(
+            'fun join(a, b) { return a + b; } print join("a", "b");'
+        )
+        self.assertEqual(stdout, "ab\n")
+        binary = self.function_body(statements, "join")[0].value
+        self.assertIs(binary.guard, str)
+
+    def test_guard_misses_fall_back_to_generic_path(self):
+        _, stdout, stderr = self.run_source(
+            """
+            fun plus(a, b) { return a + b; }
+            fun less(a, b) { return a < b; }
+            print plus(1, 2);
+            print plus("a", "b");
+            print less(1, 2);
+            print less("a", 1);
+            """
+        )
+        self.assertEqual(stdout, "3\nab\ntrue\n")
+        self.assertEqual(stderr.strip(), "Operands must be numbers.")
+
+        _, _, stderr = self.run_source(
+            'fun neg(a) { return -a; } print neg(1); print neg("a");'
+        )
+        self.assertEqual(stderr.strip(), "Operand must be a number.")
+
+    def test_mixed_operands_stay_generic(self):
+        statements, stdout, _ = self.run_source(
+            """
+            fun same(a, b) { return a == b; }
+            print same(1, nil);
+            print same(2, 2);
+            print !nil;
+            """
+        )
+        self.assertEqual(stdout, "false\ntrue\ntrue\n")
+        binary = self.function_body(statements, "same")[0].value
+        self.assertIs(binary.guard, GENERIC)
+        self.assertIs(statements[-1].expression.guard, GENERIC)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import glob
+import os
+import random
+import unittest
+from unittest.mock import patch
+from io import StringIO
+
+import test_scanner
+from app.scanner import Scanner
+from app import regex_scanner
+from app.regex_scanner import RegexScanner, BufferScanner
+from app.error_handler import ErrorReporter, print_diagnostic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestRegexScannerSemantics(test_scanner.TestScanner):
+    """Runs the scanner tests against `RegexScanner`."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = patch.object(test_scanner, "Scanner", RegexScanner)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+class TestRegexScannerMatchesScanner(unittest.TestCase):
+    def scan(self, scanner_class, source):
+        errors = ErrorReporter(print_diagnostic)
+        with patch("sys.stderr", new=StringIO()) as stderr:
+            tokens = scanner_class(source, errors).scan_tokens()
+        return (
+            [(token.type, token.lexeme, token.literal, token.line) for token in tokens],
+            stderr.getvalue(),
+            errors.had_error,
+        )
+
+    def assert_same_scan(self, source):
+        self.assertEqual(self.scan(RegexScanner, source), self.scan(Scanner, source))
+
+    def test_examples(self):
+        for path in sorted(glob.glob(os.path.join(ROOT, "examples", "*.lox"))):
+            with self.subTest(path=os.path.basename(path)):
+                with open(path, encoding="utf-8") as file:
+                    self.assert_same_scan(file.read())
+
+    def test_edge_cases(self):
+        sources = [
+            '"line\none" x',
+            '"unterminated\nstring',
+            "/* open\ncomment",
+            "/*/ still open */ x",
+            "a // comment\nb",
+            "1.5.2 3. .4",
+            "a/b/*c*/d",
+            "!!=!= <<=>>= ===",
+            "@ é \f\v 1",
+            "_a1 b_2 __init",
+            "",
+        ]
+        for source in sources:
+            with self.subTest(source=source):
+                self.assert_same_scan(source)
+
+    def test_iter_tokens_matches_scan_tokens(self):
+        source = 'var a = "x\ny"; // comment\nprint a @ 1.5;'
+        with patch("sys.stderr", new=StringIO()):
+            lazy = [
+                (token.type, token.lexeme, token.literal, token.line)
+                for token in RegexScanner(source).iter_tokens()
+            ]
+        self.assertEqual(lazy, self.scan(RegexScanner, source)[0])
+
+    def test_iter_tokens_grows_chunks_over_strings_and_comments(self):
+        sources = ['a\n"b\nc\nd" e\n', "a\n/* b\nc */ d\n", 'a\n"open\nstring\n', "/* open\n"]
+        with patch.object(regex_scanner, "SCAN_CHUNK", 1):
+            for source in sources:
+                with self.subTest(source=source):
+                    errors = ErrorReporter(print_diagnostic)
+                    with patch("sys.stderr", new=StringIO()) as stderr:
+                        lazy = [
+                            (token.type, token.lexeme, token.literal, token.line)
+                            for token in RegexScanner(source, errors).iter_tokens()
+                        ]
+                    self.assertEqual(
+                        (lazy, stderr.getvalue(), errors.had_error),
+                        self.scan(RegexScanner, source),
+                    )
+
+    def test_lexemes_are_shared(self):
+        first, second = "print name; print name;", "name"
+        tokens = RegexScanner(first).scan_tokens() + RegexScanner(second).scan_tokens()
+        self.assertIs(tokens[0].lexeme, tokens[3].lexeme)
+        self.assertIs(tokens[1].lexeme, tokens[4].lexeme)
+        self.assertIs(tokens[1].lexeme, tokens[7].lexeme)
+
+    def test_random_sources(self):
+        pieces = [
+            "var", "x", "_y1", "12", "3.25", ".", "+", "-", "*", "/", "//", "/*",
+            "*/", "!", "=", "<", ">", '"', "s", " ", "\t", "\n", "(", ")", "{",
+            "}", ";", ",", "#", "nil", "orchid", "or",
+        ]
+        generator = random.Random(0)
+        for _ in range(300):
+            source = "".join(generator.choice(pieces) for _ in range(40))
+            with self.subTest(source=source):
+                self.assert_same_scan(source)
+
+
+class TestBufferScannerMatchesScanner(TestRegexScannerMatchesScanner):
+    """Scans the UTF-8 bytes of each source with `BufferScanner`."""
+
+    def assert_same_scan(self, source):
+        buffer = memoryview(source.encode("utf-8"))
+        self.assertEqual(self.scan(BufferScanner, buffer), self.scan(Scanner, source))
+
+    def test_non_ascii_text(self):
+        self.assert_same_scan('print "héllo €";\n€ é x;')
+
+    def test_iter_tokens_matches_scan_tokens(self):
+        source = 'var a = "x\nÿ";\n/* é\n */ print a @ 1.5;\n'
+        with patch.object(regex_scanner, "SCAN_CHUNK", 1), patch("sys.stderr", new=StringIO()):
+            lazy = list(BufferScanner(source.encode("utf-8")).iter_tokens())
+        self.assertEqual(
+            [(token.type, token.lexeme, token.literal, token.line) for token in lazy],
+            self.scan(Scanner, source)[0],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
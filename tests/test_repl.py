@@ -0,0 +1,224 @@
+import gc
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+from io import StringIO
+
+from app import lox
+from app.repl import Session
+
+
+class TestSession(unittest.TestCase):
+    """A `Session` runs REPL inputs one at a time against one interpreter."""
+
+    engine = "tree"
+
+    def setUp(self):
+        self.session = Session(lox.ENGINES[self.engine]())
+
+    def run_inputs(self, *inputs):
+        """Runs each input; returns stdout and the diagnostics of all of
+        them, one per line as they would be printed."""
+        diagnostics = []
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            for source in inputs:
+                self.session.run(source)
+                diagnostics.extend(self.session.errors.diagnostics)
+        self.assertEqual(stderr.getvalue(), "")
+        return stdout.getvalue(), "".join(f"{diagnostic}\n" for diagnostic in diagnostics)
+
+    def test_globals_persist_between_inputs(self):
+        stdout, stderr = self.run_inputs(
+            "var a = 1;",
+            "fun add(n) { return a + n; }",
+            "class Box { init(value) { this.value = value; } }",
+            "print add(Box(2).value);",
+        )
+        self.assertEqual((stdout, stderr), ("3\n", ""))
+
+    def test_redefined_function_is_used_by_its_callers(self):
+        stdout, stderr = self.run_inputs(
+            "fun f() { return 1; }",
+            "fun g() { return f(); }",
+            "print g();",
+            "fun f() { return 2; }",
+            "print g();",
+        )
+        self.assertEqual((stdout, stderr), ("1\n2\n", ""))
+
+    def test_redefined_variable_can_read_the_old_value(self):
+        stdout, stderr = self.run_inputs("var a = 1;", "var a = a + 1;", "print a;")
+        self.assertEqual((stdout, stderr), ("2\n", ""))
+
+    def test_redefinition_does_not_resolve_other_declarations_again(self):
+        self.run_inputs("fun f() { return 1; }", "fun g() { return f(); }")
+        g = self.session.declarations["g"]
+        resolver = self.session.resolver
+        with patch.object(
+            resolver, "visit_function_stmt", wraps=resolver.visit_function_stmt
+        ) as visit:
+            self.run_inputs("fun f() { return 2; }")
+        self.assertEqual(visit.call_count, 1)
+        self.assertIs(self.session.declarations["g"], g)
+        self.assertEqual(self.session.declarations["f"].name.lexeme, "f")
+
+    def test_redeclaration_within_one_input_is_an_error(self):
+        stdout, stderr = self.run_inputs("var a = 1; var a = 2;")
+        self.assertIn("Already a variable with this name in this scope.", stderr)
+        stdout, stderr = self.run_inputs("var b = 1;", "var b = 2; var b = 3;")
+        self.assertIn("Already a variable with this name in this scope.", stderr)
+
+    def test_input_with_errors_declares_nothing(self):
+        stdout, stderr = self.run_inputs("var a = 1; print missing;", "print a;")
+        self.assertEqual(stdout, "")
+        self.assertIn("Variable 'missing' used before declaration.", stderr)
+        self.assertIn("Variable 'a' used before declaration.", stderr)
+        self.assertNotIn("a", self.session.declarations)
+
+    def test_locals_do_not_leak_into_the_global_scope(self):
+        stdout, stderr = self.run_inputs("{ var inner = 1; }", "print inner;")
+        self.assertIn("Variable 'inner' used before declaration.", stderr)
+
+    def test_errors_are_collected_as_diagnostics(self):
+        self.run_inputs("var a = 1;\nprint b;")
+        (compile_error,) = self.session.errors.diagnostics
+        self.run_inputs("print -nil;")
+        (runtime_error,) = self.session.errors.diagnostics
+        self.assertEqual(
+            (compile_error.kind, compile_error.line, compile_error.where),
+            ("compile", 2, " at 'b'"),
+        )
+        self.assertEqual(compile_error.message, "Variable 'b' used before declaration.")
+        self.assertEqual(
+            (runtime_error.kind, runtime_error.line, runtime_error.message),
+            ("runtime", 1, "Operand must be a number."),
+        )
+
+    def test_error_flags_are_those_of_the_last_input(self):
+        self.run_inputs("print missing;")
+        self.assertTrue(self.session.errors.had_error)
+        self.run_inputs("print -nil;")
+        self.assertEqual(
+            (self.session.errors.had_error, self.session.errors.had_runtime_error),
+            (False, True),
+        )
+        self.run_inputs("print 1;")
+        self.assertFalse(self.session.errors.had_runtime_error)
+        self.assertEqual(self.session.errors.diagnostics, [])
+
+    def test_sessions_in_threads_keep_their_errors_apart(self):
+        def work(number):
+            session = Session(lox.ENGINES[self.engine]())
+            diagnostics = []
+            for _ in range(50):
+                for source in (
+                    f"var x{number} = {number};",
+                    f"print undeclared{number};",
+                    f'x{number} = x{number} + "";',
+                ):
+                    session.run(source)
+                    diagnostics.extend(session.errors.diagnostics)
+            return diagnostics
+
+        with patch("sys.stdout", new=StringIO()), patch("sys.stderr", new=StringIO()) as stderr:
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(work, range(8)))
+        self.assertEqual(stderr.getvalue(), "")
+        for number, diagnostics in enumerate(results):
+            self.assertEqual(
+                [str(diagnostic) for diagnostic in diagnostics],
+                [
+                    f"[line 1] Error at 'undeclared{number}': "
+                    f"Variable 'undeclared{number}' used before declaration.",
+                    "Operands must be two numbers or two strings.",
+                ]
+                * 50,
+            )
+
+
+class TestSessionMemory(unittest.TestCase):
+    """Nothing a run leaves behind outlives the program that made it."""
+
+    engine = "tree"
+    runs = 100_000
+
+    def test_memory_stays_flat_over_repeated_runs(self):
+        session = Session(lox.ENGINES[self.engine]())
+        snippet = (
+            "fun f(n) { var m = n + 1; return m; } "
+            "class A { init(v) { this.v = v; } } var a = A(f(2));"
+        )
+        # Inputs with compile and runtime errors must not pile up either.
+        inputs = [snippet, "print missing;", 'print -"a";']
+        with patch("sys.stdout", new=StringIO()):
+            for index in range(100):
+                session.run(inputs[index % 3])
+            gc.collect()
+            before = sys.getallocatedblocks()
+            for index in range(self.runs):
+                session.run(inputs[index % 3])
+            gc.collect()
+        # A leak of even one block per run would show up a hundred times over.
+        self.assertLess(sys.getallocatedblocks() - before, 1000)
+        session.run("print missing;")
+        self.assertEqual(len(session.errors.diagnostics), 1)
+
+
+class TestClosureSession(TestSession):
+    engine = "closure"
+
+
+class TestVMSession(TestSession):
+    engine = "vm"
+
+    def test_closure_escaping_a_runtime_error_keeps_its_value(self):
+        stdout, stderr = self.run_inputs(
+            "var f;",
+            '{ var x = 1; fun g() { return x; } f = g; print -"a"; }',
+            "print f();",
+        )
+        self.assertEqual(stdout, "1\n")
+        self.assertEqual(stderr, "Operand must be a number.\n")
+
+
+class TestPythonSession(TestSession):
+    engine = "python"
+
+
+class TestClosureSessionMemory(TestSessionMemory):
+    engine = "closure"
+
+
+class TestVMSessionMemory(TestSessionMemory):
+    engine = "vm"
+
+
+class TestPythonSessionMemory(TestSessionMemory):
+    engine = "python"
+
+
+class TestRunPrompt(unittest.TestCase):
+    def test_lines_share_globals(self):
+        lines = iter(["var a = 1;", "print a +;", "print a;"])
+
+        def prompt(_):
+            try:
+                return next(lines)
+            except StopIteration:
+                raise EOFError
+
+        self.addCleanup(lox.set_engine, "tree")
+        lox.set_engine("tree")
+        with patch("builtins.input", prompt), patch(
+            "sys.stdout", new=StringIO()
+        ) as stdout, patch("sys.stderr", new=StringIO()) as stderr:
+            lox.run_prompt()
+        self.assertEqual(stdout.getvalue(), "1\n")
+        self.assertIn("Expect expression.", stderr.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
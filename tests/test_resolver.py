@@ -3,14 +3,14 @@ from app.resolver import Resolver
 from app.interpreter import Interpreter
 from app.parser import Parser
 from app.scanner import Scanner
-from app.error_handler import error_state
 
 
 class TestResolver(unittest.TestCase):
     def setUp(self):
         self.interpreter = Interpreter()
         self.resolver = Resolver(self.interpreter)
-        self.parse = lambda src: Parser(Scanner(src).scan_tokens()).parse()
+        self.errors = self.interpreter.errors
+        self.parse = lambda src: Parser(Scanner(src, self.errors).scan_tokens(), self.errors).parse()
 
     def test_resolve_variable_declaration(self):
         """Test basic variable declaration and usage"""
@@ -32,10 +32,10 @@ class TestResolver(unittest.TestCase):
             }
         """
         )
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
         self.assertTrue(
-            error_state["had_error"],
+            self.errors.had_error,
             "Error should have been reported for duplicate variable declaration.",
         )
 
@@ -48,10 +48,10 @@ class TestResolver(unittest.TestCase):
             }
         """
         )
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
         self.assertTrue(
-            error_state["had_error"],
+            self.errors.had_error,
             "Error should have been reported for self-referential initializer.",
         )
 
@@ -95,13 +95,38 @@ class TestResolver(unittest.TestCase):
         )
         self.resolver.resolve(stmts)
 
+    def test_locals_resolve_to_depth_and_slot(self):
+        """Test that local references record depth and slot; globals stay unresolved"""
+        stmts = self.parse(
+            """
+            var g = 0;
+            fun test(a, b) {
+                var c = a;
+                {
+                    var d = b;
+                    print c + d + g;
+                }
+            }
+        """
+        )
+        self.resolver.resolve(stmts)
+        function = stmts[1]
+        print_expr = function.body[1].statements[1].expression
+        c, d = print_expr.left.left, print_expr.left.right
+        g = print_expr.right
+        a = function.body[0].initializer
+        self.assertEqual((a.depth, a.slot), (0, 0))
+        self.assertEqual((c.depth, c.slot), (1, 2))
+        self.assertEqual((d.depth, d.slot), (0, 0))
+        self.assertIsNone(g.depth)
+
     def test_uninitialized_variable(self):
         """Test using variable before declaration"""
-        error_state["had_error"] = False  # Reset error state
+        self.errors.had_error = False  # Reset error state
         stmts = self.parse("print x; var x = 1;")
         self.resolver.resolve(stmts)
         self.assertTrue(
-            error_state["had_error"],
+            self.errors.had_error,
             "Resolver should report an error for using 'x' before declaration."
         )
 
@@ -173,10 +198,10 @@ class TestResolver(unittest.TestCase):
             return 42;  // Should error - can't return from top-level
         """
         )
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
         self.assertTrue(
-            error_state["had_error"],
+            self.errors.had_error,
             "Error should have been reported for top-level return."
         )
 
@@ -194,10 +219,10 @@ class TestResolver(unittest.TestCase):
             }
         """
         )
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
         self.assertTrue(
-            error_state["had_error"],
+            self.errors.had_error,
             "Error should have been reported for duplicate method name."
         )
 
@@ -212,10 +237,10 @@ class TestResolver(unittest.TestCase):
             }
         """
         )
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
         self.assertTrue(
-            error_state["had_error"],
+            self.errors.had_error,
             "Error should have been reported for return in initializer."
         )
 
@@ -257,33 +282,30 @@ class TestResolver(unittest.TestCase):
         self.resolver.resolve(stmts)
 
     def test_this_expr_outside_class(self):
-        from app.error_handler import error_state
         stmts = self.parse("print this;")
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
-        self.assertTrue(error_state["had_error"])
+        self.assertTrue(self.errors.had_error)
 
     def test_super_expr_in_subclass(self):
         stmts = self.parse("class A {} class B < A { method() { super.method(); } }")
         self.resolver.resolve(stmts)
 
     def test_super_expr_outside_class(self):
-        from app.error_handler import error_state
         stmts = self.parse("super.foo();")
-        error_state["had_error"] = False
+        self.errors.had_error = False
         if stmts is not None:
             self.resolver.resolve(stmts)
-            self.assertTrue(error_state["had_error"])
+            self.assertTrue(self.errors.had_error)
         else:
             # If parsing fails, we can't resolve, but that's not a resolver bug
             pass
 
     def test_super_expr_in_class_without_superclass(self):
-        from app.error_handler import error_state
         stmts = self.parse("class A { method() { super.method(); } }")
-        error_state["had_error"] = False
+        self.errors.had_error = False
         self.resolver.resolve(stmts)
-        self.assertTrue(error_state["had_error"])
+        self.assertTrue(self.errors.had_error)
 
 
 if __name__ == "__main__":
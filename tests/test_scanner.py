@@ -2,13 +2,11 @@ import sys
 import unittest
 from io import StringIO
 
-from app import Scanner, TokenType, error_state
+from app import Scanner, TokenType, ErrorReporter
+from app.error_handler import print_diagnostic
 
 
 class TestScanner(unittest.TestCase):
-    def setUp(self):
-        error_state["had_error"] = False
-
     def test_single_character_tokens(self):
         source = "(){}.,-+;*"
         scanner = Scanner(source)
@@ -57,10 +55,10 @@ class TestScanner(unittest.TestCase):
         self.assertEqual(tokens[3].type, TokenType.EOF, "Missing EOF token after keywords")
 
     def test_unexpected_character(self):
-        error_state["had_error"] = False  # Reset the flag before the test
+        errors = ErrorReporter(print_diagnostic)
 
         source = "@"
-        scanner = Scanner(source)
+        scanner = Scanner(source, errors)
 
         # Redirect stderr to capture the error message
         captured_output = StringIO()
@@ -71,7 +69,7 @@ class TestScanner(unittest.TestCase):
         # Reset redirect.
         sys.stderr = sys.__stderr__
 
-        self.assertTrue(error_state["had_error"])
+        self.assertTrue(errors.had_error)
         self.assertIn(
             "[line 1] Error: Unexpected character: @", captured_output.getvalue()
         )
@@ -0,0 +1,54 @@
+import unittest
+from app.regex_scanner import RegexScanner
+from app.parser import Parser
+from app.ast_printer import AstPrinter
+from app.token import Token, TokenBuffer
+from app.token_type import TokenType
+
+
+class TestToken(unittest.TestCase):
+    def test_tokens_have_no_instance_dict(self):
+        token = Token(TokenType.IDENTIFIER, "a", None, 1)
+        self.assertFalse(hasattr(token, "__dict__"))
+        with self.assertRaises(AttributeError):
+            token.depth = 0
+
+
+class TestTokenBuffer(unittest.TestCase):
+    SOURCE = """
+        var greeting = "hi";
+        fun add(a, b) { return a + b * 2.5; }
+        print add(1, 2) >= 3 and !nil;
+    """
+
+    def test_views_match_the_tokens(self):
+        tokens = RegexScanner(self.SOURCE).scan_tokens()
+        buffer = TokenBuffer(tokens)
+        self.assertEqual(len(buffer), len(tokens))
+        for index, token in enumerate(tokens):
+            view = buffer[index]
+            self.assertIs(view.type, token.type)
+            self.assertEqual(
+                (view.lexeme, view.literal, view.line),
+                (token.lexeme, token.literal, token.line),
+            )
+        # Only number and string tokens have an entry in the literal table.
+        self.assertEqual(list(buffer.literals.values()), ["hi", 2.5, 1.0, 2.0, 3.0])
+
+    def test_repeated_reads_share_a_view(self):
+        buffer = TokenBuffer(RegexScanner(self.SOURCE).iter_tokens())
+        self.assertIs(buffer[2], buffer[2])
+        self.assertIsNot(buffer[2], buffer[3])
+
+    def test_parser_reads_a_buffer(self):
+        printer = AstPrinter()
+        from_list = Parser(RegexScanner(self.SOURCE).scan_tokens()).parse()
+        from_buffer = Parser(TokenBuffer(RegexScanner(self.SOURCE).iter_tokens())).parse()
+        self.assertEqual(
+            [printer.print(statement) for statement in from_buffer],
+            [printer.print(statement) for statement in from_list],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,156 @@
+import pickle
+import unittest
+from unittest.mock import patch
+from io import StringIO
+
+import test_interpreter
+from app.scanner import Scanner
+from app.parser import Parser
+from app.resolver import Resolver
+from app.lox import front_end
+from app.transpiler import PythonInterpreter, Transpiler
+
+
+class TestPythonInterpreterSemantics(test_interpreter.TestInterpreter):
+    """Runs the tree-walker's interpreter tests against the transpiler."""
+
+    def make_interpreter(self):
+        return PythonInterpreter()
+
+    def test_super_method_call(self):
+        # See TestVMInterpreterSemantics: 'super' outside a subclass is a
+        # resolver error, so only the well-formed cases are checked here.
+        self.interpret_expression(
+            """
+            class A { method() { return "A method"; } }
+            class B < A { method() { return super.method(); } }
+            print B().method();
+            """,
+            expected_output="A method\n",
+        )
+        self.interpret_expression(
+            """
+            class A {}
+            class B < A { method() { return super.nonexistent(); } }
+            B().method();
+            """,
+            expected_error="Undefined property 'nonexistent'",
+        )
+
+
+class TestTranspiler(unittest.TestCase):
+    def run_source(self, interpreter, source):
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            interpreter.interpret(front_end(source))
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_pickled_program_runs_and_reports_runtime_errors(self):
+        source = 'fun show(a) { print -a; }\nshow(1);\nshow("x");'
+        program = PythonInterpreter().compile(front_end(source))
+        loaded = pickle.loads(pickle.dumps(program))
+        self.assertEqual(loaded.line_map, program.line_map)
+        interpreter = PythonInterpreter()
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            interpreter.execute(loaded)
+        self.assertEqual(stdout.getvalue(), "-1\n")
+        self.assertEqual(stderr.getvalue(), "Operand must be a number.\n")
+        self.assertTrue(interpreter.errors.had_runtime_error)
+
+    def test_operators_keep_number_checks(self):
+        cases = [
+            ('print 1 - "a";', "Operands must be numbers."),
+            ('print true < 1;', "Operands must be numbers."),
+            ('print 1 + "a";', "Operands must be two numbers or two strings."),
+            ("print -nil;", "Operand must be a number."),
+        ]
+        for source, message in cases:
+            with self.subTest(source=source):
+                _, stderr = self.run_source(PythonInterpreter(), source)
+                self.assertEqual(stderr.strip(), message)
+
+    def test_operands_evaluated_before_type_check(self):
+        stdout, stderr = self.run_source(
+            PythonInterpreter(),
+            'fun f() { print "left"; return "a"; } print f() - 1;',
+        )
+        self.assertEqual(stdout, "left\n")
+        self.assertEqual(stderr.strip(), "Operands must be numbers.")
+
+    def test_undefined_global_is_a_lox_error(self):
+        # The resolver normally rejects this; run the statements unresolved.
+        statements = Parser(Scanner("print missing;").scan_tokens()).parse()
+        interpreter = PythonInterpreter()
+        with patch("sys.stderr", new=StringIO()) as stderr:
+            interpreter.interpret(statements)
+        self.assertTrue(interpreter.errors.had_runtime_error)
+        self.assertEqual(stderr.getvalue().strip(), "Undefined variable 'missing'.")
+
+    def test_closures_capture_each_iteration(self):
+        stdout, _ = self.run_source(
+            PythonInterpreter(),
+            """
+            var first; var second;
+            for (var i = 0; i < 2; i = i + 1) {
+              var j = i;
+              fun show() { print j; }
+              if (first == nil) first = show; else second = show;
+            }
+            first(); second();
+            """,
+        )
+        self.assertEqual(stdout, "0\n1\n")
+
+    def test_long_operator_chain(self):
+        source = "var x = 1; print " + " + ".join(["x"] * 120) + ";"
+        source += " print nil or " + " or ".join(["nil"] * 120) + " or x;"
+        stdout, stderr = self.run_source(PythonInterpreter(), source)
+        self.assertEqual((stdout, stderr), ("120\n1\n", ""))
+
+    def test_deeply_nested_expression(self):
+        expression = "a = 1"
+        for _ in range(60):
+            expression = f"-(a + ({expression}))"
+        stdout, stderr = self.run_source(
+            PythonInterpreter(),
+            f"fun f() {{ var a = 2; var r = {expression}; print a; return r; }} print f();",
+        )
+        self.assertEqual((stdout, stderr), ("1\n1\n", ""))
+
+    def test_deeply_nested_loops(self):
+        loops = "".join(
+            f"var i{n} = 0; while (i{n} < 2) {{ i{n} = i{n} + 1; count = count + 1;\n"
+            for n in range(25)
+        )
+        source = (
+            "fun f() { var count = 0;\n" + loops
+            + "if (count > 30) { fun g() { return count; } return g; }\n"
+            + "}" * 25 + "\n}\nprint f()();"
+        )
+        stdout, stderr = self.run_source(PythonInterpreter(), source)
+        self.assertEqual((stdout, stderr), ("32\n", ""))
+
+    def test_program_too_deep_to_compile_is_a_lox_error(self):
+        source = "var a = 1;\n" + "if (a) {\n" * 110 + "print a;\n" + "}\n" * 110
+        interpreter = PythonInterpreter()
+        stdout, stderr = self.run_source(interpreter, source)
+        self.assertEqual(stdout, "")
+        self.assertIn("Program is nested too deeply for the python engine.", stderr)
+        self.assertTrue(interpreter.errors.had_error)
+
+    def test_generated_code_uses_python_locals(self):
+        statements = Parser(
+            Scanner("fun f(n) { var m = n * 2; return m; }").scan_tokens()
+        ).parse()
+        Resolver(PythonInterpreter()).resolve(statements)
+        source = Transpiler().transpile(statements)
+        self.assertIn("def g_f(v_n, *, _T=_T):", source)
+        self.assertIn("v_m = ", source)
+        self.assertNotIn("_Cell", source)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,175 @@
+import unittest
+from unittest.mock import patch
+from io import StringIO
+
+import test_interpreter
+from app.scanner import Scanner
+from app.parser import Parser
+from app.resolver import Resolver
+from app.compiler import Compiler
+from app.bytecode import OpCode
+from app.vm import VM, FRAMES_MAX
+
+
+class TestVMInterpreterSemantics(test_interpreter.TestInterpreter):
+    """Runs the tree-walker's interpreter tests against the bytecode VM."""
+
+    def make_interpreter(self):
+        return VM()
+
+    def test_super_method_call(self):
+        # The tree-walker crashes with a TypeError on 'super' in a class
+        # without a superclass; the resolver already rejects that program, so
+        # only the well-formed cases are checked here.
+        self.interpret_expression(
+            """
+            class A { method() { return "A method"; } }
+            class B < A { method() { return super.method(); } }
+            print B().method();
+            """,
+            expected_output="A method\n",
+        )
+        self.interpret_expression(
+            """
+            class A {}
+            class B < A { method() { return super.nonexistent(); } }
+            B().method();
+            """,
+            expected_error="Undefined property 'nonexistent'",
+        )
+
+
+class TestVM(unittest.TestCase):
+    def parse(self, source, stack_size=FRAMES_MAX):
+        vm = VM(stack_size)
+        statements = Parser(Scanner(source, vm.errors).scan_tokens(), vm.errors).parse()
+        Resolver(vm).resolve(statements)
+        return vm, statements
+
+    def run_vm(self, source, stack_size=FRAMES_MAX):
+        vm, statements = self.parse(source, stack_size)
+        with patch("sys.stdout", new=StringIO()) as stdout, patch(
+            "sys.stderr", new=StringIO()
+        ) as stderr:
+            vm.interpret(statements)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_closures_capture_variables_not_values(self):
+        output, _ = self.run_vm(
+            """
+            fun makeCounter() {
+              var count = 0;
+              fun get() { return count; }
+              fun inc() { count = count + 1; }
+              inc(); inc();
+              return get;
+            }
+            print makeCounter()();
+            """
+        )
+        self.assertEqual(output, "2\n")
+
+    def test_each_loop_iteration_gets_fresh_local(self):
+        output, _ = self.run_vm(
+            """
+            var first;
+            var second;
+            var i = 0;
+            while (i < 2) {
+              var j = i;
+              fun show() { print j; }
+              if (i == 0) first = show; else second = show;
+              i = i + 1;
+            }
+            first();
+            second();
+            """
+        )
+        self.assertEqual(output, "0\n1\n")
+
+    def test_initializer_returns_instance(self):
+        output, _ = self.run_vm(
+            """
+            class Box {
+              init(value) { this.value = value; return; }
+            }
+            var box = Box(3);
+            print box.init(4).value;
+            print box;
+            """
+        )
+        self.assertEqual(output, "4\nBox instance\n")
+
+    def test_inherited_methods_and_super(self):
+        output, _ = self.run_vm(
+            """
+            class A { name() { return "A"; } who() { return this.name(); } }
+            class B < A { name() { return "B" + super.name(); } }
+            var who = B().who;
+            print who();
+            print who;
+            """
+        )
+        self.assertEqual(output, "BA\n<fn who>\n")
+
+    def test_recursion_deeper_than_python_stack(self):
+        output, _ = self.run_vm(
+            """
+            fun count(n) { if (n == 0) return 0; return 1 + count(n - 1); }
+            print count(3000);
+            """
+        )
+        self.assertEqual(output, "3000\n")
+
+    def test_stack_overflow(self):
+        vm, statements = self.parse("fun f() { f(); } f();")
+        with patch("sys.stderr", new=StringIO()) as stderr:
+            vm.interpret(statements)
+        self.assertTrue(vm.errors.had_runtime_error)
+        self.assertEqual(stderr.getvalue().strip(), "Stack overflow.")
+
+    def test_stack_size_is_configurable(self):
+        source = """
+            fun count(n) { if (n == 0) return 0; return 1 + count(n - 1); }
+            print count(20000);
+            """
+        output, errors = self.run_vm(source, stack_size=20001)
+        self.assertEqual((output, errors), ("20000\n", ""))
+
+        output, errors = self.run_vm(source, stack_size=20000)
+        self.assertEqual((output, errors.strip()), ("", "Stack overflow."))
+
+    def test_vm_state_is_reset_after_runtime_error(self):
+        vm, statements = self.parse('fun f() { return -"x"; } f();')
+        with patch("sys.stderr", new=StringIO()):
+            vm.interpret(statements)
+        self.assertEqual(vm.stack, [])
+        self.assertEqual(vm.frames, [])
+
+        _, statements = self.parse("print 1 + 2;")
+        with patch("sys.stdout", new=StringIO()) as stdout:
+            vm.interpret(statements)
+        self.assertEqual(stdout.getvalue(), "3\n")
+
+    def test_globals_persist_between_runs(self):
+        vm = VM()
+        for source in ("var a = 1;", "a = a + 1;", "print a;"):
+            statements = Parser(Scanner(source).scan_tokens()).parse()
+            with patch("sys.stdout", new=StringIO()) as stdout:
+                vm.interpret(statements)
+        self.assertEqual(stdout.getvalue(), "2\n")
+
+    def test_compiler_uses_local_slots_inside_functions(self):
+        statements = Parser(
+            Scanner("fun f(a) { var b = a; return b; }").scan_tokens()
+        ).parse()
+        script = Compiler().compile(statements)
+        function = script.chunk.constants[script.chunk.code[1]]
+        code = function.chunk.code
+        self.assertEqual(code[:4], [OpCode.GET_LOCAL, 1, OpCode.GET_LOCAL, 2])
+        self.assertNotIn(OpCode.GET_GLOBAL, code)
+        self.assertIn("GET_LOCAL", function.chunk.disassemble("f"))
+
+
+if __name__ == "__main__":
+    unittest.main()